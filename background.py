@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+
+MAX_WORKERS = 4
+POLL_INTERVAL_MS = 25
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="weatherview")
+        return _executor
+
+def run_in_background(root, func, on_done, *args, on_error=None):
+    """
+    Runs `func(*args)` on a worker thread and delivers its result back on the Tk thread.
+
+    Tkinter widgets may only be touched from the thread running the mainloop,
+    so the worker never calls back directly. Instead the Tk thread polls the
+    future with `root.after`, which keeps the event loop free to repaint while
+    the work is in progress.
+
+    Args:
+        root (tk.Tk): Any widget whose `after` method schedules on the Tk thread.
+        func (callable): The blocking work to run, e.g. network requests.
+        on_done (callable): Called on the Tk thread with the value returned by `func`.
+        *args: Positional arguments for `func`.
+        on_error (callable | None): Called on the Tk thread with the exception if `func`
+                                    raises, so callers can undo any "busy" state.
+
+    Returns:
+        concurrent.futures.Future: The future for the submitted work.
+    """
+    future = _get_executor().submit(func, *args)
+
+    def poll():
+        if not future.done():
+            root.after(POLL_INTERVAL_MS, poll)
+            return
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error("Background task %s failed: %s - %s", getattr(func, "__name__", func), type(e).__name__, e)
+            if on_error is not None:
+                on_error(e)
+            return
+        on_done(result)
+
+    root.after(POLL_INTERVAL_MS, poll)
+    return future
+
+def submit(func, *args):
+    """
+    Runs `func(*args)` on a worker thread without reporting back to the Tk thread.
+
+    For fire-and-forget work such as writing a file, which must not block
+    whichever thread asked for it. `func` should handle its own errors.
+
+    Returns:
+        concurrent.futures.Future: The future for the submitted work.
+    """
+    return _get_executor().submit(func, *args)
+
+def shutdown():
+    """Cancels queued work and stops the worker threads without waiting for them."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
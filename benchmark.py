@@ -0,0 +1,384 @@
+"""
+Benchmark suite for Weather View's search path.
+
+Times each stage of a search against recorded OpenWeatherMap payloads in
+tests/fixtures, served through a fake transport so no network or API key is
+needed. Results are compared with a JSON baseline and the run fails if a
+stage got slower than the regression threshold allows.
+
+Stages that need a display (Tk widgets, PhotoImages) are skipped when Tk
+cannot start, e.g. on a headless CI machine.
+
+Usage:
+    python benchmark.py                  # compare with the baseline
+    python benchmark.py --update         # record a new baseline
+    python benchmark.py --threshold 40   # allow up to 40% slower per stage
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(PROJECT_DIR, "tests", "fixtures")
+BASELINE_FILE = os.path.join(PROJECT_DIR, "benchmark_baseline.json")
+
+# A stage fails when its median is more than this many percent above the baseline.
+REGRESSION_THRESHOLD = float(os.getenv("WEATHERVIEW_BENCH_THRESHOLD", "25"))
+# Slowdowns smaller than this are timer noise, whatever the percentage.
+NOISE_FLOOR_MS = 0.05
+DEFAULT_REPEAT = 30
+
+def load_fixture(name):
+    """
+    Loads a recorded API payload from tests/fixtures.
+
+    Args:
+        name (str): The file name without the ".json" extension.
+
+    Returns:
+        dict: The decoded payload.
+    """
+    with open(os.path.join(FIXTURE_DIR, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+def rebase_forecast(data, start):
+    """
+    Shifts a recorded forecast so its first entry is at `start`.
+
+    Recorded payloads age; rebasing keeps every day in the future so the
+    daily summaries are not all filtered out as already past.
+
+    Args:
+        data (dict): A decoded `/forecast` payload.
+        start (int): The new first entry time, as a Unix timestamp.
+
+    Returns:
+        dict: A copy of the payload with every `dt` shifted.
+    """
+    shift = start - data["list"][0]["dt"]
+    return {**data, "list": [{**entry, "dt": entry["dt"] + shift} for entry in data["list"]]}
+
+class FakeResponse:
+    """The parts of `requests.Response` that `weather_api` reads."""
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+def make_fake_get(payloads):
+    """
+    Builds a stand-in for `http_client.get` that answers from recorded payloads.
+
+    Args:
+        payloads (dict): Maps an endpoint name ("weather", "forecast", "group") to its payload.
+
+    Returns:
+        callable: A function with the signature of `http_client.get`.
+    """
+    def fake_get(url, timeout=None, params=None, **kwargs):
+        endpoint = url.rsplit("/", 1)[-1]
+        if endpoint not in payloads:
+            return FakeResponse({"cod": "404", "message": "city not found"}, status_code=404)
+        return FakeResponse(payloads[endpoint])
+    return fake_get
+
+def recorded_payloads():
+    """
+    Returns:
+        dict: The recorded London payloads, with the forecast rebased to start today.
+    """
+    now = int(time.time())
+    return {
+        "weather": load_fixture("weather_london"),
+        "forecast": rebase_forecast(load_fixture("forecast_london"), now - now % 10800),
+        "group": load_fixture("group")
+    }
+
+@contextmanager
+def fake_transport(payloads=None):
+    """
+    Routes `weather_api` requests to recorded payloads and its caches to a temporary directory.
+
+    Nothing is read from or written to the real disk cache while active.
+    """
+    import prefetch
+    import weather_api
+    from disk_cache import DiskCache
+
+    with tempfile.TemporaryDirectory() as directory:
+        disk_cache = DiskCache(os.path.join(directory, "weather_cache.db"))
+        try:
+            with patch("http_client.get", side_effect=make_fake_get(payloads or recorded_payloads())), \
+                 patch.object(weather_api, "_disk_cache", disk_cache), \
+                 patch.object(prefetch, "_disk_cache", disk_cache), \
+                 patch("weather_api.get_api_key", return_value="benchmark"):
+                yield disk_cache
+        finally:
+            disk_cache.close()
+
+def clear_caches(disk_cache):
+    """Empties the in-memory and disk caches so the next call goes through the transport."""
+    import weather_api
+
+    weather_api.clear_cache()
+    disk_cache.clear()
+
+def time_stage(func, repeat=DEFAULT_REPEAT, setup=None):
+    """
+    Calls `func` `repeat` times and summarises how long each call took.
+
+    Args:
+        func (callable): The stage to time.
+        repeat (int): How many timed calls to make, after one untimed warm-up call.
+        setup (callable | None): Called untimed before every call, e.g. to clear caches.
+
+    Returns:
+        dict: {"median_ms", "min_ms", "max_ms", "repeat"}.
+    """
+    if setup:
+        setup()
+    func()
+
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "repeat": repeat
+    }
+
+# --- Stages ---
+# Each stage takes the repeat count and returns time_stage's summary, or raises
+# StageSkipped when it cannot run on this machine.
+
+class StageSkipped(Exception):
+    """Raised by a stage that needs something this machine lacks, such as a display."""
+
+def bench_parse_forecast(repeat):
+    from models import ForecastSeries
+
+    data = recorded_payloads()["forecast"]
+    return time_stage(lambda: ForecastSeries.from_response(data).daily(), repeat)
+
+def bench_extract_daily_min_max(repeat):
+    from weather_api import extract_daily_min_max
+
+    data = recorded_payloads()["forecast"]
+    return time_stage(lambda: extract_daily_min_max(data["list"], data["city"]["timezone"]), repeat)
+
+def bench_get_forecast_by_city(repeat):
+    from weather_api import get_forecast_by_city
+
+    with fake_transport() as disk_cache:
+        return time_stage(lambda: get_forecast_by_city("London"), repeat, setup=lambda: clear_caches(disk_cache))
+
+def bench_create_forecast_figure(repeat):
+    from graph_forecast import create_forecast_figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from models import ForecastSeries
+
+    series = ForecastSeries.from_response(recorded_payloads()["forecast"])
+
+    def draw():
+        figure = create_forecast_figure(series, "London", "#B0C4DE", "#3A4A5A", "#E8EEF4", "metric")
+        FigureCanvasAgg(figure).draw()
+
+    return time_stage(draw, repeat)
+
+def bench_load_icon_image(repeat):
+    from icons import load_icon_image, clear_icon_cache, MAIN_ICON_SIZE
+
+    return time_stage(lambda: load_icon_image("04d", MAIN_ICON_SIZE), repeat, setup=clear_icon_cache)
+
+@contextmanager
+def withdrawn_root():
+    """Yields a hidden Tk root, or raises StageSkipped if there is no display."""
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise StageSkipped(f"Tk is unavailable: {e}")
+    root.withdraw()
+    try:
+        yield root
+    finally:
+        root.destroy()
+
+def bench_load_weather_icon(repeat):
+    from icons import load_weather_icon, clear_icon_cache, MAIN_ICON_SIZE
+
+    with withdrawn_root():
+        return time_stage(lambda: load_weather_icon("04d", MAIN_ICON_SIZE), repeat, setup=clear_icon_cache)
+
+def bench_set_dynamic_background(repeat):
+    from themes import set_dynamic_background
+    from ui_components import build_ui
+    import tkinter as tk
+
+    with withdrawn_root() as root:
+        build_ui(root, tk.StringVar(root, value="metric"))
+        conditions = iter(["clear sky", "light rain"] * (repeat + 1))
+        return time_stage(lambda: set_dynamic_background(root, next(conditions)), repeat)
+
+def bench_handle_search(repeat):
+    import tkinter as tk
+    import ui_components
+
+    with withdrawn_root() as root, fake_transport() as disk_cache:
+        unit_var = tk.StringVar(root, value="metric")
+        ui = ui_components.build_ui(root, unit_var)
+        ui["search_entry"].insert(0, "London")
+
+        def search():
+            ui_components.handle_search(ui, unit_var)
+            while ui["search_future"] is not None:
+                root.update()
+                time.sleep(0.001)
+            root.update()
+
+        return time_stage(search, repeat, setup=lambda: clear_caches(disk_cache))
+
+STAGES = {
+    "parse_forecast": bench_parse_forecast,
+    "extract_daily_min_max": bench_extract_daily_min_max,
+    "get_forecast_by_city": bench_get_forecast_by_city,
+    "create_forecast_figure": bench_create_forecast_figure,
+    "load_icon_image": bench_load_icon_image,
+    "load_weather_icon": bench_load_weather_icon,
+    "set_dynamic_background": bench_set_dynamic_background,
+    "handle_search": bench_handle_search
+}
+
+def run_benchmarks(stages=None, repeat=DEFAULT_REPEAT):
+    """
+    Runs the named stages, or all of them.
+
+    Args:
+        stages (list | None): Stage names from `STAGES`.
+        repeat (int): Timed calls per stage.
+
+    Returns:
+        dict: Maps each stage that ran to its timing summary. Skipped stages
+              map to {"skipped": reason}.
+    """
+    results = {}
+    for name in stages or STAGES:
+        try:
+            results[name] = STAGES[name](repeat)
+        except StageSkipped as e:
+            results[name] = {"skipped": str(e)}
+    return results
+
+def load_baseline(path=BASELINE_FILE):
+    """
+    Returns:
+        dict | None: The recorded stage timings, or None if no baseline exists yet.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["stages"]
+    except FileNotFoundError:
+        return None
+
+def save_baseline(results, path=BASELINE_FILE):
+    """Writes `results` as the new baseline, with the machine it was recorded on."""
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "stages": {name: result for name, result in results.items() if "skipped" not in result}
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+def find_regressions(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compares a run with the baseline.
+
+    Stages that were skipped, or that the baseline does not know about, are ignored.
+
+    Args:
+        results (dict): The result of `run_benchmarks`.
+        baseline (dict): Stage timings from `load_baseline`.
+        threshold (float): The allowed slowdown, in percent.
+
+    Returns:
+        list: (stage, baseline_ms, current_ms, change_percent) for each regressed stage.
+    """
+    regressions = []
+    for name, result in results.items():
+        if "skipped" in result or name not in baseline:
+            continue
+        before = baseline[name]["median_ms"]
+        after = result["median_ms"]
+        if after - before > NOISE_FLOOR_MS and after > before * (1 + threshold / 100):
+            regressions.append((name, before, after, (after / before - 1) * 100))
+    return regressions
+
+def format_report(results, baseline=None):
+    """
+    Formats a run as a table, with the change from the baseline where there is one.
+
+    Returns:
+        str: The report.
+    """
+    lines = [f"{'stage':<24}  {'median ms':>10}  {'min ms':>8}  {'baseline':>9}  change"]
+    for name, result in results.items():
+        if "skipped" in result:
+            lines.append(f"{name:<24}  skipped: {result['skipped']}")
+            continue
+        line = f"{name:<24}  {result['median_ms']:>10.3f}  {result['min_ms']:>8.3f}"
+        if baseline and name in baseline:
+            before = baseline[name]["median_ms"]
+            line += f"  {before:>9.3f}  {(result['median_ms'] / before - 1) * 100:+.0f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Weather View's search path.")
+    parser.add_argument("stages", nargs="*", help=f"Stages to run (default: all): {', '.join(STAGES)}.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per stage.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Allowed slowdown per stage, in percent.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="The baseline JSON file.")
+    parser.add_argument("--update", action="store_true", help="Record this run as the new baseline.")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.stages, args.repeat)
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if args.update or baseline is None:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION: {name} {before:.3f} ms -> {after:.3f} ms (+{change:.0f}%, threshold {args.threshold:.0f}%)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    A bounded, thread-safe in-memory cache with per-endpoint expiry and LRU eviction.
+
+    Keys are tuples whose first element names the endpoint (e.g. "weather" or
+    "forecast"); that name selects the entry's time-to-live from `ttls`.
+
+    Args:
+        maxsize (int): The maximum number of entries kept before the least
+                       recently used one is evicted.
+        ttls (dict): Maps endpoint names to a time-to-live in seconds.
+        default_ttl (float): The time-to-live for endpoints missing from `ttls`.
+    """
+
+    def __init__(self, maxsize=128, ttls=None, default_ttl=600):
+        self.maxsize = maxsize
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, key):
+        return self.ttls.get(key[0], self.default_ttl)
+
+    def get(self, key):
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores `value` under `key`, evicting the least recently used entry if full.
+
+        Args:
+            key (tuple): The cache key.
+            value: The value to store.
+            ttl (float | None): Seconds until the entry expires; defaults to the endpoint's TTL.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes every entry and resets the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: The current size, capacity and hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,257 @@
+import bisect
+import csv
+import heapq
+import math
+import threading
+import unicodedata
+from logger import logger
+from utils import resource_path, split_country
+
+# Every place with at least 15,000 inhabitants, from GeoNames (CC BY 4.0).
+CITIES_FILE = "data/cities.csv"
+# Size of a spatial index cell, in degrees of latitude and longitude.
+GRID_CELL_DEGREES = 0.5
+# Beyond this distance the nearest bundled city is not a useful answer.
+MAX_DISTANCE_KM = 50
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# How many autocomplete suggestions to offer at once.
+SUGGESTION_LIMIT = 8
+
+_cities = None
+_index = None
+_name_index = None
+_index_lock = threading.Lock()
+
+def load_cities(path=None):
+    """
+    Reads the bundled city dataset.
+
+    Args:
+        path (str | None): The CSV file to read. Defaults to the bundled `CITIES_FILE`.
+
+    Returns:
+        list: (name, country, lat, lon, population) tuples, most populous first.
+    """
+    path = path or resource_path(CITIES_FILE)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        return [
+            (name, country, float(lat), float(lon), int(population))
+            for name, country, lat, lon, population in reader
+        ]
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def fold_name(name):
+    """
+    Normalises a place name for prefix matching: case-insensitive and accent-insensitive.
+
+    "Reykjavík" and "reykjavik" both fold to "reykjavik".
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+class CityGrid:
+    """
+    A fixed-size lat/lon grid over the city dataset for nearest-city lookups.
+
+    Each cell holds the cities that fall inside it, so a query only measures
+    the distance to cities in the handful of cells that can lie within
+    `max_distance_km`, rather than to every city.
+
+    Args:
+        cities (list): (name, country, lat, lon, population) tuples.
+        cell_degrees (float): The size of a grid cell in degrees.
+    """
+
+    def __init__(self, cities, cell_degrees=GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.lon_cells = math.ceil(360 / cell_degrees)
+        self.cells = {}
+        for city in cities:
+            self.cells.setdefault(self._cell(city[2], city[3]), []).append(city)
+
+    def _cell(self, lat, lon):
+        row = math.floor(lat / self.cell_degrees)
+        column = math.floor((lon + 180) / self.cell_degrees) % self.lon_cells
+        return row, column
+
+    def nearest(self, lat, lon, max_distance_km=MAX_DISTANCE_KM):
+        """
+        Finds the city closest to a point.
+
+        Returns:
+            tuple | None: The nearest city tuple, or None if none lies within `max_distance_km`.
+        """
+        row, column = self._cell(lat, lon)
+        row_span = math.ceil(max_distance_km / (KM_PER_DEGREE * self.cell_degrees))
+        # Cells narrow towards the poles, so more of them are needed to cover the same distance.
+        cos_lat = math.cos(math.radians(min(abs(lat) + row_span * self.cell_degrees, 90)))
+        if cos_lat < 1e-6:
+            column_span = self.lon_cells
+        else:
+            column_span = min(math.ceil(max_distance_km / (KM_PER_DEGREE * cos_lat * self.cell_degrees)), self.lon_cells)
+
+        columns = {(column + offset) % self.lon_cells for offset in range(-column_span, column_span + 1)}
+        # Within `max_distance_km` a flat projection ranks candidates correctly and is far
+        # cheaper than the great-circle formula, which is only applied to the winner.
+        lon_scale = math.cos(math.radians(lat))
+        best, best_squared = None, math.inf
+        for r in range(row - row_span, row + row_span + 1):
+            for c in columns:
+                for city in self.cells.get((r, c), ()):
+                    d_lon = (city[3] - lon + 180) % 360 - 180
+                    squared = (city[2] - lat) ** 2 + (d_lon * lon_scale) ** 2
+                    if squared < best_squared:
+                        best, best_squared = city, squared
+
+        if best is None or haversine_km(lat, lon, best[2], best[3]) > max_distance_km:
+            return None
+        return best
+
+class CityNameIndex:
+    """
+    A sorted array of folded city names for prefix autocomplete.
+
+    All names sharing a prefix sit next to each other, so two binary searches
+    find every match; the most populous of them are offered first.
+
+    Args:
+        cities (list): (name, country, lat, lon, population) tuples.
+    """
+
+    def __init__(self, cities):
+        entries = sorted((fold_name(city[0]), city) for city in cities)
+        self.keys = [key for key, _ in entries]
+        self.cities = [city for _, city in entries]
+
+    def search(self, prefix, limit=SUGGESTION_LIMIT):
+        """
+        Returns:
+            list: Up to `limit` city tuples whose name starts with `prefix`, most populous first.
+        """
+        key = fold_name(prefix.strip())
+        if not key:
+            return []
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, key + chr(0x10FFFF), start)
+        return heapq.nlargest(limit, self.cities[start:end], key=lambda city: city[4])
+
+def _get_cities():
+    global _cities
+    with _index_lock:
+        if _cities is None:
+            _cities = load_cities()
+        return _cities
+
+def get_city_index():
+    """
+    Returns the process-wide `CityGrid`, building it on first use.
+
+    Returns:
+        CityGrid | None: The index, or None if the dataset could not be read.
+    """
+    global _index
+    if _index is None:
+        try:
+            index = CityGrid(_get_cities())
+        except Exception as e:
+            logger.error("Could not load city dataset: %s - %s", type(e).__name__, e)
+            return None
+        with _index_lock:
+            if _index is None:
+                _index = index
+    return _index
+
+def get_name_index(build=True):
+    """
+    Returns the process-wide `CityNameIndex`.
+
+    Args:
+        build (bool): Build the index if it does not exist yet. Pass False on the
+                      Tk thread to get None instead of waiting for the dataset to load.
+
+    Returns:
+        CityNameIndex | None: The index, or None if it is not available.
+    """
+    global _name_index
+    if _name_index is None and build:
+        try:
+            index = CityNameIndex(_get_cities())
+        except Exception as e:
+            logger.error("Could not load city dataset: %s - %s", type(e).__name__, e)
+            return None
+        with _index_lock:
+            if _name_index is None:
+                _name_index = index
+    return _name_index
+
+def suggest_cities(prefix, favourites=(), index=None, limit=SUGGESTION_LIMIT):
+    """
+    Builds autocomplete suggestions for a partly typed city name.
+
+    Matching favourites come first and are searched by name. Cities from the
+    bundled dataset follow, labelled with their country and carrying their
+    coordinates, so picking one searches for exactly that place. A dataset
+    city a favourite already covers is left out: the same city and country,
+    or for a favourite without a country, the most populous city of that name,
+    which is the one a search by name finds.
+
+    Args:
+        prefix (str): The text typed so far.
+        favourites (list): The user's favourite cities.
+        index (CityNameIndex | None): The name index; only favourites are suggested without one.
+        limit (int): The maximum number of suggestions.
+
+    Returns:
+        list: {"label", "city", "country", "coordinates"} dicts; "country" is a code or None,
+              "coordinates" is (lat, lon) or None.
+    """
+    key = fold_name(prefix.strip())
+    if not key:
+        return []
+
+    suggestions = []
+    for favourite in favourites:
+        if fold_name(favourite).startswith(key):
+            city, country = split_country(favourite)
+            suggestions.append({"label": favourite, "city": city, "country": country, "coordinates": None})
+    suggestions = suggestions[:limit]
+    covered = {(fold_name(suggestion["city"]), suggestion["country"]) for suggestion in suggestions}
+
+    if index is not None:
+        for name, country, lat, lon, _ in index.search(prefix, limit):
+            if len(suggestions) >= limit:
+                break
+            folded = fold_name(name)
+            if (folded, country) in covered:
+                continue
+            if (folded, None) in covered:
+                # Results come most populous first, so this is the city the favourite finds.
+                covered.discard((folded, None))
+                continue
+            suggestions.append({"label": f"{name}, {country}", "city": name, "country": country, "coordinates": (lat, lon)})
+    return suggestions
+
+def nearest_city(lat, lon, max_distance_km=MAX_DISTANCE_KM):
+    """
+    Resolves coordinates to the name of the nearest bundled city, without any network access.
+
+    Args:
+        lat (float): Latitude in degrees.
+        lon (float): Longitude in degrees.
+        max_distance_km (float): How far away a city may be and still count.
+
+    Returns:
+        str | None: The city name, or None if no city is close enough.
+    """
+    index = get_city_index()
+    if index is None:
+        return None
+    city = index.nearest(float(lat), float(lon), max_distance_km)
+    return city[0] if city else None
@@ -0,0 +1,30 @@
+import os
+import sys
+
+if getattr(sys, 'frozen', False):
+    env_path = os.path.join(os.path.dirname(sys.executable), ".env")
+else:
+    env_path = ".env"
+
+_env_loaded = False
+
+def get_env(name, default=None):
+    """
+    Reads a setting from the environment, loading the `.env` file on first use.
+
+    python-dotenv is only imported the first time a setting is needed, keeping
+    it off the startup path.
+
+    Args:
+        name (str): The environment variable to read.
+        default (str | None): The value returned if the variable is not set.
+
+    Returns:
+        str | None: The variable's value, or `default`.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
+        _env_loaded = True
+    return os.getenv(name, default)
@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from logger import logger
+
+if getattr(sys, 'frozen', False):
+    CACHE_FILE = os.path.join(os.path.dirname(sys.executable), "weather_cache.db")
+else:
+    CACHE_FILE = "weather_cache.db"
+
+class DiskCache:
+    """
+    A small persistent key/value store backed by SQLite.
+
+    Values are stored as JSON together with the time they were written, so
+    callers can decide for themselves whether an entry is still fresh. The
+    database is opened lazily on first use and every failure is logged and
+    swallowed: the cache is an optimisation and must never break a search.
+
+    Args:
+        path (str): The location of the SQLite database file.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """
+        Returns:
+            tuple | None: (value, stored_at) for `key`, or None if it is missing.
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            return json.loads(row[0]), row[1]
+        except Exception as e:
+            logger.error("Failed to read disk cache entry '%s': %s - %s", key, type(e).__name__, e)
+            return None
+
+    def get_fresh(self, key, max_age):
+        """
+        Returns:
+            The value for `key` if it was stored less than `max_age` seconds ago, else None.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.time() - stored_at > max_age:
+            return None
+        return value
+
+    def set(self, key, value):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time())
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to write disk cache entry '%s': %s - %s", key, type(e).__name__, e)
+
+    def clear(self):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to clear disk cache: %s - %s", type(e).__name__, e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# Shared by every module that persists data, so they use a single connection.
+default_cache = DiskCache()
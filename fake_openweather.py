@@ -0,0 +1,246 @@
+"""
+A local stand-in for the OpenWeatherMap API, for load and fault testing.
+
+Serves `/data/2.5/weather`, `/data/2.5/forecast` and `/data/2.5/group` from
+the recorded payloads in tests/fixtures, and can inject latency, jitter,
+server errors, 429 rate limiting and slow-drip responses. Point the app at
+it with OPENWEATHER_BASE_URL; any non-empty API key is accepted.
+
+Usage:
+    python fake_openweather.py --port 8010 --latency 150 --jitter 100 --error-rate 0.05
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8010/data/2.5 python main.py
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from benchmark import load_fixture, rebase_forecast
+
+API_PREFIX = "/data/2.5"
+# OpenWeatherMap's message when an account exceeds its call limit.
+RATE_LIMIT_MESSAGE = ("Your account is temporary blocked due to exceeding of requests limitation of your "
+                      "subscription type. Please choose the proper subscription https://openweathermap.org/price")
+
+DEFAULT_FAULTS = {
+    "latency_ms": 0,        # Added to every response.
+    "jitter_ms": 0,         # Plus a uniformly random extra delay up to this much.
+    "error_rate": 0.0,      # Fraction of requests answered with a 500.
+    "rate_limit_rate": 0.0, # Fraction of requests answered with a 429.
+    "retry_after": 1,       # Seconds, sent in the Retry-After header of a 429.
+    "drip_rate": 0.0,       # Fraction of responses whose body is sent in slow chunks.
+    "drip_chunk_bytes": 256,
+    "drip_interval_ms": 50  # Pause between slow-drip chunks.
+}
+
+class FakeOpenWeatherMap:
+    """
+    The fake API server. Runs on a background thread until `stop` is called.
+
+    Usage:
+        with FakeOpenWeatherMap(latency_ms=200, error_rate=0.1) as server:
+            os.environ["OPENWEATHER_BASE_URL"] = server.base_url
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The port to listen on; 0 picks a free one.
+        seed (int | None): Seeds the fault injection, for reproducible runs.
+        **faults: Overrides for `DEFAULT_FAULTS`.
+
+    Raises:
+        TypeError: If an unknown fault setting is given.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, seed=None, **faults):
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise TypeError(f"Unknown fault settings: {', '.join(sorted(unknown))}")
+
+        self.faults = {**DEFAULT_FAULTS, **faults}
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+        now = int(time.time())
+        self.cities = load_fixture("group")["list"]
+        self.forecast = rebase_forecast(load_fixture("forecast_london"), now - now % 10800)
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeOpenWeatherHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        # A short poll interval lets `stop` return promptly.
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-openweather", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+        return False
+
+    def chance(self, rate):
+        with self.random_lock:
+            return self.random.random() < rate
+
+    def delay_seconds(self):
+        with self.random_lock:
+            jitter = self.random.uniform(0, self.faults["jitter_ms"])
+        return (self.faults["latency_ms"] + jitter) / 1000
+
+    def record(self, path, status):
+        with self.stats_lock:
+            self.stats[(path, status)] += 1
+
+    # --- Payloads ---
+
+    def find_city(self, params):
+        """Finds the recorded city matching a `q` name or the nearest one to `lat`/`lon`."""
+        if "q" in params:
+            name = params["q"].split(",")[0].strip().lower()
+            return next((city for city in self.cities if city["name"].lower() == name), None)
+        if "lat" in params and "lon" in params:
+            try:
+                lat, lon = float(params["lat"]), float(params["lon"])
+            except ValueError:
+                return None
+            return min(self.cities, key=lambda city: math.hypot(city["coord"]["lat"] - lat, city["coord"]["lon"] - lon))
+        return None
+
+    def weather(self, params):
+        city = self.find_city(params)
+        if city is None:
+            return 404, {"cod": "404", "message": "city not found"}
+        return 200, {**city, "cod": 200}
+
+    def forecast_for(self, params):
+        city = self.find_city(params)
+        if city is None:
+            return 404, {"cod": "404", "message": "city not found"}
+        return 200, {
+            **self.forecast,
+            "city": {**self.forecast["city"], "id": city["id"], "name": city["name"],
+                     "coord": city["coord"], "country": city["sys"]["country"]}
+        }
+
+    def group(self, params):
+        try:
+            ids = {int(city_id) for city_id in params.get("id", "").split(",") if city_id}
+        except ValueError:
+            return 400, {"cod": "400", "message": "id is not a number"}
+        if not ids:
+            return 400, {"cod": "400", "message": "Nothing to geocode"}
+        found = [city for city in self.cities if city["id"] in ids]
+        return 200, {"cnt": len(found), "list": found}
+
+    def respond(self, path, params):
+        """
+        Returns:
+            tuple: (status, payload, extra headers) for a request, with faults applied.
+        """
+        if not params.get("appid"):
+            return 401, {"cod": 401, "message": "Invalid API key. Please see https://openweathermap.org/faq#error401 for more info."}, {}
+        if self.chance(self.faults["rate_limit_rate"]):
+            return 429, {"cod": 429, "message": RATE_LIMIT_MESSAGE}, {"Retry-After": str(self.faults["retry_after"])}
+        if self.chance(self.faults["error_rate"]):
+            return 500, {"cod": 500, "message": "Internal error"}, {}
+
+        endpoints = {"/weather": self.weather, "/forecast": self.forecast_for, "/group": self.group}
+        endpoint = endpoints.get(path[len(API_PREFIX):]) if path.startswith(API_PREFIX) else None
+        if endpoint is None:
+            return 404, {"cod": "404", "message": "Internal error: 404"}, {}
+        return (*endpoint(params), {})
+
+class FakeOpenWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        time.sleep(fake.delay_seconds())
+        status, payload, headers = fake.respond(url.path, params)
+        body = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        try:
+            if fake.chance(fake.faults["drip_rate"]):
+                chunk = fake.faults["drip_chunk_bytes"]
+                for start in range(0, len(body), chunk):
+                    self.wfile.write(body[start:start + chunk])
+                    self.wfile.flush()
+                    time.sleep(fake.faults["drip_interval_ms"] / 1000)
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. its read timeout expired mid-drip.
+            status = "disconnected"
+        fake.record(url.path, status)
+
+    def log_message(self, format, *args):
+        # Keep the console quiet under load; `stats` counts every response.
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the OpenWeatherMap API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible fault injection.")
+    parser.add_argument("--latency", type=float, default=0, help="Added delay per response, in ms.")
+    parser.add_argument("--jitter", type=float, default=0, help="Random extra delay of up to this many ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that get a 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests that get a 429.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429.")
+    parser.add_argument("--drip-rate", type=float, default=0.0, help="Fraction of responses sent slowly in chunks.")
+    parser.add_argument("--drip-chunk", type=int, default=256, help="Bytes per slow-drip chunk.")
+    parser.add_argument("--drip-interval", type=float, default=50, help="Pause between slow-drip chunks, in ms.")
+    args = parser.parse_args(argv)
+
+    server = FakeOpenWeatherMap(
+        args.host, args.port, seed=args.seed,
+        latency_ms=args.latency, jitter_ms=args.jitter,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        drip_rate=args.drip_rate, drip_chunk_bytes=args.drip_chunk, drip_interval_ms=args.drip_interval
+    )
+    print(f"Serving fake OpenWeatherMap API; set OPENWEATHER_BASE_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        for (path, status), count in sorted(server.stats.items(), key=str):
+            print(f"{count:>6}  {status}  {path}")
+
+if __name__ == "__main__":
+    main()
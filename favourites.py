@@ -1,9 +1,145 @@
 import json
 import os
+import tempfile
+import threading
 from logger import logger
 
 FAVOURITES_FILE = "favourites.json"
 
+class FavouritesStore:
+    """
+    An in-memory view of the favourites file with write-through saves.
+
+    The file is read once and kept as an ordered list plus a set for O(1)
+    membership checks. Before each access the file's modification time and
+    size are compared with those seen at the last load or save, so edits
+    made outside the app are picked up without re-reading the file every
+    time. Changes are written to a temporary file that then replaces the
+    original, so a crash mid-write never leaves a truncated file behind.
+
+    Args:
+        path (str): The location of the JSON favourites file.
+    """
+
+    def __init__(self, path=FAVOURITES_FILE):
+        self.path = path
+        self._cities = []
+        self._members = set()
+        self._signature = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+
+        cities = []
+        if signature is None:
+            logger.info("Favourites file not found. Starting with an empty list.")
+        else:
+            try:
+                with open(self.path, "r") as f:
+                    cities = json.load(f)
+            except Exception as e:
+                logger.error("Failed to load favourites: %s - %s", type(e).__name__, e)
+
+        self._cities = list(cities)
+        self._members = set(self._cities)
+        self._signature = signature
+        self._loaded = True
+
+    def _write(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".favourites-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._cities, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._signature = self._file_signature()
+
+    def all(self):
+        """
+        Returns:
+            list: A copy of the favourite cities, in the order they were added.
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._cities)
+
+    def __contains__(self, city):
+        with self._lock:
+            self._refresh()
+            return city in self._members
+
+    def add(self, city):
+        """
+        Adds a city and saves the file.
+
+        Returns:
+            bool: True if the city was added, False if it was already a favourite.
+        """
+        with self._lock:
+            self._refresh()
+            if city in self._members:
+                return False
+            self._cities.append(city)
+            self._members.add(city)
+            try:
+                self._write()
+            except Exception:
+                self._cities.pop()
+                self._members.discard(city)
+                raise
+            return True
+
+    def remove(self, city):
+        """
+        Removes a city and saves the file.
+
+        Returns:
+            bool: True if the city was removed, False if it was not a favourite.
+        """
+        with self._lock:
+            self._refresh()
+            if city not in self._members:
+                return False
+            index = self._cities.index(city)
+            del self._cities[index]
+            self._members.discard(city)
+            try:
+                self._write()
+            except Exception:
+                self._cities.insert(index, city)
+                self._members.add(city)
+                raise
+            return True
+
+    def toggle(self, city):
+        """
+        Adds `city` if it is not a favourite, otherwise removes it.
+
+        Returns:
+            str: "added" or "removed".
+        """
+        with self._lock:
+            if self.remove(city):
+                return "removed"
+            self.add(city)
+            return "added"
+
+_store = FavouritesStore()
+
 def save_favourite(city):
     """
     Saves or removes a city from the favourites list.
@@ -15,7 +151,7 @@ def save_favourite(city):
         city (str): The name of the city to save or remove.
     """
     if not isinstance(city, str):
-        logger.warning(f"Attempted to save non-string favourite: {city}")
+        logger.warning("Attempted to save non-string favourite: %s", city)
         return
 
     city = city.strip()
@@ -24,38 +160,26 @@ def save_favourite(city):
         return
 
     try:
-        favourites = load_favourites()
-        action = "added" if city not in favourites else "removed"
-        
-        if action == "added":
-            favourites.append(city)
-        else:
-            favourites.remove(city)
-
-        with open(FAVOURITES_FILE, "w") as f:
-            json.dump(favourites, f)
-        
-        logger.info(f"Favourite city '{city}' {action} successfully.")
+        action = _store.toggle(city)
+        logger.info("Favourite city '%s' %s successfully.", city, action)
     except Exception as e:
-        logger.error(f"Failed to save favourite '{city}': {type(e).__name__} - {e}")
+        logger.error("Failed to save favourite '%s': %s - %s", city, type(e).__name__, e)
 
 def load_favourites():
     """
-    Loads the list of favourite cities from the JSON file.
+    Loads the list of favourite cities.
+
+    The file is only re-read if it has changed since it was last loaded or saved.
 
     Returns:
         list: A list of favourite cities, or an empty list if the file
               doesn't exist or an error occurs.
     """
-    if os.path.exists(FAVOURITES_FILE):
-        try:
-            with open(FAVOURITES_FILE, "r") as f:
-                favourites = json.load(f)
-                return favourites
-        except Exception as e:
-            logger.error(f"Failed to load favourites: {type(e).__name__} - {e}")
-            return []
-    else:
-        logger.info("Favourites file not found. Starting with an empty list.")
-        return []
+    return _store.all()
 
+def is_favourite(city):
+    """
+    Returns:
+        bool: True if `city` is in the favourites list.
+    """
+    return city in _store
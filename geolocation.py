@@ -1,50 +1,96 @@
-import requests
-import certifi
 import os
-import sys
-from dotenv import load_dotenv
+import certifi
+import http_client
+from cities import nearest_city
+from config import get_env
+from disk_cache import default_cache
 from logger import logger
 
-if getattr(sys, 'frozen', False):
-    env_path = os.path.join(os.path.dirname(sys.executable), ".env")
-else:
-    env_path = ".env"
+# Within this window the last resolved city is reused without any network lookups.
+LOCATION_TTL = 6 * 60 * 60
+# Reverse-geocoded cities keyed by coordinates; a place's name does not change often.
+CITY_BY_COORDINATES_TTL = 30 * 24 * 60 * 60
+# Ask Nominatim when no bundled city is near enough; set to 0 to stay fully offline.
+NOMINATIM_FALLBACK = os.getenv("WEATHERVIEW_NOMINATIM_FALLBACK", "1") != "0"
 
-load_dotenv()
-EMAIL = os.getenv("GEOPY_USER_AGENT_EMAIL")
-if not EMAIL:
-    raise ValueError("GEOPY_USER_AGENT_EMAIL is not set in your .env file.")
+_disk_cache = default_cache
+
+def get_user_agent_email():
+    """
+    Returns the contact email sent to Nominatim, reading the `.env` file on first use.
+
+    Raises:
+        ValueError: If GEOPY_USER_AGENT_EMAIL is not set.
+    """
+    email = get_env("GEOPY_USER_AGENT_EMAIL")
+    if not email:
+        raise ValueError("GEOPY_USER_AGENT_EMAIL is not set in your .env file.")
+    return email
 
 def get_user_city():
     """
     Retrieves the user's current city based on their public IP address.
 
     This function first determines the IP address to get geographic coordinates,
-    then uses a reverse geocoding service to find the city name.
+    then resolves them to the nearest city in the bundled dataset, falling back
+    to Nominatim only when no bundled city is close enough. The result is cached
+    on disk: a city resolved within `LOCATION_TTL` is returned without any
+    requests. The IP lookup blocks, so call this off the Tk thread.
 
     Returns:
         str | None: The user's city name, or None if it cannot be determined.
     """
+    last = _disk_cache.get_fresh("geo|last", LOCATION_TTL)
+    if last:
+        return last["city"]
+
     try:
-        ip_response = requests.get("https://ipinfo.io/json", verify=certifi.where())
+        ip_response = http_client.get("https://ipinfo.io/json", verify=certifi.where())
         location_data = ip_response.json()
         loc = location_data.get("loc")
 
         if loc:
             lat, lon = loc.split(",")
-            url = f"https://nominatim.openstreetmap.org/reverse?lat={lat}&lon={lon}&format=json&accept-language=en&addressdetails=1"
-            headers = {"User-Agent": f"weather_dashboard ({EMAIL})"}
-            response = requests.get(url, headers=headers, verify=certifi.where())
-            response.raise_for_status()
-            data = response.json()
-
-            address = data.get("address", {})
-            city = address.get("city") or address.get("town") or address.get("village")
+            city = nearest_city(lat, lon) or lookup_city_online(lat, lon)
+            if city:
+                _disk_cache.set("geo|last", {"loc": loc, "city": city})
             return city
 
     except Exception as e:
-        logger.error(f"Could not retrieve geolocation: {type(e).__name__} - {e}")
+        logger.error("Could not retrieve geolocation: %s - %s", type(e).__name__, e)
 
     return None
 
+def lookup_city_online(lat, lon):
+    """
+    Resolves coordinates with Nominatim, caching the answer on disk by rounded coordinates.
+
+    Returns:
+        str | None: The city name, or None if the fallback is disabled or finds nothing.
+    """
+    if not NOMINATIM_FALLBACK:
+        return None
+
+    coordinates_key = f"geo|coordinates|{float(lat):.2f},{float(lon):.2f}"
+    city = _disk_cache.get_fresh(coordinates_key, CITY_BY_COORDINATES_TTL)
+    if city is None:
+        city = reverse_geocode(lat, lon)
+        if city:
+            _disk_cache.set(coordinates_key, city)
+    return city
+
+def reverse_geocode(lat, lon):
+    """
+    Looks up the city name for a pair of coordinates with Nominatim.
+
+    Returns:
+        str | None: The city, town or village name, if any.
+    """
+    url = f"https://nominatim.openstreetmap.org/reverse?lat={lat}&lon={lon}&format=json&accept-language=en&addressdetails=1"
+    headers = {"User-Agent": f"weather_dashboard ({get_user_agent_email()})"}
+    response = http_client.get(url, headers=headers, verify=certifi.where())
+    response.raise_for_status()
+    data = response.json()
 
+    address = data.get("address", {})
+    return address.get("city") or address.get("town") or address.get("village")
@@ -1,39 +1,116 @@
-import datetime
-from matplotlib.dates import DateFormatter
+import threading
+from PIL import Image, ImageTk
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import DateFormatter, date2num
 from matplotlib.figure import Figure
 from matplotlib import rcParams
+import timing
 
 
 rcParams['toolbar'] = 'None'
 
-def create_forecast_figure(forecast_data, city_name, bg_color, border, light, unit):
-    datetimes = [datetime.datetime.strptime(entry["datetime"], "%Y-%m-%d %H:%M:%S") for entry in forecast_data]
-    temps = [entry["temperature"] for entry in forecast_data]
+class ForecastChart:
+    """
+    A long-lived forecast temperature chart whose data is updated in place.
+
+    The figure, axes and line are created once; each search only swaps the
+    line data, title, limits and colours, so no figure construction or layout
+    pass happens on the hot path and figures are not leaked between searches.
+
+    Args:
+        figsize (tuple): The figure size in inches.
+        dpi (int): The figure resolution.
+    """
+
+    def __init__(self, figsize=(7.8, 2.4), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.xaxis_date()
+        self.line, = self.ax.plot([], [], marker='o', linestyle='-')
+        self.ax.grid(True)
+
+        self.ax.xaxis.set_major_formatter(DateFormatter('%a %H:%M'))
+        self.ax.tick_params(axis='x', labelrotation=15, labelsize=8)
+        self._laid_out = False
+        self._agg_canvas = None
+        self.lock = threading.Lock()
+
+    def update(self, forecast_data, city_name, bg_color, border, light, unit):
+        # The series' buffers are plotted directly, in the location's local time.
+        times = forecast_data.local_times().astype("datetime64[s]")
+        _, temps = forecast_data.arrays()
+
+        self.figure.patch.set_facecolor(bg_color)
+        self.ax.set_facecolor(light)
+        for spine in self.ax.spines.values():
+            spine.set_edgecolor(border)
 
-    fig = Figure(figsize=(7.8, 2.4), dpi=100)
-    ax = fig.add_subplot(111)
+        self.line.set_data(date2num(times), temps)
+        self.line.set_color(border)
+        # This line is changed to use a simple 'C'
+        unit_symbol = "C" if unit == "metric" else "F"
+        self.ax.set_title(f"5-Day Temperature Forecast for {city_name.title()} ({unit_symbol})")
 
-    fig.patch.set_facecolor(bg_color)
-    ax.set_facecolor(light)
-    for spine in ax.spines.values():
-        spine.set_edgecolor(border)
+        self.ax.relim()
+        self.ax.autoscale_view()
 
-    ax.plot(datetimes, temps, marker='o', linestyle='-', color=border)
-    # This line is changed to use a simple 'C'
-    unit_symbol = "C" if unit == "metric" else "F"
-    ax.set_title(f"5-Day Temperature Forecast for {city_name.title()} ({unit_symbol})")
-    ax.grid(True)
+        # The layout only depends on fonts and figure size, so it is computed once.
+        if not self._laid_out:
+            self.figure.tight_layout(pad=2)
+            self.figure.subplots_adjust(bottom=0.15)
+            self.figure.texts.clear()
+            self.figure.subplots_adjust(left=0.05)
+            self._laid_out = True
 
-    ax.xaxis.set_major_formatter(DateFormatter('%a %H:%M'))
-    ax.tick_params(axis='x', labelrotation=15)
+        return self.figure
 
-    for label in ax.get_xticklabels():
-        label.set_fontsize(8)
+    def render(self, forecast_data, city_name, bg_color, border, light, unit):
+        """
+        Updates the chart and rasterizes it with a headless Agg canvas.
 
-    fig.tight_layout(pad=2)
-    fig.subplots_adjust(bottom=0.15)
-    fig.texts.clear()
-    fig.subplots_adjust(left=0.05) 
+        Safe to run on a worker thread as long as this chart is never attached
+        to a Tk canvas. The pixels stay in the Agg buffer until `rgba_image`
+        or `blit_to_photo` picks them up on the Tk thread.
 
-    return fig
+        Returns:
+            tuple: The (width, height) of the rendered image in pixels.
+        """
+        with self.lock:
+            if self._agg_canvas is None:
+                self._agg_canvas = FigureCanvasAgg(self.figure)
+            self.update(forecast_data, city_name, bg_color, border, light, unit)
+            with timing.span("render.chart_raster"):
+                self._agg_canvas.draw()
+            return self._agg_canvas.get_width_height()
 
+    def rgba_image(self):
+        """
+        Wraps the last Agg render in a PIL image without copying the pixel data.
+
+        The image shares memory with the Agg buffer, so callers should hold
+        `lock` while using it.
+        """
+        width, height = self._agg_canvas.get_width_height()
+        return Image.frombuffer("RGBA", (width, height), self._agg_canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+
+    def blit_to_photo(self, photo=None):
+        """
+        Copies the last Agg render straight into a Tk PhotoImage. Must run on the Tk thread.
+
+        Args:
+            photo (ImageTk.PhotoImage | None): An existing image of the same size
+                                               to paste into, avoiding a new Tk image.
+
+        Returns:
+            ImageTk.PhotoImage: The image holding the rendered chart.
+        """
+        with self.lock:
+            image = self.rgba_image()
+            if photo is not None and (photo.width(), photo.height()) == image.size:
+                photo.paste(image)
+                return photo
+            return ImageTk.PhotoImage(image)
+
+def create_forecast_figure(forecast_data, city_name, bg_color, border, light, unit):
+    chart = ForecastChart()
+    return chart.update(forecast_data, city_name, bg_color, border, light, unit)
@@ -0,0 +1,69 @@
+import threading
+from config import get_env
+
+# Defaults, overridable with WEATHERVIEW_* variables in the environment or .env.
+# They are read when used rather than at import, so .env has been loaded by then.
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    Returns the shared, pooled HTTP session used for all outgoing requests.
+
+    The session is created on first use and keeps connections alive between
+    calls, so repeated requests to the same host reuse a warm TCP/TLS
+    connection instead of paying a new handshake each time.
+
+    Returns:
+        requests.Session: The process-wide session.
+    """
+    global _session
+    if _session is None:
+        # requests takes a noticeable share of startup time, so it is imported on first use.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=int(get_env("WEATHERVIEW_POOL_CONNECTIONS", POOL_CONNECTIONS)),
+                    pool_maxsize=int(get_env("WEATHERVIEW_POOL_MAXSIZE", POOL_MAXSIZE))
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Connection": "keep-alive"})
+                _session = session
+    return _session
+
+def get(url, timeout=None, **kwargs):
+    """
+    Performs a GET request through the shared session with a timeout applied.
+
+    Args:
+        url (str): The URL to request.
+        timeout (float | tuple | None): Overrides the default (connect, read) timeout.
+        **kwargs: Passed straight through to `requests.Session.get`.
+
+    Returns:
+        requests.Response: The response object.
+    """
+    if timeout is None:
+        timeout = (
+            float(get_env("WEATHERVIEW_CONNECT_TIMEOUT", CONNECT_TIMEOUT)),
+            float(get_env("WEATHERVIEW_READ_TIMEOUT", READ_TIMEOUT))
+        )
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+def close_session():
+    """Closes the shared session and releases its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,108 @@
+import os
+import threading
+from logger import logger
+from utils import resource_path
+
+ICON_DIR = "weather_icons"
+MAIN_ICON_SIZE = (150, 150)
+CARD_ICON_SIZE = (60, 60)
+
+# Decoded, resampled PIL images can be produced on any thread; Tk PhotoImages
+# may only be created on the Tk thread, so they live in a separate cache.
+# PIL itself is imported on first use to keep it off the startup path.
+_image_cache = {}
+_image_lock = threading.Lock()
+_photo_cache = {}
+
+def icon_path(icon_code):
+    path = resource_path(os.path.join(ICON_DIR, f"{icon_code}.png"))
+    if not os.path.exists(path):
+        path = os.path.join(ICON_DIR, "default.png")
+    return path
+
+def load_icon_image(icon_code, size):
+    """
+    Returns the decoded and resized PIL image for an icon, doing the work only once.
+
+    Safe to call from worker threads.
+
+    Args:
+        icon_code (str): The OpenWeatherMap icon code, e.g. "04d".
+        size (tuple): The (width, height) to resample to.
+
+    Returns:
+        PIL.Image.Image: The resized image.
+    """
+    key = (icon_code, tuple(size))
+    with _image_lock:
+        image = _image_cache.get(key)
+    if image is not None:
+        return image
+
+    from PIL import Image
+
+    image = Image.open(icon_path(icon_code)).resize(size, Image.LANCZOS)
+    image.load()
+    with _image_lock:
+        _image_cache.setdefault(key, image)
+        return _image_cache[key]
+
+def load_weather_icon(icon_code, size=MAIN_ICON_SIZE):
+    """
+    Returns a ready-to-display PhotoImage for an icon from the process-wide cache.
+
+    Must be called on the Tk thread.
+
+    Args:
+        icon_code (str): The OpenWeatherMap icon code, e.g. "04d".
+        size (tuple): The (width, height) of the icon.
+
+    Returns:
+        ImageTk.PhotoImage | None: The icon, or None if it could not be loaded.
+    """
+    key = (icon_code, tuple(size))
+    photo = _photo_cache.get(key)
+    if photo is not None:
+        return photo
+
+    try:
+        from PIL import ImageTk
+
+        photo = ImageTk.PhotoImage(load_icon_image(icon_code, size))
+    except Exception as e:
+        logger.error("Could load Icon: %s", e)
+        return None
+
+    _photo_cache[key] = photo
+    return photo
+
+def warm_icon_cache(sizes=(MAIN_ICON_SIZE, CARD_ICON_SIZE)):
+    """
+    Decodes and resamples every bundled icon at each size ahead of time.
+
+    Intended to run on a worker thread at startup so that searches do no image work.
+
+    Returns:
+        int: The number of images prepared.
+    """
+    directory = resource_path(ICON_DIR)
+    try:
+        icon_codes = [name[:-4] for name in os.listdir(directory) if name.endswith(".png")]
+    except OSError as e:
+        logger.error("Could not list weather icons: %s - %s", type(e).__name__, e)
+        return 0
+
+    count = 0
+    for icon_code in icon_codes:
+        for size in sizes:
+            try:
+                load_icon_image(icon_code, size)
+                count += 1
+            except Exception as e:
+                logger.debug("Could not preload icon %s: %s - %s", icon_code, type(e).__name__, e)
+    return count
+
+def clear_icon_cache():
+    with _image_lock:
+        _image_cache.clear()
+    _photo_cache.clear()
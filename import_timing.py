@@ -0,0 +1,84 @@
+"""
+Import-time report for Weather View's startup path.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+parses the per-module timings, so startup regressions (e.g. a heavy library
+imported at module level again) can be spotted and asserted on in tests.
+
+Usage:
+    python import_timing.py [module]
+"""
+
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup budget for `import main`, in milliseconds. Generous enough for slow
+# machines, but far below the cost of pulling matplotlib in eagerly.
+IMPORT_BUDGET_MS = 250
+
+# Libraries that must only be imported on first use, never at startup.
+DEFERRED_MODULES = ("matplotlib", "numpy", "PIL", "requests", "dotenv")
+
+def measure_import_times(module="main", python=sys.executable):
+    """
+    Measures how long importing `module` takes in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+        python (str): The interpreter to run.
+
+    Returns:
+        dict: Maps each imported module name to (self_us, cumulative_us).
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def format_report(times, module="main", top=15):
+    """
+    Formats the slowest imports as a human-readable table.
+
+    Args:
+        times (dict): The result of `measure_import_times`.
+        module (str): The module that was imported.
+        top (int): How many of the slowest modules to list.
+
+    Returns:
+        str: The report.
+    """
+    total_ms = times.get(module, (0, 0))[1] / 1000
+    lines = [
+        f"import {module}: {total_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)",
+        f"{'cumulative ms':>14}  {'self ms':>8}  module"
+    ]
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        lines.append(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in times]
+    if loaded:
+        lines.append(f"WARNING: imported at startup: {', '.join(loaded)}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "main"
+    print(format_report(measure_import_times(target), target))
@@ -1,17 +1,118 @@
+import atexit
 import logging
 import os
-from datetime import datetime
+import queue
+import time
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
 
-os.makedirs("logs", exist_ok=True)
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "weatherview.log")
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# The log rolls over at midnight or when it reaches this size, whichever comes first.
+MAX_LOG_BYTES = int(os.getenv("WEATHERVIEW_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+# How many rolled-over logs are kept; older ones are deleted.
+LOG_BACKUP_COUNT = int(os.getenv("WEATHERVIEW_LOG_BACKUPS", "14"))
 
-log_filename = datetime.now().strftime("logs/log_%Y-%m-%d.log")
+class RotatingLogHandler(BaseRotatingHandler):
+    """
+    A file handler that rotates daily and by size, keeping a fixed number of old logs.
 
-logging.basicConfig(
-    filename=log_filename,
-    filemode='a',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+    The live log is always `filename`; rotated logs are renamed to
+    "<name>.<YYYY-MM-DD_HH-MM-SS>[.N]<ext>", stamped with the time they rolled over.
 
-logger = logging.getLogger("WeatherViewLogger")
+    Args:
+        filename (str): The live log file.
+        max_bytes (int): Roll over before the file would exceed this size; 0 disables it.
+        backup_count (int): How many rotated logs to keep.
+    """
+
+    def __init__(self, filename, max_bytes=MAX_LOG_BYTES, backup_count=LOG_BACKUP_COUNT, encoding="utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rollover_at = self.next_midnight(time.time())
+
+    @staticmethod
+    def next_midnight(now):
+        tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        size = self.stream.tell()
+        return size > 0 and size + len(self.format(record)) + len(self.terminator) >= self.max_bytes
+
+    def rotated_name(self, now):
+        stem, ext = os.path.splitext(self.baseFilename)
+        name = f"{stem}.{time.strftime('%Y-%m-%d_%H-%M-%S', time.localtime(now))}"
+        candidate = f"{name}{ext}"
+        count = 1
+        while os.path.exists(candidate):
+            candidate = f"{name}.{count}{ext}"
+            count += 1
+        return candidate
+
+    def rotated_logs(self):
+        """
+        Returns:
+            list: Paths of the rotated logs, oldest first.
+        """
+        import glob
+
+        stem, ext = os.path.splitext(self.baseFilename)
+        # Logs rotated within the same second share a timestamp and get a longer ".N" name.
+        return sorted(glob.glob(f"{glob.escape(stem)}.*{ext}"), key=lambda path: (os.path.getmtime(path), len(path), path))
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        now = time.time()
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            self.rotate(self.baseFilename, self.rotated_name(now))
+        self.rollover_at = self.next_midnight(now)
 
+        if self.backup_count > 0:
+            for path in self.rotated_logs()[:-self.backup_count]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+def configure_logging(level=logging.INFO):
+    """
+    Routes application logging through a queue to a rotating file written on a background thread.
+
+    Logging calls only put the record on a queue, so the Tk thread never waits
+    on disk I/O; a `QueueListener` thread does the writing.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener; it is stopped at exit,
+                                        flushing anything still queued.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    file_handler = RotatingLogHandler(LOG_FILE)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # The record's message (and any traceback) is rendered once here; the file
+    # handler then adds the timestamp and level on the listener thread.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+_listener = configure_logging()
+
+logger = logging.getLogger("WeatherViewLogger")
@@ -4,11 +4,17 @@ Author: Dan White
 """
 
 import tkinter as tk
-from ui_components import build_ui, handle_search, start_auto_refresh, focus_search_entry
+from ui_components import build_ui, handle_search, render_weather, start_auto_refresh, focus_search_entry
+from weather_api import get_last_known
 from geolocation import get_user_city
 from favourites import  load_favourites
 from utils import on_save_favourite, update_fav_button
 from logger import logger
+from icons import warm_icon_cache
+from cities import get_name_index
+import background
+import timing
+from prefetch import start_prefetch, schedule_startup_prefetch
  
 def on_select_favourite(ui, unit_var):
     selected_city = ui["favourites_dropdown"].get()
@@ -18,8 +24,50 @@ def on_select_favourite(ui, unit_var):
         handle_search(ui, unit_var)
         update_fav_button(ui)
 
+def show_last_known(ui, unit_var):
+    """
+    Paints the weather cached from the previous session so the window is never empty.
+
+    Returns:
+        bool: True if cached data was shown.
+    """
+    last_known = get_last_known()
+    if not last_known:
+        return False
+
+    logger.info("Showing cached weather for %s", last_known["city"])
+    ui["search_entry"].delete(0, tk.END)
+    ui["search_entry"].insert(0, last_known["city"])
+    render_weather(ui, unit_var, last_known["city"], last_known["weather"], last_known["forecast"])
+    return True
+
+def load_initial_city(ui, unit_var):
+    """
+    Revalidates the startup weather once the window is visible.
+
+    Geolocation runs on a background thread. The user's geolocated city is
+    preferred; otherwise the city already in the search entry (the last-known
+    one, if any) is refreshed.
+    """
+    background.run_in_background(ui["root"], get_user_city, lambda user_city: on_user_city(ui, unit_var, user_city))
+
+def on_user_city(ui, unit_var, user_city):
+    # The user may have searched for something else while geolocation was running.
+    if ui.get("search_generation", 0):
+        return
+
+    if user_city:
+        ui["search_entry"].delete(0, tk.END)
+        ui["search_entry"].insert(0, user_city)
+
+    handle_search(ui, unit_var)
+    update_fav_button(ui)
+
 def on_close(root):
     logger.info("Application closed by user.")
+    background.shutdown()
+    if timing.ENABLED:
+        timing.write_stats()
     root.destroy()
 
 def main():
@@ -29,26 +77,28 @@ def main():
 
     unit_var = tk.StringVar(value="metric")
     ui = build_ui(root, unit_var)
-    start_auto_refresh(ui, unit_var)
-    user_city = get_user_city()
 
-    if user_city:
-        ui["search_entry"].delete(0, tk.END)
-        ui["search_entry"].insert(0, user_city)
-        handle_search(ui, unit_var)
-        update_fav_button(ui)
-    else:
-        ui["search_entry"].delete(0, tk.END)
-        handle_search(ui, unit_var)
+    # Show the shell straight away; everything below (cached data, icons, the
+    # first chart and its matplotlib import) fills it in afterwards.
+    root.deiconify()
+    root.update_idletasks()
+    background.run_in_background(root, warm_icon_cache, lambda count: logger.info("Preloaded %d weather icons", count))
+    background.run_in_background(root, get_name_index, lambda index: logger.info("City name index ready"))
+
+    start_auto_refresh(ui, unit_var)
+    show_last_known(ui, unit_var)
 
     favourites = load_favourites()
     ui["favourites_dropdown"]["values"] = favourites
     ui["save_button"].config(command=lambda: on_save_favourite(ui))
     ui["favourites_dropdown"].bind("<<ComboboxSelected>>", lambda _: on_select_favourite(ui, unit_var)) 
+    # Opening the list is a strong hint a favourite is about to be picked.
+    ui["favourites_dropdown"].configure(postcommand=lambda: start_prefetch(root))
     update_fav_button(ui)
     ui["root"].after(100, lambda: focus_search_entry(ui))
 
-    root.deiconify()
+    root.after_idle(lambda: load_initial_city(ui, unit_var))
+    schedule_startup_prefetch(root)
     root.protocol("WM_DELETE_WINDOW", lambda: on_close(root))
     root.mainloop()
 
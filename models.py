@@ -0,0 +1,229 @@
+import datetime
+from array import array
+
+SECONDS_PER_DAY = 24 * 60 * 60
+MIDDAY_SECONDS = 12 * 60 * 60
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+class Record:
+    """
+    Base class for the slotted weather records.
+
+    Records read like the dicts they replaced (`record["city"]`, and
+    `"error" in record` is False), so code that handles either a record or an
+    {"error": message} dict does not need to tell them apart. `to_dict` and
+    `from_dict` convert to and from the JSON stored in the disk cache.
+    """
+
+    __slots__ = ()
+    # Read-only properties that can also be looked up by key.
+    _derived = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__ or key in self._derived:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ or key in self._derived
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+    def replace(self, **changes):
+        """Returns a copy with some fields changed."""
+        return type(self)(**{**{name: getattr(self, name) for name in self.__slots__}, **changes})
+
+def day_to_date(day):
+    """Converts a day number (days since the Unix epoch) to a `datetime.date`."""
+    return datetime.date.fromordinal(_EPOCH_ORDINAL + day)
+
+class CurrentWeather(Record):
+    """
+    Current conditions in canonical units.
+
+    The observation time is kept as a Unix timestamp and only formatted when
+    it is displayed.
+    """
+
+    __slots__ = ("city", "temperature", "condition", "humidity", "wind_speed", "icon", "timestamp")
+
+    def __init__(self, city, temperature, condition, humidity, wind_speed, icon, timestamp=None):
+        self.city = city
+        self.temperature = temperature
+        self.condition = condition
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.icon = icon
+        self.timestamp = timestamp
+
+class DailyForecast(Record):
+    """One forecast card: the entry closest to local midday plus the day's range."""
+
+    __slots__ = ("day", "temperature", "min_temp", "max_temp", "condition", "icon")
+    _derived = ("date",)
+
+    def __init__(self, day, temperature, min_temp, max_temp, condition, icon):
+        self.day = day
+        self.temperature = temperature
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.condition = condition
+        self.icon = icon
+
+    @property
+    def date(self):
+        """The day as a "YYYY-MM-DD" string."""
+        return day_to_date(self.day).isoformat()
+
+class ForecastSeries(Record):
+    """
+    A forecast stored column by column.
+
+    Times and temperatures live in compact `array` buffers that NumPy can view
+    without copying. Each entry's description and icon are stored as a small
+    code into `kinds`, the distinct (description, icon) pairs in the series,
+    since a 5-day forecast rarely has more than a handful.
+
+    Args:
+        times (array | list): UTC epoch seconds of each entry.
+        temps (array | list): Temperature of each entry.
+        codes (array | list): Index into `kinds` for each entry.
+        kinds (list): Distinct (description, icon) pairs.
+        timezone (int): The location's offset from UTC in seconds.
+    """
+
+    __slots__ = ("times", "temps", "codes", "kinds", "timezone")
+
+    def __init__(self, times, temps, codes, kinds, timezone=0):
+        self.times = times if isinstance(times, array) else array("q", times)
+        self.temps = temps if isinstance(temps, array) else array("d", temps)
+        self.codes = codes if isinstance(codes, array) else array("H", codes)
+        self.kinds = [tuple(kind) for kind in kinds]
+        self.timezone = timezone
+
+    @classmethod
+    def from_response(cls, data):
+        """
+        Builds a series from a decoded `/forecast` response in a single pass.
+
+        The integer `dt` field is used, so no date strings are parsed.
+        """
+        times = array("q")
+        temps = array("d")
+        codes = array("H")
+        kinds = {}
+        for entry in data["list"]:
+            times.append(entry["dt"])
+            temps.append(entry["main"]["temp"])
+            weather = entry["weather"][0]
+            codes.append(kinds.setdefault((weather["description"], weather["icon"]), len(kinds)))
+        return cls(times, temps, codes, list(kinds), data.get("city", {}).get("timezone", 0))
+
+    def __len__(self):
+        return len(self.times)
+
+    def to_dict(self):
+        return {
+            "times": self.times.tolist(),
+            "temps": self.temps.tolist(),
+            "codes": self.codes.tolist(),
+            "kinds": [list(kind) for kind in self.kinds],
+            "timezone": self.timezone
+        }
+
+    def arrays(self):
+        """
+        Returns:
+            tuple: (times, temps) as NumPy views of the underlying buffers.
+        """
+        import numpy as np
+
+        return np.frombuffer(self.times, dtype=np.int64), np.frombuffer(self.temps, dtype=np.float64)
+
+    def local_times(self):
+        """
+        Returns:
+            numpy.ndarray: Entry times as seconds since the epoch in the location's local time.
+        """
+        times, _ = self.arrays()
+        return times + self.timezone
+
+    def with_temps(self, temps):
+        """Returns a series sharing this one's times and conditions with different temperatures."""
+        return ForecastSeries(self.times, array("d", temps), self.codes, self.kinds, self.timezone)
+
+    def daily(self, now=None):
+        """
+        Summarises the series into one `DailyForecast` per local day, from today onwards.
+
+        Args:
+            now (float | None): The current Unix time; defaults to the real time.
+
+        Returns:
+            list: `DailyForecast` records in date order.
+        """
+        if not len(self):
+            return []
+
+        times, temps = self.arrays()
+        days, midday, mins, maxs = summarise_days(times, temps, self.timezone)
+
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        upcoming = days >= (int(now) + self.timezone) // SECONDS_PER_DAY
+
+        daily = []
+        for day, index, min_temp, max_temp in zip(
+            days[upcoming].tolist(), midday[upcoming].tolist(), mins[upcoming].tolist(), maxs[upcoming].tolist()
+        ):
+            condition, icon = self.kinds[self.codes[index]]
+            daily.append(DailyForecast(
+                day, round(self.temps[index], 1), round(min_temp, 1), round(max_temp, 1), condition, icon
+            ))
+        return daily
+
+def summarise_days(times, temps, timezone_offset=0):
+    """
+    Groups a forecast series by local calendar day with vectorized operations.
+
+    Args:
+        times (numpy.ndarray): UTC epoch seconds.
+        temps (numpy.ndarray): Temperatures at those times.
+        timezone_offset (int): The location's offset from UTC in seconds.
+
+    Returns:
+        tuple: (days, midday, mins, maxs) - one element per local day, in date order:
+               the day as days since the epoch, the index of the entry closest to
+               midday (the earliest on a tie), and the day's min and max temperature.
+    """
+    import numpy as np
+
+    local = times + timezone_offset
+    days = local // SECONDS_PER_DAY
+    distance_from_midday = np.abs(local % SECONDS_PER_DAY - MIDDAY_SECONDS)
+
+    # Sorting by day, then by distance from midday, puts each day's best entry first in its run.
+    order = np.lexsort((distance_from_midday, days))
+    sorted_days = days[order]
+    starts = np.flatnonzero(np.r_[True, sorted_days[1:] != sorted_days[:-1]])
+    sorted_temps = temps[order]
+    return (
+        sorted_days[starts],
+        order[starts],
+        np.minimum.reduceat(sorted_temps, starts),
+        np.maximum.reduceat(sorted_temps, starts)
+    )
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from background import run_in_background
+from disk_cache import default_cache
+from favourites import load_favourites
+from logger import logger
+from weather_api import normalize_city, get_weather_for_cities, get_forecast_bundle
+
+# How many requests the prefetcher may have in flight at once, so it never
+# crowds out a search the user is waiting on.
+PREFETCH_CONCURRENCY = 2
+# Startup prefetch waits this long after the window is idle, leaving the first search alone.
+STARTUP_DELAY_MS = 3000
+RECENT_CITIES_LIMIT = 50
+
+_disk_cache = default_cache
+_recent_lock = threading.Lock()
+_running = None
+
+def mark_used(city):
+    """
+    Moves `city` to the front of the most-recently-used list kept in the disk cache.
+
+    Safe to call from worker threads.
+    """
+    with _recent_lock:
+        recent = [name for name in recent_cities() if normalize_city(name) != normalize_city(city)]
+        _disk_cache.set("meta|recent_cities", [city] + recent[:RECENT_CITIES_LIMIT - 1])
+
+def recent_cities():
+    """
+    Returns:
+        list: Searched cities, most recently used first.
+    """
+    entry = _disk_cache.get("meta|recent_cities")
+    return entry[0] if entry else []
+
+def prioritise(favourites):
+    """
+    Orders favourites most recently used first; never-used ones follow in their saved order.
+
+    Args:
+        favourites (list): The favourite city names.
+
+    Returns:
+        list: The same cities, reordered.
+    """
+    rank = {normalize_city(city): i for i, city in enumerate(recent_cities())}
+    order = {city: i for i, city in enumerate(favourites)}
+    return sorted(favourites, key=lambda city: (rank.get(normalize_city(city), len(rank)), order[city]))
+
+def prefetch_cities(cities, concurrency=PREFETCH_CONCURRENCY):
+    """
+    Warms the weather and forecast caches for `cities`. Blocks, so run it on a worker thread.
+
+    Current conditions for every city are fetched in batches through the
+    `/group` endpoint; forecasts are then fetched in priority order. Both
+    stages run on a pool of their own with at most `concurrency` requests in
+    flight, leaving the request pool that serves searches free. Cities whose
+    data is still cached cost nothing.
+
+    Args:
+        cities (list): The cities to warm, highest priority first.
+        concurrency (int): The maximum number of requests in flight.
+
+    Returns:
+        int: The number of cities whose weather and forecast are now cached.
+    """
+    if not cities:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prefetch") as pool:
+        weather = get_weather_for_cities(cities, executor=pool)
+        found = [city for city in cities if "error" not in weather[city]]
+        bundles = list(pool.map(get_forecast_bundle, found))
+    return sum(1 for bundle in bundles if "error" not in bundle)
+
+def start_prefetch(root):
+    """
+    Prefetches every favourite in the background, unless a prefetch is already running.
+
+    Args:
+        root (tk.Tk): Any widget, used to hand the result back to the Tk thread.
+
+    Returns:
+        concurrent.futures.Future | None: The prefetch's future, or None if one was already running.
+    """
+    global _running
+    if _running is not None and not _running.done():
+        return None
+
+    cities = prioritise(load_favourites())
+    if not cities:
+        return None
+
+    _running = run_in_background(
+        root, prefetch_cities,
+        lambda count: logger.info("Prefetched weather for %d of %d favourites", count, len(cities)),
+        cities
+    )
+    return _running
+
+def schedule_startup_prefetch(root, delay_ms=STARTUP_DELAY_MS):
+    """Starts a prefetch once the app has been idle for `delay_ms` after startup."""
+    root.after(delay_ms, lambda: root.after_idle(lambda: start_prefetch(root)))
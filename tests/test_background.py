@@ -0,0 +1,105 @@
+import pytest
+import threading
+from concurrent.futures import wait
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import background
+
+class FakeRoot:
+    """Stands in for a Tk root: `after` callbacks are run when `pump` is called."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def pump(self, future, limit=1000):
+        for _ in range(limit):
+            if not self.pending:
+                return
+            wait([future], timeout=5)
+            self.pending.pop(0)()
+
+# --- Tests for run_in_background ---
+
+def test_run_in_background_delivers_result_on_caller_thread():
+    """
+    Tests that the work runs on a worker thread and the callback on the polling thread.
+    """
+    root = FakeRoot()
+    seen = {}
+
+    def work(value):
+        seen["worker"] = threading.current_thread()
+        return value * 2
+
+    def on_done(result):
+        seen["result"] = result
+        seen["callback"] = threading.current_thread()
+
+    future = background.run_in_background(root, work, on_done, 21)
+    root.pump(future)
+
+    assert seen["result"] == 42
+    assert seen["worker"] is not threading.current_thread()
+    assert seen["callback"] is threading.current_thread()
+
+def test_run_in_background_logs_failures():
+    """
+    Tests that an exception in the worker is logged and the callback is skipped.
+    """
+    root = FakeRoot()
+    on_done = MagicMock()
+
+    def work():
+        raise RuntimeError("boom")
+
+    with patch("background.logger") as mock_logger:
+        future = background.run_in_background(root, work, on_done)
+        root.pump(future)
+        mock_logger.error.assert_called_once()
+    on_done.assert_not_called()
+
+def test_run_in_background_reports_failures_to_on_error():
+    """
+    Tests that `on_error` receives the worker's exception on the polling thread.
+    """
+    root = FakeRoot()
+    on_done = MagicMock()
+    seen = {}
+
+    def work():
+        raise RuntimeError("boom")
+
+    def on_error(error):
+        seen["error"] = error
+        seen["callback"] = threading.current_thread()
+
+    future = background.run_in_background(root, work, on_done, on_error=on_error)
+    root.pump(future)
+
+    assert str(seen["error"]) == "boom"
+    assert seen["callback"] is threading.current_thread()
+    on_done.assert_not_called()
+
+def test_submit_runs_on_worker_thread():
+    """
+    Tests that fire-and-forget work runs off the calling thread.
+    """
+    future = background.submit(threading.current_thread)
+    assert future.result(timeout=5) is not threading.current_thread()
+
+def test_shutdown_allows_restart():
+    """
+    Tests that new work can be scheduled after the executor has been shut down.
+    """
+    background.shutdown()
+    root = FakeRoot()
+    on_done = MagicMock()
+    future = background.run_in_background(root, lambda: "ok", on_done)
+    root.pump(future)
+    on_done.assert_called_once_with("ok")
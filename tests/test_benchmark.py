@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import benchmark
+import weather_api
+from models import CurrentWeather, ForecastSeries
+
+# --- Tests for the recorded payloads and fake transport ---
+
+def test_rebase_forecast_keeps_spacing():
+    """
+    Tests that rebasing moves every entry by the same amount and leaves the fixture alone.
+    """
+    data = benchmark.load_fixture("forecast_london")
+    first = data["list"][0]["dt"]
+    rebased = benchmark.rebase_forecast(data, 32487782400)
+
+    assert rebased["list"][0]["dt"] == 32487782400
+    assert rebased["list"][1]["dt"] - rebased["list"][0]["dt"] == 10800
+    assert data["list"][0]["dt"] == first
+
+def test_fake_transport_serves_recorded_payloads():
+    """
+    Tests that a full fetch is answered from the fixtures without touching the real caches.
+    """
+    weather_api.clear_cache()
+    with benchmark.fake_transport() as disk_cache:
+        result, forecast_bundle = weather_api.get_weather_and_forecast("London")
+        assert disk_cache.get("forecast|london") is not None
+    weather_api.clear_cache()
+
+    assert isinstance(result, CurrentWeather)
+    assert result.city == "London"
+    assert isinstance(forecast_bundle, ForecastSeries)
+    assert len(forecast_bundle) == 40
+    assert forecast_bundle.daily()
+
+def test_fake_transport_unknown_endpoint():
+    """
+    Tests that endpoints without a recording answer like a missing city.
+    """
+    weather_api.clear_cache()
+    with benchmark.fake_transport({"weather": benchmark.load_fixture("weather_london")}):
+        assert weather_api.get_forecast_bundle("London") == {"error": "city not found"}
+    weather_api.clear_cache()
+
+# --- Tests for running stages ---
+
+def test_run_benchmarks_times_stages():
+    """
+    Tests that stages that need no display produce a timing summary.
+    """
+    results = benchmark.run_benchmarks(["parse_forecast", "get_forecast_by_city"], repeat=2)
+    for result in results.values():
+        assert result["repeat"] == 2
+        assert 0 < result["min_ms"] <= result["median_ms"] <= result["max_ms"]
+
+def test_run_benchmarks_records_skipped_stages():
+    """
+    Tests that a stage that cannot run is reported instead of failing the run.
+    """
+    def needs_display(repeat):
+        raise benchmark.StageSkipped("Tk is unavailable")
+
+    with patch.dict(benchmark.STAGES, {"handle_search": needs_display}):
+        assert benchmark.run_benchmarks(["handle_search"]) == {"handle_search": {"skipped": "Tk is unavailable"}}
+
+# --- Tests for the baseline comparison ---
+
+def test_find_regressions_uses_threshold():
+    """
+    Tests that only stages slower than the threshold are reported.
+    """
+    baseline = {"parse": {"median_ms": 1.0}, "draw": {"median_ms": 10.0}}
+    results = {"parse": {"median_ms": 1.2}, "draw": {"median_ms": 13.0}}
+
+    regressions = benchmark.find_regressions(results, baseline, threshold=25)
+
+    assert [(name, before, after) for name, before, after, _ in regressions] == [("draw", 10.0, 13.0)]
+    assert regressions[0][3] == pytest.approx(30)
+
+def test_find_regressions_ignores_noise_and_unknown_stages():
+    """
+    Tests that tiny absolute slowdowns, skipped stages and new stages never fail a run.
+    """
+    baseline = {"parse": {"median_ms": 0.01}, "icon": {"median_ms": 1.0}}
+    results = {
+        "parse": {"median_ms": 0.03},
+        "icon": {"skipped": "Tk is unavailable"},
+        "new_stage": {"median_ms": 50.0}
+    }
+    assert benchmark.find_regressions(results, baseline, threshold=25) == []
+
+def test_baseline_round_trip(tmp_path):
+    """
+    Tests that a saved baseline loads back without its skipped stages.
+    """
+    path = str(tmp_path / "baseline.json")
+    assert benchmark.load_baseline(path) is None
+
+    benchmark.save_baseline({"parse": {"median_ms": 1.5}, "icon": {"skipped": "no display"}}, path)
+    assert benchmark.load_baseline(path) == {"parse": {"median_ms": 1.5}}
+
+def test_main_fails_on_regression(tmp_path):
+    """
+    Tests that the command exits non-zero when a stage regresses, and records a first baseline.
+    """
+    path = str(tmp_path / "baseline.json")
+    with patch("benchmark.run_benchmarks", return_value={"parse": {"median_ms": 1.0, "min_ms": 1.0}}):
+        assert benchmark.main(["--baseline", path]) == 0
+    with patch("benchmark.run_benchmarks", return_value={"parse": {"median_ms": 2.0, "min_ms": 2.0}}):
+        assert benchmark.main(["--baseline", path, "--threshold", "50"]) == 1
+        assert benchmark.main(["--baseline", path, "--threshold", "150"]) == 0
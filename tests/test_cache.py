@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from cache import TTLCache
+
+# --- Tests for TTLCache ---
+
+def test_cache_hit_and_miss_counters():
+    """
+    Tests that lookups are counted as hits or misses.
+    """
+    cache = TTLCache(maxsize=4)
+    assert cache.get(("weather", "london", "metric")) is None
+    cache.set(("weather", "london", "metric"), {"city": "London"})
+    assert cache.get(("weather", "london", "metric")) == {"city": "London"}
+    assert cache.stats() == {"size": 1, "maxsize": 4, "hits": 1, "misses": 1}
+
+def test_cache_entries_expire_per_endpoint():
+    """
+    Tests that each endpoint uses its own time-to-live.
+    """
+    cache = TTLCache(ttls={"weather": 10, "forecast": 100})
+    with patch("cache.time.monotonic", return_value=0):
+        cache.set(("weather", "london", "metric"), "current")
+        cache.set(("forecast", "london", "metric"), "forecast")
+
+    with patch("cache.time.monotonic", return_value=50):
+        assert cache.get(("weather", "london", "metric")) is None
+        assert cache.get(("forecast", "london", "metric")) == "forecast"
+
+def test_cache_entry_with_explicit_ttl():
+    """
+    Tests that an explicit time-to-live overrides the endpoint's one.
+    """
+    cache = TTLCache(ttls={"weather": 100})
+    with patch("cache.time.monotonic", return_value=0):
+        cache.set(("weather", "london", "metric"), "current", ttl=10)
+
+    with patch("cache.time.monotonic", return_value=50):
+        assert cache.get(("weather", "london", "metric")) is None
+
+def test_cache_evicts_least_recently_used():
+    """
+    Tests that the least recently used entry is dropped when the cache is full.
+    """
+    cache = TTLCache(maxsize=2)
+    cache.set(("weather", "a", "metric"), 1)
+    cache.set(("weather", "b", "metric"), 2)
+    cache.get(("weather", "a", "metric"))
+    cache.set(("weather", "c", "metric"), 3)
+
+    assert cache.get(("weather", "b", "metric")) is None
+    assert cache.get(("weather", "a", "metric")) == 1
+    assert cache.get(("weather", "c", "metric")) == 3
@@ -0,0 +1,117 @@
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import cities
+from cities import CityGrid, CityNameIndex, load_cities, haversine_km, fold_name, suggest_cities
+
+SAMPLE_CITIES = [
+    ("London", "GB", 51.5085, -0.1257, 8961989),
+    ("Croydon", "GB", 51.3816, -0.0982, 173314),
+    ("Paris", "FR", 48.8534, 2.3488, 2138551),
+    ("Suva", "FJ", -18.1416, 178.4415, 77366),
+    ("Apia", "WS", -13.8333, -171.7667, 40407),
+]
+
+# --- Tests for the city dataset and spatial index ---
+
+def test_load_cities_reads_csv(tmp_path):
+    """
+    Tests that the dataset is parsed into typed tuples.
+    """
+    path = tmp_path / "cities.csv"
+    path.write_text("name,country,lat,lon,population\nLondon,GB,51.5085,-0.1257,8961989\n", encoding="utf-8")
+    assert load_cities(str(path)) == [("London", "GB", 51.5085, -0.1257, 8961989)]
+
+def test_nearest_finds_closest_city():
+    """
+    Tests that the closest city wins, not merely one in the same cell.
+    """
+    grid = CityGrid(SAMPLE_CITIES)
+    assert grid.nearest(51.40, -0.10)[0] == "Croydon"
+    assert grid.nearest(51.49, -0.12)[0] == "London"
+    assert grid.nearest(48.9, 2.3)[0] == "Paris"
+
+def test_nearest_respects_max_distance():
+    """
+    Tests that None is returned when no city is close enough.
+    """
+    grid = CityGrid(SAMPLE_CITIES)
+    assert grid.nearest(50.0, -5.0) is None
+    assert grid.nearest(51.40, -0.10, max_distance_km=1) is None
+
+def test_nearest_wraps_around_the_antimeridian():
+    """
+    Tests that cities across the 180th meridian are still found.
+    """
+    grid = CityGrid([("Taveuni", "FJ", -16.8, 179.9, 20000)])
+    assert grid.nearest(-16.8, -179.9)[0] == "Taveuni"
+
+def test_nearest_matches_brute_force():
+    """
+    Tests the grid against a linear scan over the same cities.
+    """
+    grid = CityGrid(SAMPLE_CITIES)
+    for lat, lon in [(51.3, 0.0), (48.5, 2.0), (-18.0, 178.0), (-13.5, -171.5)]:
+        expected = min(SAMPLE_CITIES, key=lambda city: haversine_km(lat, lon, city[2], city[3]))
+        assert grid.nearest(lat, lon)[0] == expected[0]
+
+def test_nearest_city_uses_bundled_dataset():
+    """
+    Tests that the bundled dataset resolves well-known coordinates offline.
+    """
+    assert cities.nearest_city("51.5074", "-0.1278") == "London"
+    assert cities.nearest_city(-33.87, 151.21) == "Sydney"
+    assert cities.nearest_city(0.0, -160.0) is None
+
+# --- Tests for prefix autocomplete ---
+
+def test_fold_name_ignores_case_and_accents():
+    """
+    Tests that typed text matches names regardless of case and diacritics.
+    """
+    assert fold_name("Reykjavík") == fold_name("REYKJAVIK") == "reykjavik"
+
+def test_name_index_prefix_search():
+    """
+    Tests that every city sharing the prefix is found, most populous first.
+    """
+    index = CityNameIndex(SAMPLE_CITIES + [("Parma", "IT", 44.8, 10.3, 175895), ("Apia", "WS", -13.8, -171.8, 40407)])
+    assert [city[0] for city in index.search("pa")] == ["Paris", "Parma"]
+    assert [city[0] for city in index.search("  PAR")] == ["Paris", "Parma"]
+    assert [city[0] for city in index.search("pa", limit=1)] == ["Paris"]
+    assert index.search("xyz") == []
+    assert index.search("") == []
+
+def test_suggest_cities_puts_favourites_first():
+    """
+    Tests that favourites lead, and dataset matches carry coordinates and a country label.
+    """
+    index = CityNameIndex(SAMPLE_CITIES)
+    suggestions = suggest_cities("lo", favourites=["Los Angeles", "Oslo"], index=index)
+    assert suggestions == [
+        {"label": "Los Angeles", "city": "Los Angeles", "country": None, "coordinates": None},
+        {"label": "London, GB", "city": "London", "country": "GB", "coordinates": (51.5085, -0.1257)},
+    ]
+
+def test_suggest_cities_leaves_out_cities_a_favourite_covers():
+    """
+    Tests that a favourite replaces its dataset entry: by name and country, or by name for the top match.
+    """
+    index = CityNameIndex(SAMPLE_CITIES + [("London", "CA", 42.9834, -81.233, 346765)])
+
+    def labels(favourites):
+        return [suggestion["label"] for suggestion in suggest_cities("lon", favourites=favourites, index=index)]
+
+    assert labels(["London"]) == ["London", "London, CA"]
+    assert labels(["London,CA"]) == ["London,CA", "London, GB"]
+    assert labels([]) == ["London, GB", "London, CA"]
+
+def test_suggest_cities_without_index():
+    """
+    Tests that only favourites are suggested while the index is still loading.
+    """
+    assert suggest_cities("os", favourites=["Oslo", "Paris"]) == [
+        {"label": "Oslo", "city": "Oslo", "country": None, "coordinates": None}
+    ]
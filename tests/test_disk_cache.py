@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from disk_cache import DiskCache
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    yield cache
+    cache.close()
+
+# --- Tests for DiskCache ---
+
+def test_disk_cache_round_trip(disk_cache):
+    """
+    Tests that values are persisted with their timestamp.
+    """
+    with patch("disk_cache.time.time", return_value=1000):
+        disk_cache.set("weather|london|metric", {"city": "London"})
+
+    assert disk_cache.get("weather|london|metric") == ({"city": "London"}, 1000)
+    assert disk_cache.get("weather|paris|metric") is None
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    """
+    Tests that entries are still there after the database is reopened.
+    """
+    path = str(tmp_path / "weather_cache.db")
+    first = DiskCache(path)
+    first.set("meta|last_city", "London")
+    first.close()
+
+    second = DiskCache(path)
+    assert second.get("meta|last_city")[0] == "London"
+    second.close()
+
+def test_disk_cache_get_fresh_respects_max_age(disk_cache):
+    """
+    Tests that entries older than the allowed age are treated as missing.
+    """
+    with patch("disk_cache.time.time", return_value=1000):
+        disk_cache.set("weather|london|metric", {"city": "London"})
+
+    with patch("disk_cache.time.time", return_value=1500):
+        assert disk_cache.get_fresh("weather|london|metric", 600) == {"city": "London"}
+        assert disk_cache.get_fresh("weather|london|metric", 300) is None
+
+def test_disk_cache_errors_are_swallowed(tmp_path):
+    """
+    Tests that an unusable database never raises to the caller.
+    """
+    cache = DiskCache(str(tmp_path / "missing" / "weather_cache.db"))
+    with patch("disk_cache.logger") as mock_logger:
+        cache.set("meta|last_city", "London")
+        assert cache.get("meta|last_city") is None
+        assert mock_logger.error.call_count == 2
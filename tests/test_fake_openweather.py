@@ -0,0 +1,144 @@
+import pytest
+import time
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import http_client
+import weather_api
+from disk_cache import DiskCache
+from fake_openweather import FakeOpenWeatherMap
+from models import CurrentWeather, ForecastSeries
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    """Ensures responses are never served from, or written to, the real caches."""
+    disk_cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    monkeypatch.setattr(weather_api, "_disk_cache", disk_cache)
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+    weather_api.clear_cache()
+    yield disk_cache
+    weather_api.clear_cache()
+    disk_cache.close()
+
+@pytest.fixture
+def serve(isolated_cache, monkeypatch):
+    """Starts a fake server with the given faults and points weather_api at it."""
+    servers = []
+
+    def start(**faults):
+        server = FakeOpenWeatherMap(seed=1, **faults).start()
+        servers.append(server)
+        monkeypatch.setenv("OPENWEATHER_BASE_URL", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+# --- Tests for recorded responses ---
+
+def test_weather_by_name(serve):
+    """
+    Tests that the app's own client parses the fake server's current weather.
+    """
+    server = serve()
+    result = weather_api.get_weather_by_city("london")
+    assert isinstance(result, CurrentWeather)
+    assert (result.city, result.temperature, result.icon) == ("London", 21.4, "03d")
+    assert server.stats[("/data/2.5/weather", 200)] == 1
+
+def test_forecast_by_coordinates(serve):
+    """
+    Tests that a coordinate search gets the nearest recorded city's forecast, starting today.
+    """
+    serve()
+    series = weather_api.get_forecast_bundle((48.86, 2.35))
+    assert isinstance(series, ForecastSeries)
+    assert len(series) == 40
+    assert series.daily()
+
+def test_group_request_for_known_cities(serve):
+    """
+    Tests that cities whose IDs are known are fetched in one /group request.
+    """
+    server = serve()
+    for city in ["London", "Paris", "Tokyo"]:
+        weather_api.get_weather_by_city(city)
+    weather_api.clear_cache()
+
+    # An hour later the cached weather is stale, but the city IDs are still known.
+    with patch("disk_cache.time.time", return_value=time.time() + 3600):
+        results = weather_api.get_weather_for_cities(["London", "Paris", "Tokyo"])
+
+    assert [results[city].city for city in ["London", "Paris", "Tokyo"]] == ["London", "Paris", "Tokyo"]
+    assert server.stats[("/data/2.5/group", 200)] == 1
+
+def test_unknown_city(serve):
+    """
+    Tests that a city with no recording answers like the real API.
+    """
+    serve()
+    assert weather_api.get_weather_by_city("Atlantis") == {"error": "Location not found."}
+
+def test_missing_api_key(serve):
+    """
+    Tests that requests without an appid are rejected.
+    """
+    server = serve()
+    response = http_client.get(f"{server.base_url}/weather", params={"q": "London"})
+    assert response.status_code == 401
+
+# --- Tests for fault injection ---
+
+def test_rate_limited(serve):
+    """
+    Tests that 429s carry a Retry-After header.
+    """
+    server = serve(rate_limit_rate=1.0, retry_after=7)
+    response = http_client.get(f"{server.base_url}/weather", params={"q": "London", "appid": "x"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert weather_api.get_forecast_bundle("London")["error"].startswith("Your account is temporary blocked")
+
+def test_server_errors(serve):
+    """
+    Tests that injected 500s surface as errors rather than cached data.
+    """
+    serve(error_rate=1.0)
+    assert weather_api.get_forecast_bundle("London") == {"error": "Internal error"}
+    assert weather_api.get_weather_by_city("London") == {"error": "Location not found."}
+
+def test_latency(serve):
+    """
+    Tests that every response is delayed by at least the configured latency.
+    """
+    server = serve(latency_ms=100, jitter_ms=50)
+    start = time.perf_counter()
+    http_client.get(f"{server.base_url}/weather", params={"q": "London", "appid": "x"})
+    assert time.perf_counter() - start >= 0.1
+
+def test_slow_drip_delivers_whole_body(serve):
+    """
+    Tests that a dripped response arrives intact, just slowly.
+    """
+    serve(drip_rate=1.0, drip_chunk_bytes=1024, drip_interval_ms=20)
+    start = time.perf_counter()
+    assert len(weather_api.get_forecast_bundle("London")) == 40
+    assert time.perf_counter() - start >= 0.1
+
+def test_slow_drip_trips_read_timeout(serve, monkeypatch):
+    """
+    Tests that the client's read timeout turns a stalled body into a failed request.
+    """
+    serve(drip_rate=1.0, drip_chunk_bytes=64, drip_interval_ms=300)
+    monkeypatch.setattr(http_client, "READ_TIMEOUT", 0.1)
+    assert weather_api.get_weather_by_city("London") == {"error": "Request failed."}
+
+def test_unknown_fault_setting():
+    """
+    Tests that misspelt fault settings are rejected instead of silently ignored.
+    """
+    with pytest.raises(TypeError):
+        FakeOpenWeatherMap(latency=100)
@@ -1,83 +1,124 @@
 import pytest
 import json
-from unittest.mock import patch, mock_open
+import os
+from unittest.mock import patch
 
 import sys
-import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import favourites
+from favourites import FavouritesStore
+
+@pytest.fixture
+def favourites_file(tmp_path, monkeypatch):
+    """
+    Points the module-level store at a favourites file inside a temporary directory.
+    """
+    path = tmp_path / "favourites.json"
+    monkeypatch.setattr(favourites, "_store", FavouritesStore(str(path)))
+    return path
 
 # --- Tests for load_favourites ---
 
-def test_load_favourites_file_not_found():
+def test_load_favourites_file_not_found(favourites_file):
     """
     Tests that load_favourites returns an empty list if the file doesn't exist.
     """
-    with patch("os.path.exists", return_value=False), \
-         patch("favourites.logger") as mock_logger:
+    with patch("favourites.logger") as mock_logger:
         result = favourites.load_favourites()
         assert result == []
         mock_logger.info.assert_called_once_with("Favourites file not found. Starting with an empty list.")
 
-def test_load_favourites_success():
+def test_load_favourites_success(favourites_file):
     """
     Tests that load_favourites correctly loads a list of cities from a JSON file.
     """
-    mock_data = json.dumps(["London", "Paris"])
-    with patch("os.path.exists", return_value=True), \
-         patch("builtins.open", mock_open(read_data=mock_data)):
-        result = favourites.load_favourites()
-        assert result == ["London", "Paris"]
+    favourites_file.write_text(json.dumps(["London", "Paris"]))
+    result = favourites.load_favourites()
+    assert result == ["London", "Paris"]
 
-def test_load_favourites_json_error():
+def test_load_favourites_json_error(favourites_file):
     """
     Tests that load_favourites returns an empty list if the file contains invalid JSON.
     """
-    with patch("os.path.exists", return_value=True), \
-         patch("builtins.open", mock_open(read_data="invalid json")), \
-         patch("favourites.logger") as mock_logger:
+    favourites_file.write_text("invalid json")
+    with patch("favourites.logger") as mock_logger:
         result = favourites.load_favourites()
         assert result == []
         assert mock_logger.error.called
 
+def test_load_favourites_reads_file_once(favourites_file):
+    """
+    Tests that an unchanged file is not re-read on every call.
+    """
+    favourites_file.write_text(json.dumps(["London"]))
+    favourites.load_favourites()
+    with patch("builtins.open") as mock_open:
+        assert favourites.load_favourites() == ["London"]
+        assert favourites.is_favourite("London")
+        mock_open.assert_not_called()
+
+def test_load_favourites_notices_external_edits(favourites_file):
+    """
+    Tests that a file changed outside the app is reloaded.
+    """
+    favourites_file.write_text(json.dumps(["London"]))
+    assert favourites.load_favourites() == ["London"]
+
+    favourites_file.write_text(json.dumps(["London", "Oslo"]))
+    stat = os.stat(favourites_file)
+    os.utime(favourites_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert favourites.load_favourites() == ["London", "Oslo"]
+    assert favourites.is_favourite("Oslo")
+
 # --- Tests for save_favourite ---
 
-def test_save_favourite_add_new_city():
+def test_save_favourite_add_new_city(favourites_file):
     """
     Tests that a new city is added to the favourites list.
     """
-    with patch("favourites.load_favourites", return_value=[]), \
-         patch("builtins.open", mock_open()) as mock_file, \
-         patch("json.dump") as mock_json_dump:
-        favourites.save_favourite("Tokyo")
-        mock_json_dump.assert_called_once_with(["Tokyo"], mock_file())
+    favourites.save_favourite("Tokyo")
+    assert json.loads(favourites_file.read_text()) == ["Tokyo"]
+    assert favourites.is_favourite("Tokyo")
 
-def test_save_favourite_remove_existing_city():
+def test_save_favourite_remove_existing_city(favourites_file):
     """
     Tests that an existing city is removed from the favourites list.
     """
-    with patch("favourites.load_favourites", return_value=["Tokyo"]), \
-         patch("builtins.open", mock_open()) as mock_file, \
-         patch("json.dump") as mock_json_dump:
-        favourites.save_favourite("Tokyo")
-        mock_json_dump.assert_called_once_with([], mock_file())
+    favourites_file.write_text(json.dumps(["Tokyo"]))
+    favourites.save_favourite("Tokyo")
+    assert json.loads(favourites_file.read_text()) == []
+    assert not favourites.is_favourite("Tokyo")
+
+def test_save_favourite_replaces_file_atomically(favourites_file):
+    """
+    Tests that a failed write leaves the previous file and list intact.
+    """
+    favourites_file.write_text(json.dumps(["Tokyo"]))
+    with patch("favourites.os.replace", side_effect=OSError("disk full")), \
+         patch("favourites.logger") as mock_logger:
+        favourites.save_favourite("Lima")
+        assert mock_logger.error.called
+
+    assert json.loads(favourites_file.read_text()) == ["Tokyo"]
+    assert favourites.load_favourites() == ["Tokyo"]
+    assert os.listdir(favourites_file.parent) == ["favourites.json"]
 
 def test_save_favourite_empty_city_string():
     """
     Tests that an empty string is not saved.
     """
     with patch("favourites.logger") as mock_logger, \
-         patch("favourites.load_favourites") as mock_load:
+         patch("favourites._store") as mock_store:
         favourites.save_favourite("   ")
         mock_logger.warning.assert_called_once_with("Attempted to save empty or whitespace-only city.")
-        mock_load.assert_not_called()
+        mock_store.toggle.assert_not_called()
 
 def test_save_favourite_non_string_input():
     """
     Tests that non-string input is not saved.
     """
     with patch("favourites.logger") as mock_logger, \
-         patch("favourites.load_favourites") as mock_load:
+         patch("favourites._store") as mock_store:
         favourites.save_favourite(123)
-        mock_logger.warning.assert_called_once_with("Attempted to save non-string favourite: 123")
-        mock_load.assert_not_called()
+        mock_logger.warning.assert_called_once_with("Attempted to save non-string favourite: %s", 123)
+        mock_store.toggle.assert_not_called()
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import http_client
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Ensures every test starts without a shared session."""
+    http_client.close_session()
+    yield
+    http_client.close_session()
+
+# --- Tests for get_session ---
+
+def test_get_session_is_shared():
+    """
+    Tests that the same pooled session is returned on every call.
+    """
+    first = http_client.get_session()
+    second = http_client.get_session()
+    assert first is second
+    assert first.headers["Connection"] == "keep-alive"
+
+def test_get_session_mounts_pooled_adapter():
+    """
+    Tests that the session uses an adapter sized from the pool settings.
+    """
+    adapter = http_client.get_session().get_adapter("https://api.openweathermap.org")
+    assert adapter._pool_connections == http_client.POOL_CONNECTIONS
+    assert adapter._pool_maxsize == http_client.POOL_MAXSIZE
+
+def test_get_session_reads_pool_settings_from_env(monkeypatch):
+    """
+    Tests that pool sizes come from the environment (and so from .env) when the session is created.
+    """
+    monkeypatch.setenv("WEATHERVIEW_POOL_MAXSIZE", "2")
+    adapter = http_client.get_session().get_adapter("https://api.openweathermap.org")
+    assert adapter._pool_maxsize == 2
+
+# --- Tests for get ---
+
+def test_get_applies_default_timeout():
+    """
+    Tests that requests made through the client always carry a timeout.
+    """
+    with patch.object(http_client.get_session(), "get") as mock_get:
+        http_client.get("https://example.com", params={"q": "London"})
+        mock_get.assert_called_once_with(
+            "https://example.com",
+            timeout=(http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT),
+            params={"q": "London"}
+        )
+
+def test_get_reads_timeout_from_env(monkeypatch):
+    """
+    Tests that a timeout set in the environment (or .env) is used for requests.
+    """
+    monkeypatch.setenv("WEATHERVIEW_READ_TIMEOUT", "2.5")
+    with patch.object(http_client.get_session(), "get") as mock_get:
+        http_client.get("https://example.com")
+        mock_get.assert_called_once_with("https://example.com", timeout=(http_client.CONNECT_TIMEOUT, 2.5))
+
+def test_get_allows_timeout_override():
+    """
+    Tests that an explicit timeout replaces the default one.
+    """
+    with patch.object(http_client.get_session(), "get") as mock_get:
+        http_client.get("https://example.com", timeout=1)
+        mock_get.assert_called_once_with("https://example.com", timeout=1)
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import icons
+from PIL import Image
+
+@pytest.fixture(autouse=True)
+def empty_icon_cache():
+    """Ensures every test starts with nothing decoded."""
+    icons.clear_icon_cache()
+    yield
+    icons.clear_icon_cache()
+
+# --- Tests for load_weather_icon ---
+
+@patch('icons.os.path.exists', return_value=True)
+@patch('PIL.Image.open')
+@patch('PIL.ImageTk.PhotoImage')
+@patch('icons.resource_path', side_effect=lambda x: x)
+def test_load_weather_icon_success(mock_resource_path, mock_photo_image, mock_image_open, mock_exists):
+    """
+    Tests that a weather icon is loaded correctly when the file exists.
+    """
+    result = icons.load_weather_icon("01d")
+    mock_exists.assert_called_once_with(os.path.join("weather_icons", "01d.png"))
+    mock_image_open.assert_called_once()
+    mock_photo_image.assert_called_once()
+    assert result is not None
+
+@patch('icons.os.path.exists', return_value=False)
+@patch('PIL.Image.open')
+@patch('PIL.ImageTk.PhotoImage')
+@patch('icons.resource_path', side_effect=lambda x: x)
+def test_load_weather_icon_fallback_to_default(mock_resource_path, mock_photo_image, mock_image_open, mock_exists):
+    """
+    Tests that the default icon is loaded when the specific icon file does not exist.
+    """
+    icons.load_weather_icon("non_existent_icon")
+    mock_image_open.assert_called_once_with(os.path.join("weather_icons", "default.png"))
+    mock_photo_image.assert_called_once()
+
+# --- Tests for the icon cache ---
+
+@patch('PIL.ImageTk.PhotoImage')
+def test_load_weather_icon_decodes_once(mock_photo_image):
+    """
+    Tests that repeated requests for the same icon and size reuse one PhotoImage.
+    """
+    with patch('PIL.Image.open', wraps=Image.open) as mock_image_open:
+        first = icons.load_weather_icon("01d", size=(60, 60))
+        second = icons.load_weather_icon("01d", size=(60, 60))
+
+    assert first is second
+    mock_image_open.assert_called_once()
+    mock_photo_image.assert_called_once()
+
+def test_load_icon_image_is_resized():
+    """
+    Tests that cached images are resampled to the requested size.
+    """
+    image = icons.load_icon_image("10n", (60, 60))
+    assert image.size == (60, 60)
+    assert icons.load_icon_image("10n", (60, 60)) is image
+
+def test_warm_icon_cache_preloads_bundled_icons():
+    """
+    Tests that warming decodes every bundled icon at each requested size.
+    """
+    icon_count = len([name for name in os.listdir(icons.resource_path(icons.ICON_DIR)) if name.endswith(".png")])
+
+    assert icons.warm_icon_cache(sizes=((60, 60),)) == icon_count
+    with patch('PIL.Image.open') as mock_image_open:
+        icons.load_icon_image("01d", (60, 60))
+    mock_image_open.assert_not_called()
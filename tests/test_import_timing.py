@@ -0,0 +1,36 @@
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import import_timing
+
+@pytest.fixture(scope="module")
+def main_import_times():
+    """Measures `import main` once in a fresh interpreter for all tests in this file."""
+    return import_timing.measure_import_times("main")
+
+# --- Tests for the startup import budget ---
+
+@pytest.mark.parametrize("module", import_timing.DEFERRED_MODULES)
+def test_main_import_defers_heavy_modules(main_import_times, module):
+    """
+    Tests that heavy libraries are not pulled in before the window can be shown.
+    """
+    assert module not in main_import_times
+
+def test_main_import_within_budget(main_import_times):
+    """
+    Tests that importing the entry point stays within the startup budget.
+    """
+    cumulative_ms = main_import_times["main"][1] / 1000
+    assert cumulative_ms < import_timing.IMPORT_BUDGET_MS
+
+def test_format_report_lists_slowest_modules(main_import_times):
+    """
+    Tests that the report names the entry point and its budget.
+    """
+    report = import_timing.format_report(main_import_times)
+    assert report.startswith("import main:")
+    assert "budget" in report
+    assert "WARNING" not in report
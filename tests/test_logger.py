@@ -0,0 +1,111 @@
+import pytest
+import logging
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from logger import RotatingLogHandler
+
+def make_record(message, *args):
+    return logging.LogRecord("WeatherViewLogger", logging.INFO, __file__, 1, message, args, None)
+
+@pytest.fixture
+def log_file(tmp_path):
+    return str(tmp_path / "weatherview.log")
+
+# --- Tests for rotation ---
+
+def test_rotates_when_file_would_exceed_max_bytes(log_file, tmp_path):
+    """
+    Tests that the live log rolls over by size and stays under the limit.
+    """
+    handler = RotatingLogHandler(log_file, max_bytes=100, backup_count=5)
+    for i in range(6):
+        handler.handle(make_record("entry %d %s", i, "x" * 30))
+    handler.close()
+
+    assert os.path.getsize(log_file) < 100
+    rotated = handler.rotated_logs()
+    assert len(rotated) >= 2
+    assert all(os.path.getsize(path) < 100 for path in rotated)
+
+def test_rotated_names_do_not_collide(log_file):
+    """
+    Tests that several rollovers in the same second keep every file.
+    """
+    handler = RotatingLogHandler(log_file, max_bytes=10, backup_count=10)
+    with patch("logger.time.time", return_value=1751371200.0):
+        for i in range(3):
+            handler.handle(make_record("entry %d", i))
+    handler.close()
+
+    assert len(handler.rotated_logs()) == 2
+
+def test_rotates_at_midnight(log_file):
+    """
+    Tests that the first record after midnight starts a new file.
+    """
+    handler = RotatingLogHandler(log_file, max_bytes=0, backup_count=5)
+    handler.handle(make_record("yesterday"))
+    with patch("logger.time.time", return_value=handler.rollover_at + 1):
+        handler.handle(make_record("today"))
+    handler.close()
+
+    assert open(log_file).read() == "today\n"
+    assert [open(path).read() for path in handler.rotated_logs()] == ["yesterday\n"]
+    assert handler.rollover_at > datetime.now().timestamp()
+
+def test_keeps_only_backup_count_logs(log_file):
+    """
+    Tests that the oldest rotated logs are deleted.
+    """
+    handler = RotatingLogHandler(log_file, max_bytes=10, backup_count=2)
+    for i in range(6):
+        handler.handle(make_record("entry %d", i))
+    handler.close()
+
+    rotated = handler.rotated_logs()
+    assert len(rotated) == 2
+    assert [open(path).read() for path in rotated] == ["entry 3\n", "entry 4\n"]
+
+def test_empty_log_is_not_rotated(log_file):
+    """
+    Tests that a midnight rollover with nothing logged creates no backup.
+    """
+    handler = RotatingLogHandler(log_file, max_bytes=0, backup_count=5)
+    handler.doRollover()
+    handler.close()
+    assert handler.rotated_logs() == []
+
+# --- Tests for the queue pipeline ---
+
+def test_records_are_written_by_listener_thread(log_file):
+    """
+    Tests that the calling thread only enqueues and the file is written on the listener.
+    """
+    writers = []
+
+    class RecordingHandler(RotatingLogHandler):
+        def emit(self, record):
+            writers.append(threading.current_thread())
+            super().emit(record)
+
+    file_handler = RecordingHandler(log_file)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener.start()
+    try:
+        queue_handler.handle(make_record("Searching for location: %s", "Oslo"))
+    finally:
+        listener.stop()
+        file_handler.close()
+
+    assert open(log_file).read() == "Searching for location: Oslo\n"
+    assert writers and threading.current_thread() not in writers
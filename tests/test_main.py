@@ -35,3 +35,55 @@ def test_on_close_calls_destroy_and_logs():
         mock_logger.info.assert_called_once_with("Application closed by user.")
         mock_root.destroy.assert_called_once()
 
+
+def test_show_last_known_paints_cached_weather():
+    """
+    Tests that cached data from the last session is rendered at startup.
+    """
+    mock_ui = {"search_entry": MagicMock()}
+    unit_var = MagicMock()
+    last_known = {"city": "London", "weather": {"city": "London"}, "forecast": None, "stored_at": 0}
+
+    with patch("main.get_last_known", return_value=last_known), \
+         patch("main.render_weather") as mock_render:
+        assert main.show_last_known(mock_ui, unit_var) is True
+        mock_ui["search_entry"].insert.assert_called_once_with(0, "London")
+        mock_render.assert_called_once_with(mock_ui, unit_var, "London", {"city": "London"}, None)
+
+def test_load_initial_city_geolocates_in_background():
+    """
+    Tests that geolocation is handed to a worker thread instead of blocking startup.
+    """
+    mock_ui = {"root": MagicMock(), "search_entry": MagicMock()}
+    unit_var = MagicMock()
+
+    with patch("main.background.run_in_background") as mock_run, \
+         patch("main.handle_search") as mock_handle_search:
+        main.load_initial_city(mock_ui, unit_var)
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[:2] == (mock_ui["root"], main.get_user_city)
+        mock_handle_search.assert_not_called()
+
+def test_on_user_city_prefers_geolocation():
+    """
+    Tests that the geolocated city replaces the cached one before revalidating.
+    """
+    mock_ui = {"search_entry": MagicMock()}
+    unit_var = MagicMock()
+
+    with patch("main.handle_search") as mock_handle_search, \
+         patch("main.update_fav_button"):
+        main.on_user_city(mock_ui, unit_var, "Paris")
+        mock_ui["search_entry"].insert.assert_called_once_with(0, "Paris")
+        mock_handle_search.assert_called_once_with(mock_ui, unit_var)
+
+def test_on_user_city_does_not_override_user_search():
+    """
+    Tests that a late geolocation result does not replace a search the user already made.
+    """
+    mock_ui = {"search_entry": MagicMock(), "search_generation": 1}
+
+    with patch("main.handle_search") as mock_handle_search:
+        main.on_user_city(mock_ui, MagicMock(), "Paris")
+        mock_ui["search_entry"].insert.assert_not_called()
+        mock_handle_search.assert_not_called()
@@ -0,0 +1,118 @@
+import pytest
+import json
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import CurrentWeather, DailyForecast, ForecastSeries, day_to_date
+
+# 2999-07-01 00:00 UTC
+JULY_FIRST = 32487782400
+
+def make_series(timezone=0):
+    times = [JULY_FIRST + i * 10800 for i in range(16)]
+    temps = [float(i) for i in range(16)]
+    codes = [i % 2 for i in range(16)]
+    return ForecastSeries(times, temps, codes, [("clear", "01d"), ("rain", "10d")], timezone)
+
+# --- Tests for the record base ---
+
+def test_records_have_no_instance_dict():
+    """
+    Tests that records are slotted, so they carry no per-instance dict.
+    """
+    weather = CurrentWeather("Oslo", 10.0, "clear", 50, 3.0, "01d", JULY_FIRST)
+    assert not hasattr(weather, "__dict__")
+    with pytest.raises(AttributeError):
+        weather.pressure = 1000
+
+def test_records_read_like_dicts():
+    """
+    Tests mapping-style reads, including derived fields and the error check.
+    """
+    day = DailyForecast(20270, 20, 15, 25, "clear", "01d")
+    assert day["max_temp"] == 25
+    assert day["date"] == "2025-07-01"
+    assert "error" not in day
+    with pytest.raises(KeyError):
+        day["error"]
+
+def test_current_weather_round_trips_through_json():
+    """
+    Tests that a record survives the disk cache's JSON encoding.
+    """
+    weather = CurrentWeather("Oslo", 10.0, "clear", 50, 3.0, "01d", JULY_FIRST)
+    assert CurrentWeather.from_dict(json.loads(json.dumps(weather.to_dict()))) == weather
+
+def test_day_to_date():
+    """
+    Tests that day numbers count days since the Unix epoch.
+    """
+    assert day_to_date(0).isoformat() == "1970-01-01"
+    assert day_to_date(20270).isoformat() == "2025-07-01"
+
+# --- Tests for ForecastSeries ---
+
+def test_series_round_trips_through_json():
+    """
+    Tests that a series survives the disk cache's JSON encoding.
+    """
+    series = make_series(timezone=3600)
+    assert ForecastSeries.from_dict(json.loads(json.dumps(series.to_dict()))) == series
+
+def test_from_response_interns_conditions():
+    """
+    Tests that repeated (description, icon) pairs are stored once.
+    """
+    data = {
+        "city": {"timezone": -18000},
+        "list": [
+            {"dt": JULY_FIRST + i * 10800, "main": {"temp": i},
+             "weather": [{"description": "rain" if i == 1 else "clear", "icon": "10d" if i == 1 else "01d"}]}
+            for i in range(4)
+        ]
+    }
+    series = ForecastSeries.from_response(data)
+
+    assert len(series) == 4
+    assert series.kinds == [("clear", "01d"), ("rain", "10d")]
+    assert list(series.codes) == [0, 1, 0, 0]
+    assert series.timezone == -18000
+
+def test_arrays_share_memory_with_the_series():
+    """
+    Tests that the NumPy views are not copies.
+    """
+    series = make_series()
+    times, temps = series.arrays()
+    series.temps[0] = 99.0
+    assert temps[0] == 99.0
+    assert times[1] == JULY_FIRST + 10800
+
+def test_daily_picks_midday_entry_and_range():
+    """
+    Tests that each day shows its midday entry's conditions and the day's min and max.
+    """
+    daily = make_series().daily(now=JULY_FIRST)
+
+    assert [day.date for day in daily] == ["2999-07-01", "2999-07-02"]
+    assert (daily[0].temperature, daily[0].min_temp, daily[0].max_temp) == (4.0, 0.0, 7.0)
+    assert (daily[0].condition, daily[0].icon) == ("clear", "01d")
+    assert (daily[1].temperature, daily[1].min_temp, daily[1].max_temp) == (12.0, 8.0, 15.0)
+
+def test_daily_skips_days_before_today():
+    """
+    Tests that days already over in the location's time zone are dropped.
+    """
+    daily = make_series().daily(now=JULY_FIRST + 86400)
+    assert [day.date for day in daily] == ["2999-07-02"]
+
+def test_with_temps_leaves_original_unchanged():
+    """
+    Tests that converting temperatures builds a new series that shares the time column.
+    """
+    series = make_series()
+    converted = series.with_temps(t * 2 for t in series.temps)
+    assert converted.temps[3] == 6.0
+    assert series.temps[3] == 3.0
+    assert converted.times is series.times
@@ -0,0 +1,142 @@
+import pytest
+import threading
+import time
+from unittest.mock import ANY, MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import prefetch
+import weather_api
+from disk_cache import DiskCache
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keeps the recently-used list in a temporary database and resets the running prefetch."""
+    disk_cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    monkeypatch.setattr(prefetch, "_disk_cache", disk_cache)
+    monkeypatch.setattr(prefetch, "_running", None)
+    yield disk_cache
+    disk_cache.close()
+
+# --- Tests for the recently-used order ---
+
+def test_mark_used_moves_city_to_front():
+    """
+    Tests that the most recent search comes first and duplicates are collapsed.
+    """
+    prefetch.mark_used("London")
+    prefetch.mark_used("Paris")
+    prefetch.mark_used("london")
+    assert prefetch.recent_cities() == ["london", "Paris"]
+
+def test_mark_used_is_bounded(monkeypatch):
+    """
+    Tests that the list never grows past its limit.
+    """
+    monkeypatch.setattr(prefetch, "RECENT_CITIES_LIMIT", 3)
+    for city in ["A", "B", "C", "D"]:
+        prefetch.mark_used(city)
+    assert prefetch.recent_cities() == ["D", "C", "B"]
+
+def test_prioritise_orders_favourites_by_recent_use():
+    """
+    Tests that used favourites come first, most recent first, then the rest in saved order.
+    """
+    prefetch.mark_used("Oslo")
+    prefetch.mark_used("Berlin")
+    prefetch.mark_used("Sydney")
+    favourites = ["Lima", "Oslo", "Tokyo", "Sydney"]
+    assert prefetch.prioritise(favourites) == ["Sydney", "Oslo", "Lima", "Tokyo"]
+
+# --- Tests for prefetching ---
+
+def test_prefetch_cities_skips_forecasts_for_unknown_cities():
+    """
+    Tests that forecasts are only fetched for cities whose current weather was found.
+    """
+    weather = {"Oslo": {"city": "Oslo"}, "Nowhere": {"error": "Location not found."}}
+    with patch("prefetch.get_weather_for_cities", return_value=weather) as mock_weather, \
+         patch("prefetch.get_forecast_bundle", return_value={"daily": [], "points": []}) as mock_forecast:
+        assert prefetch.prefetch_cities(["Oslo", "Nowhere"]) == 1
+        mock_weather.assert_called_once_with(["Oslo", "Nowhere"], executor=ANY)
+        mock_forecast.assert_called_once_with("Oslo")
+
+def test_prefetch_cities_respects_concurrency_limit():
+    """
+    Tests that no more than `concurrency` forecast requests run at once.
+    """
+    cities = [f"City {i}" for i in range(6)]
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_forecast(city):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return {"daily": [], "points": []}
+
+    with patch("prefetch.get_weather_for_cities", return_value={city: {} for city in cities}), \
+         patch("prefetch.get_forecast_bundle", side_effect=slow_forecast):
+        assert prefetch.prefetch_cities(cities, concurrency=2) == 6
+    assert peak == 2
+
+def test_prefetch_current_weather_respects_concurrency_limit(monkeypatch):
+    """
+    Tests that the /group and per-city weather requests are limited too, and kept off the search pool.
+    """
+    cities = [f"City {i}" for i in range(6)]
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_request(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return {}
+
+    # Half the cities have a known ID and go through /group, one ID per request.
+    monkeypatch.setattr(weather_api, "GROUP_MAX_IDS", 1)
+    monkeypatch.setattr(weather_api, "_get_cached", lambda key: None)
+    monkeypatch.setattr(weather_api, "get_city_id", lambda city: int(city[-1]) if int(city[-1]) % 2 else None)
+    monkeypatch.setattr(weather_api, "_fetch_group", slow_request)
+    monkeypatch.setattr(weather_api, "get_weather_by_city", slow_request)
+
+    with patch.object(weather_api._request_executor, "submit") as mock_submit, \
+         patch("prefetch.get_forecast_bundle", return_value={"daily": [], "points": []}):
+        prefetch.prefetch_cities(cities, concurrency=2)
+    assert peak == 2
+    mock_submit.assert_not_called()
+
+def test_start_prefetch_runs_once_at_a_time():
+    """
+    Tests that opening the dropdown again while a prefetch is running does not start another.
+    """
+    root = MagicMock()
+    running = MagicMock()
+    running.done.return_value = False
+    with patch("prefetch.load_favourites", return_value=["Oslo", "Lima"]), \
+         patch("prefetch.run_in_background", return_value=running) as mock_run:
+        assert prefetch.start_prefetch(root) is running
+        assert prefetch.start_prefetch(root) is None
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[3] == ["Oslo", "Lima"]
+
+def test_start_prefetch_without_favourites():
+    """
+    Tests that nothing is scheduled when there are no favourites.
+    """
+    with patch("prefetch.load_favourites", return_value=[]), \
+         patch("prefetch.run_in_background") as mock_run:
+        assert prefetch.start_prefetch(MagicMock()) is None
+        mock_run.assert_not_called()
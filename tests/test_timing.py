@@ -0,0 +1,101 @@
+import pytest
+import json
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import timing
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """Turns timing on with an empty set of samples and no automatic flushing."""
+    monkeypatch.setattr(timing, "ENABLED", True)
+    monkeypatch.setattr(timing, "STATS_FLUSH_SECONDS", float("inf"))
+    timing.reset()
+    yield
+    timing.reset()
+
+# --- Tests for spans ---
+
+def test_span_is_shared_no_op_when_disabled(monkeypatch):
+    """
+    Tests that disabled spans allocate nothing and record nothing.
+    """
+    monkeypatch.setattr(timing, "ENABLED", False)
+    timing.reset()
+    assert timing.span("a") is timing.span("b")
+    with timing.span("render.chart"):
+        pass
+    assert timing.start() is None
+    timing.finish("search.total", None)
+    assert timing.stats() == {}
+
+def test_span_records_duration(enabled):
+    """
+    Tests that a span adds one sample to its stage.
+    """
+    with patch("timing.time.perf_counter", side_effect=[1.0, 1.25]):
+        with timing.span("render.chart"):
+            pass
+    assert timing.stats()["render.chart"]["last_ms"] == 250.0
+
+def test_span_records_when_block_raises(enabled):
+    """
+    Tests that a failing stage is still timed and the exception propagates.
+    """
+    with pytest.raises(ValueError):
+        with timing.span("api.forecast.parse"):
+            raise ValueError("bad payload")
+    assert timing.stats()["api.forecast.parse"]["count"] == 1
+
+def test_start_and_finish_span_threads(enabled):
+    """
+    Tests stages whose start and end happen in different places.
+    """
+    with patch("timing.time.perf_counter", side_effect=[10.0, 10.5]):
+        started = timing.start()
+        timing.finish("search.total", started)
+    assert timing.stats()["search.total"]["last_ms"] == 500.0
+
+# --- Tests for the rolling stats ---
+
+def test_stats_percentiles(enabled):
+    """
+    Tests nearest-rank p50 and p95 over the window.
+    """
+    for ms in range(1, 101):
+        timing.record("render.cards", float(ms))
+    assert timing.stats()["render.cards"] == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "last_ms": 100.0}
+
+def test_stats_window_is_rolling(enabled, monkeypatch):
+    """
+    Tests that only the most recent samples count.
+    """
+    monkeypatch.setattr(timing, "WINDOW_SIZE", 3)
+    for ms in [100.0, 1.0, 2.0, 3.0]:
+        timing.record("render.icon", ms)
+    assert timing.stats()["render.icon"]["count"] == 3
+    assert timing.stats()["render.icon"]["p95_ms"] == 3.0
+
+def test_write_stats(enabled, tmp_path):
+    """
+    Tests that the stats file holds every stage's summary.
+    """
+    path = tmp_path / "timing_stats.json"
+    assert not timing.write_stats(str(path))
+
+    timing.record("api.weather.request", 80.0)
+    assert timing.write_stats(str(path))
+    assert json.loads(path.read_text())["api.weather.request"]["p50_ms"] == 80.0
+    assert os.listdir(tmp_path) == ["timing_stats.json"]
+
+def test_record_flushes_periodically(enabled, monkeypatch):
+    """
+    Tests that the stats file is rewritten on a worker once the flush interval has passed.
+    """
+    monkeypatch.setattr(timing, "STATS_FLUSH_SECONDS", 0)
+    with patch("timing.submit") as mock_submit, patch("timing.write_stats") as mock_write:
+        timing.record("render.total", 5.0)
+        mock_submit.assert_called_once_with(mock_write)
+        mock_write.assert_not_called()
@@ -5,6 +5,9 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import ui_components
+import prefetch
+from disk_cache import DiskCache
+from models import CurrentWeather, DailyForecast, ForecastSeries
 
 # --- Test Fixtures ---
 
@@ -23,6 +26,27 @@ def mock_ui():
     yield ui
     root.destroy()
 
+@pytest.fixture(autouse=True)
+def run_synchronously():
+    """Runs background work inline so handle_search can be asserted on directly."""
+    def run_inline(root, func, on_done, *args, on_error=None):
+        try:
+            result = func(*args)
+        except Exception as e:
+            on_error(e)
+            return
+        on_done(result)
+    with patch('ui_components.run_in_background', side_effect=run_inline) as mock_run:
+        yield mock_run
+
+@pytest.fixture(autouse=True)
+def isolated_recent_cities(tmp_path, monkeypatch):
+    """Keeps the recently-used city list written by searches off the real disk cache."""
+    disk_cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    monkeypatch.setattr(prefetch, "_disk_cache", disk_cache)
+    yield disk_cache
+    disk_cache.close()
+
 @pytest.fixture
 def mock_unit_var():
     """Provides a mock Tkinter StringVar for the unit."""
@@ -32,37 +56,31 @@ def mock_unit_var():
 
 # --- Tests for handle_search ---
 
-@patch('ui_components.get_weather_by_city')
-@patch('ui_components.get_forecast_by_city')
-@patch('ui_components.get_detailed_forecast_by_city')
+@patch('ui_components.get_weather_and_forecast')
 @patch('ui_components.set_dynamic_background')
 @patch('ui_components.load_weather_icon')
-@patch('ui_components.create_forecast_figure')
+@patch('graph_forecast.ForecastChart')
 @patch('ui_components.embed_chart')
 @patch('ui_components.update_fav_button')
 @patch('ui_components.reset_auto_refresh')
 def test_handle_search_success(
-    mock_reset_refresh, mock_update_fav, mock_embed, mock_create_fig,
-    mock_load_icon, mock_set_bg, mock_get_detailed, mock_get_forecast,
-    mock_get_weather, mock_ui, mock_unit_var
+    mock_reset_refresh, mock_update_fav, mock_embed, mock_chart,
+    mock_load_icon, mock_set_bg, mock_get_weather, mock_ui, mock_unit_var
 ):
     """
     Tests the successful path of handle_search, where all API calls return valid data.
     """
-    mock_get_weather.return_value = {
-        "city": "London", "temperature": 15, "condition": "Clouds",
-        "humidity": 80, "wind_speed": 5, "day": "Tuesday",
-        "date": "2025-07-01", "time": "12:00", "icon": "04d"
-    }
-    mock_get_forecast.return_value = []
-    mock_get_detailed.return_value = []
+    mock_get_weather.return_value = (
+        CurrentWeather("London", 15, "Clouds", 80, 5, "04d", 1751371200),
+        ForecastSeries([], [], [], [])
+    )
     mock_load_icon.return_value = "fake_photo_image"
     mock_set_bg.return_value = ("#B0C4DE", "#3A4A5A", "#E8EEF4")
 
     ui_components.handle_search(mock_ui, mock_unit_var)
 
     mock_ui["status_label"].config.assert_any_call(text="Loading...", foreground="black")
-    mock_get_weather.assert_called_once_with("London", "metric")
+    mock_get_weather.assert_called_once_with("London")
     mock_ui["city_label"].config.assert_called_with(text="London", foreground="black")
     mock_ui["temp_label"].config.assert_called_with(text="Temperature: 15°C")
     assert mock_set_bg.call_count == 2
@@ -71,7 +89,7 @@ def test_handle_search_success(
     mock_update_fav.assert_called_once()
     mock_reset_refresh.assert_called_once()
 
-@patch('ui_components.get_weather_by_city')
+@patch('ui_components.get_weather_and_forecast')
 @patch('ui_components.update_fav_button')
 @patch('ui_components.reset_auto_refresh')
 def test_handle_search_location_not_found(
@@ -80,7 +98,7 @@ def test_handle_search_location_not_found(
     """
     Tests the failure path where the weather API returns a 'Location not found' error.
     """
-    mock_get_weather.return_value = {"error": "Location not found"}
+    mock_get_weather.return_value = ({"error": "Location not found"}, {"error": "city not found"})
 
     ui_components.handle_search(mock_ui, mock_unit_var)
 
@@ -91,30 +109,260 @@ def test_handle_search_location_not_found(
     mock_update_fav.assert_called_once()
     mock_reset_refresh.assert_called_once()
 
-# --- Tests for load_weather_icon ---
+@patch('ui_components.get_weather_and_forecast')
+@patch('ui_components.render_weather')
+def test_handle_search_fetches_in_background(
+    mock_render, mock_get_weather, mock_ui, mock_unit_var, run_synchronously
+):
+    """
+    Tests that the network work is handed to the background runner rather than run inline.
+    """
+    run_synchronously.side_effect = None
+
+    ui_components.handle_search(mock_ui, mock_unit_var)
+
+    run_synchronously.assert_called_once_with(
+        mock_ui["root"], ui_components.fetch_weather, ANY, "London", on_error=ANY
+    )
+    mock_get_weather.assert_not_called()
+    mock_render.assert_not_called()
+    mock_ui["search_button"].config.assert_called_with(state="disabled")
+
+@patch('ui_components.render_weather')
+def test_handle_search_discards_superseded_results(mock_render, mock_ui, mock_unit_var, run_synchronously):
+    """
+    Tests that only the newest search renders and older in-flight work is cancelled.
+    """
+    callbacks = []
+    futures = [MagicMock(), MagicMock()]
+
+    def capture(root, func, on_done, *args, on_error=None):
+        callbacks.append(on_done)
+        return futures[len(callbacks) - 1]
+
+    run_synchronously.side_effect = capture
+
+    ui_components.handle_search(mock_ui, mock_unit_var)
+    ui_components.handle_search(mock_ui, mock_unit_var)
+    futures[0].cancel.assert_called_once()
+
+    callbacks[1](({"city": "London"}, None))
+    callbacks[0](({"city": "Stale"}, None))
+
+    mock_render.assert_called_once_with(mock_ui, mock_unit_var, "London", {"city": "London"}, None)
+
+@patch('ui_components.fetch_weather', side_effect=RuntimeError("boom"))
+@patch('ui_components.render_weather')
+def test_handle_search_recovers_when_fetch_raises(mock_render, mock_fetch, mock_ui, mock_unit_var):
+    """
+    Tests that a crashed fetch is shown as a failed request instead of leaving the search busy.
+    """
+    ui_components.handle_search(mock_ui, mock_unit_var)
+
+    mock_render.assert_called_once_with(mock_ui, mock_unit_var, "London", {"error": "Request failed."}, None)
+    assert mock_ui["search_future"] is None
+
+# --- Tests for render_weather ---
+
+@patch('ui_components.set_dynamic_background', return_value=("#B0C4DE", "#3A4A5A", "#E8EEF4"))
+@patch('ui_components.load_weather_icon', return_value=None)
+@patch('ui_components.update_fav_button')
+@patch('ui_components.reset_auto_refresh')
+def test_render_weather_converts_units_locally(
+    mock_reset_refresh, mock_update_fav, mock_load_icon, mock_set_bg, mock_ui
+):
+    """
+    Tests that canonical data is converted for display and kept for re-rendering.
+    """
+    unit_var = MagicMock()
+    unit_var.get.return_value = "imperial"
+    result = CurrentWeather("London", 20, "Clouds", 80, 10, "04d", 1751371200)
+
+    ui_components.render_weather(mock_ui, unit_var, "London", result, None)
+
+    mock_ui["temp_label"].config.assert_called_with(text="Temperature: 68.0°F")
+    mock_ui["wind_label"].config.assert_called_with(text="Wind Speed: 22.4 mph")
+    assert mock_ui["last_search"] == ("London", result, None)
+
+# --- Tests for the forecast card pool ---
+
+def make_card():
+    return {name: MagicMock() for name in ("frame", "day_label", "date_label", "icon_label", "temp_label")}
+
+@patch('ui_components.load_weather_icon', return_value="fake_card_icon")
+def test_update_forecast_cards_reuses_pool(mock_load_icon):
+    """
+    Tests that cards are reconfigured in place and unused ones are hidden.
+    """
+    cards = [make_card() for _ in range(3)]
+    daily = [
+        DailyForecast(20270, 20, 15, 25, "clear", "01d"),  # 2025-07-01
+        DailyForecast(20271, 18, 12, 21, "rain", "10d")
+    ]
+
+    ui_components.update_forecast_cards(cards, daily, "#87CEFA", "#1E3A5F", "°C")
+
+    cards[0]["day_label"].configure.assert_called_with(text="Tuesday")
+    cards[0]["date_label"].configure.assert_called_with(text="2025-07-01")
+    cards[0]["icon_label"].configure.assert_called_with(image="fake_card_icon", text="")
+    cards[1]["temp_label"].configure.assert_called_with(text="12/21°C")
+    cards[0]["frame"].grid.assert_called_once_with()
+    cards[1]["frame"].grid.assert_called_once_with()
+    cards[2]["frame"].grid_remove.assert_called_once()
+    cards[2]["frame"].grid.assert_not_called()
+
+def test_update_forecast_cards_hides_all_without_data():
+    """
+    Tests that every card is hidden when there is no forecast to show.
+    """
+    cards = [make_card() for _ in range(2)]
+    ui_components.update_forecast_cards(cards, [], None, None, "°C")
+    for card in cards:
+        card["frame"].grid_remove.assert_called_once()
+
+# --- Tests for the persistent forecast chart ---
+
+@patch('matplotlib.backends.backend_tkagg.FigureCanvasTkAgg')
+def test_embed_chart_reuses_canvas(mock_canvas_cls):
+    """
+    Tests that the Tk canvas is built once and later searches only redraw it.
+    """
+    frame = MagicMock()
+    frame.winfo_ismapped.return_value = True
+    frame.winfo_width.return_value = 780
+    frame.winfo_children.return_value = []
+    fig = MagicMock()
+    mock_canvas_cls.return_value.figure = fig
+    ui = {"chart_frame": frame}
+
+    ui_components.embed_chart(ui, fig)
+    ui_components.embed_chart(ui, fig)
+
+    mock_canvas_cls.assert_called_once_with(fig, master=frame)
+    mock_canvas_cls.return_value.draw_idle.assert_called_once()
+
+def test_hide_chart_keeps_canvas():
+    """
+    Tests that hiding the chart unpacks the widget instead of destroying it.
+    """
+    canvas = MagicMock()
+    ui = {"chart_canvas": canvas}
+    ui_components.hide_chart(ui)
+    canvas.get_tk_widget.return_value.pack_forget.assert_called_once()
+    canvas.get_tk_widget.return_value.destroy.assert_not_called()
+
+def test_render_chart_in_background_shows_latest_only(run_synchronously):
+    """
+    Tests that off-thread chart renders are drawn by a worker and stale ones are skipped.
+    """
+    callbacks = []
+    run_synchronously.side_effect = lambda root, func, on_done, *args, on_error=None: callbacks.append((func, on_done))
+    ui = {"root": MagicMock(), "offscreen_chart": MagicMock()}
+
+    with patch('ui_components.show_chart_image') as mock_show:
+        ui_components.render_chart_in_background(ui, [], "London", "#fff", "#000", "#eee", "metric")
+        ui_components.render_chart_in_background(ui, [], "London", "#fff", "#000", "#eee", "imperial")
+        assert callbacks[0][0] == ui["offscreen_chart"].render
+
+        callbacks[0][1]((780, 240))
+        mock_show.assert_not_called()
+        callbacks[1][1]((780, 240))
+        mock_show.assert_called_once_with(ui, ui["offscreen_chart"])
 
-@patch('ui_components.os.path.exists', return_value=True)
-@patch('ui_components.Image.open')
-@patch('ui_components.ImageTk.PhotoImage')
-@patch('ui_components.resource_path', side_effect=lambda x: x)
-def test_load_weather_icon_success(mock_resource_path, mock_photo_image, mock_image_open, mock_exists):
+def test_render_chart_in_background_hides_chart_when_render_fails():
     """
-    Tests that a weather icon is loaded correctly when the file exists.
+    Tests that a failed off-thread render hides the chart rather than leaving the previous one up.
     """
-    result = ui_components.load_weather_icon("01d")
-    mock_exists.assert_called_once_with(os.path.join("weather_icons", "01d.png"))
-    mock_image_open.assert_called_once()
-    mock_photo_image.assert_called_once()
-    assert result is not None
+    ui = {"root": MagicMock(), "offscreen_chart": MagicMock()}
+    ui["offscreen_chart"].render.side_effect = RuntimeError("boom")
 
-@patch('ui_components.os.path.exists', return_value=False)
-@patch('ui_components.Image.open')
-@patch('ui_components.ImageTk.PhotoImage')
-@patch('ui_components.resource_path', side_effect=lambda x: x)
-def test_load_weather_icon_fallback_to_default(mock_resource_path, mock_photo_image, mock_image_open, mock_exists):
+    with patch('ui_components.show_chart_image') as mock_show, patch('ui_components.hide_chart') as mock_hide:
+        ui_components.render_chart_in_background(ui, [], "London", "#fff", "#000", "#eee", "metric")
+
+    mock_show.assert_not_called()
+    mock_hide.assert_called_once_with(ui)
+
+@patch('ui_components.get_weather_and_forecast')
+def test_fetch_weather_marks_found_cities_as_used(mock_get_weather):
     """
-    Tests that the default icon is loaded when the specific icon file does not exist.
+    Tests that only successful searches reorder the favourites prefetch.
     """
-    ui_components.load_weather_icon("non_existent_icon")
-    mock_image_open.assert_called_once_with(os.path.join("weather_icons", "default.png"))
-    mock_photo_image.assert_called_once()
+    mock_get_weather.return_value = ({"city": "Oslo"}, ForecastSeries([], [], [], []))
+    ui_components.fetch_weather("Oslo")
+    mock_get_weather.return_value = ({"error": "Location not found."}, {"error": "city not found"})
+    assert ui_components.fetch_weather("Nowhere") == ({"error": "Location not found."}, None)
+
+    assert prefetch.recent_cities() == ["Oslo"]
+
+# --- Tests for search suggestions ---
+
+def _search_ui():
+    return {
+        "root": MagicMock(), "search_entry": MagicMock(), "status_label": MagicMock(),
+        "search_button": MagicMock(), "suggestion_list": MagicMock(), "suggestions": []
+    }
+
+@patch('ui_components.update_fav_button')
+@patch('ui_components.fetch_weather', return_value=({"error": "Location not found."}, None))
+@patch('ui_components.render_weather')
+def test_handle_search_uses_coordinates_of_picked_suggestion(mock_render, mock_fetch, mock_update_fav, mock_unit_var):
+    """
+    Tests that a picked suggestion is searched by its coordinates and shown by its name.
+    """
+    mock_ui = _search_ui()
+    mock_ui["search_entry"].get.return_value = "London, CA"
+    mock_ui["selected_suggestion"] = {"label": "London, CA", "city": "London", "country": "CA", "coordinates": (42.98, -81.23)}
+
+    ui_components.handle_search(mock_ui, mock_unit_var)
+
+    mock_fetch.assert_called_once_with((42.98, -81.23))
+    assert mock_render.call_args.args[2] == "London"
+
+@patch('ui_components.fetch_weather', return_value=({"error": "Location not found."}, None))
+@patch('ui_components.render_weather')
+def test_handle_search_ignores_stale_suggestion(mock_render, mock_fetch, mock_unit_var):
+    """
+    Tests that editing the text after picking a suggestion searches by name again.
+    """
+    mock_ui = _search_ui()
+    mock_ui["search_entry"].get.return_value = "Londonderry"
+    mock_ui["selected_suggestion"] = {"label": "London, CA", "city": "London", "country": "CA", "coordinates": (42.98, -81.23)}
+
+    ui_components.handle_search(mock_ui, mock_unit_var)
+
+    mock_fetch.assert_called_once_with("Londonderry")
+
+@patch('ui_components.get_name_index', return_value=None)
+@patch('ui_components.load_favourites', return_value=["Oslo"])
+def test_on_search_typed_shows_suggestions(mock_load, mock_index):
+    """
+    Tests that typing two or more characters lists matching suggestions, and fewer hides them.
+    """
+    ui = {"search_entry": MagicMock(), "suggestion_list": MagicMock(), "suggestions": []}
+    event = MagicMock(keysym="s")
+
+    ui["search_entry"].get.return_value = "os"
+    ui_components.on_search_typed(ui, event)
+    assert ui["suggestions"] == [{"label": "Oslo", "city": "Oslo", "country": None, "coordinates": None}]
+    ui["suggestion_list"].insert.assert_called_once_with(tk.END, "Oslo")
+    ui["suggestion_list"].place.assert_called_once()
+
+    ui["search_entry"].get.return_value = "o"
+    ui_components.on_search_typed(ui, event)
+    ui["suggestion_list"].place_forget.assert_called_once()
+
+def test_choose_suggestion_fills_entry_and_searches(mock_unit_var):
+    """
+    Tests that choosing a suggestion remembers it and starts a search.
+    """
+    suggestion = {"label": "Paris, FR", "city": "Paris", "country": "FR", "coordinates": (48.85, 2.35)}
+    ui = {"search_entry": MagicMock(), "suggestion_list": MagicMock(), "suggestions": [suggestion]}
+    ui["suggestion_list"].curselection.return_value = (0,)
+
+    with patch('ui_components.handle_search') as mock_search, \
+         patch('ui_components.update_fav_button'):
+        ui_components.choose_suggestion(ui, mock_unit_var)
+        mock_search.assert_called_once_with(ui, mock_unit_var)
+
+    assert ui["selected_suggestion"] is suggestion
+    ui["search_entry"].insert.assert_called_once_with(0, "Paris, FR")
@@ -0,0 +1,46 @@
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import units
+from models import CurrentWeather, ForecastSeries
+
+# --- Tests for unit conversion ---
+
+@pytest.mark.parametrize("celsius, fahrenheit", [(0, 32), (100, 212), (-40, -40), (21.5, 70.7)])
+def test_convert_temperature_to_imperial(celsius, fahrenheit):
+    """Tests that Celsius values are converted to Fahrenheit."""
+    assert units.convert_temperature(celsius, "imperial") == fahrenheit
+
+def test_convert_temperature_metric_is_unchanged():
+    """Tests that canonical values pass through untouched."""
+    assert units.convert_temperature(21.5, "metric") == 21.5
+
+def test_convert_weather_leaves_errors_alone():
+    """Tests that error results are not converted."""
+    error = {"error": "Location not found."}
+    assert units.convert_weather(error, "imperial") is error
+
+def test_convert_weather_to_imperial():
+    """Tests that temperature and wind speed are converted into a new record."""
+    result = CurrentWeather("Oslo", 20.0, "clear", 50, 10.0, "01d", 1672531200)
+
+    converted = units.convert_weather(result, "imperial")
+
+    assert (converted.temperature, converted.wind_speed) == (68.0, 22.4)
+    assert converted.timestamp == 1672531200
+    assert result.temperature == 20.0
+
+def test_convert_forecast_bundle_to_imperial():
+    """Tests that daily cards and chart points are both converted."""
+    noon = 32487825600  # 2999-07-01 12:00 UTC
+    bundle = ForecastSeries([noon, noon + 10800], [0, 10], [0, 0], [("clear", "01d")])
+
+    result = units.convert_forecast_bundle(bundle, "imperial")
+
+    assert list(result.temps) == [32, 50]
+    assert result.times is bundle.times
+    assert result.daily(now=noon)[0].min_temp == 32
+    assert result.daily(now=noon)[0].max_temp == 50
+    assert list(bundle.temps) == [0, 10]
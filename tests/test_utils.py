@@ -1,4 +1,5 @@
 ﻿import pytest
+import json
 from unittest.mock import MagicMock, patch, ANY
 import tkinter as tk
 
@@ -9,8 +10,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Import modules to be tested
 import utils
+import favourites
 import themes
 import geolocation
+import cities
+from disk_cache import DiskCache
+from models import ForecastSeries
 
 # --- Tests for utils.py ---
 
@@ -25,47 +30,76 @@ def mock_ui():
     ui["search_entry"].get.return_value = "London"
     return ui
 
-def test_on_save_favourite_new_city(mock_ui):
+@pytest.fixture
+def favourites_file(tmp_path, monkeypatch):
+    """Backs the favourites functions with a file in a temporary directory."""
+    path = tmp_path / "favourites.json"
+    monkeypatch.setattr(favourites, "_store", favourites.FavouritesStore(str(path)))
+    return path
+
+def test_on_save_favourite_new_city(mock_ui, favourites_file):
     """Tests that a new city is saved and the UI is updated."""
-    with patch("utils.load_favourites", return_value=[]), \
-         patch("utils.save_favourite") as mock_save, \
-         patch("utils.update_fav_button") as mock_update:
+    with patch("utils.update_fav_button") as mock_update:
         
         # Action
         utils.on_save_favourite(mock_ui)
         
         # Assertions
-        mock_save.assert_called_once_with("London")
+        assert json.loads(favourites_file.read_text()) == ["London"]
         # Corrected Assertion: Check for the dictionary item assignment
         mock_ui["favourites_dropdown"].__setitem__.assert_called_once_with('values', ['London'])
         mock_update.assert_called_once_with(mock_ui)
 
-def test_update_fav_button_city_is_favourite(mock_ui):
+def test_update_fav_button_city_is_favourite(mock_ui, favourites_file):
     """Tests that the button shows 'Remove' when the city is a favourite."""
-    with patch("utils.load_favourites", return_value=["London"]):
-        utils.update_fav_button(mock_ui)
-        mock_ui["save_button"].config.assert_called_with(
-            text="Remove from Favourites",
-            # Use ANY from unittest.mock
-            command=ANY
-        )
-        mock_ui["favourites_dropdown"].set.assert_called_with("London")
-
-def test_on_remove_favourite(mock_ui):
+    favourites_file.write_text(json.dumps(["London"]))
+    utils.update_fav_button(mock_ui)
+    mock_ui["save_button"].config.assert_called_with(
+        text="Remove from Favourites",
+        # Use ANY from unittest.mock
+        command=ANY
+    )
+    mock_ui["favourites_dropdown"].set.assert_called_with("London")
+
+def test_on_remove_favourite(mock_ui, favourites_file):
     """Tests that a city is removed and the UI is updated."""
-    with patch("utils.load_favourites", return_value=["London"]), \
-         patch("utils.save_favourite") as mock_save, \
-         patch("utils.update_fav_button") as mock_update:
+    favourites_file.write_text(json.dumps(["London"]))
+    with patch("utils.update_fav_button") as mock_update:
         
         # Action
         utils.on_remove_favourite(mock_ui)
 
         # Assertions
-        mock_save.assert_called_once_with("London")
+        assert json.loads(favourites_file.read_text()) == []
         # Corrected Assertion: Check for the dictionary item assignment
         mock_ui["favourites_dropdown"].__setitem__.assert_called_once_with('values', [])
         mock_update.assert_called_once_with(mock_ui)
 
+def test_picked_suggestion_is_saved_with_its_country(mock_ui, favourites_file):
+    """Tests that picking "London, CA" saves "London,CA", not a bare "London" that would find London, GB."""
+    favourites_file.write_text(json.dumps(["London"]))
+    mock_ui["search_entry"].get.return_value = "London, CA"
+    mock_ui["selected_suggestion"] = {"label": "London, CA", "city": "London", "country": "CA", "coordinates": [42.98, -81.23]}
+
+    utils.update_fav_button(mock_ui)
+    mock_ui["save_button"].config.assert_called_with(text="Save to Favourites", command=ANY)
+
+    utils.on_save_favourite(mock_ui)
+    assert json.loads(favourites_file.read_text()) == ["London", "London,CA"]
+    mock_ui["save_button"].config.assert_called_with(text="Remove from Favourites", command=ANY)
+    mock_ui["favourites_dropdown"].set.assert_called_with("London,CA")
+
+def test_edited_entry_ignores_picked_suggestion(mock_ui):
+    """Tests that the suggestion is only used while the entry still shows its label."""
+    mock_ui["search_entry"].get.return_value = "paris"
+    mock_ui["selected_suggestion"] = {"label": "London, CA", "city": "London", "country": "CA", "coordinates": [42.98, -81.23]}
+    assert utils.favourite_city(mock_ui) == "Paris"
+
+def test_typed_country_code_stays_upper_case(mock_ui):
+    """Tests that a typed "City,CC" search is title-cased without turning "CA" into "Ca"."""
+    mock_ui["search_entry"].get.return_value = "london, ca"
+    assert utils.favourite_city(mock_ui) == "London,CA"
+
 # --- Tests for themes.py ---
 
 @pytest.mark.parametrize("condition", [
@@ -94,10 +128,7 @@ def test_create_forecast_figure():
     # Import locally to avoid collection errors
     import graph_forecast
     
-    forecast_data = [
-        {"datetime": "2025-07-01 12:00:00", "temperature": 20},
-        {"datetime": "2025-07-01 15:00:00", "temperature": 22}
-    ]
+    forecast_data = ForecastSeries([1751371200, 1751382000], [20, 22], [0, 0], [("clear", "01d")])
     fig = graph_forecast.create_forecast_figure(forecast_data, "Test City", "#FFFFFF", "#000000", "#EEEEEE", "metric")
     
     ax = fig.axes[0]
@@ -106,9 +137,50 @@ def test_create_forecast_figure():
     assert len(ax.lines[0].get_ydata()) == 2
     assert ax.lines[0].get_ydata()[1] == 22
 
+def test_forecast_chart_updates_in_place():
+    """Tests that a ForecastChart reuses its figure and line across updates."""
+    import graph_forecast
+
+    chart = graph_forecast.ForecastChart()
+    first = ForecastSeries([1751371200, 1751382000], [20, 22], [0, 0], [("clear", "01d")])
+    second = ForecastSeries([1751457600, 1751468400, 1751479200], [10, 12, 30], [0, 0, 0], [("clear", "01d")])
+    fig = chart.update(first, "Test City", "#FFFFFF", "#000000", "#EEEEEE", "metric")
+    line = chart.line
+
+    assert chart.update(second, "Other City", "#87CEFA", "#1E3A5F", "#E0F6FF", "imperial") is fig
+    assert len(chart.ax.lines) == 1 and chart.ax.lines[0] is line
+    assert list(line.get_ydata()) == [10, 12, 30]
+    assert chart.ax.get_ylim()[1] >= 30
+    assert "Other City (F)" in chart.ax.get_title()
+
+def test_forecast_chart_render_is_zero_copy():
+    """Tests that off-thread renders are exposed as a PIL image sharing the Agg buffer."""
+    import graph_forecast
+
+    chart = graph_forecast.ForecastChart()
+    data = ForecastSeries([1751371200, 1751382000], [20, 22], [0, 0], [("clear", "01d")])
+
+    assert chart.render(data, "Test City", "#FF0000", "#000000", "#EEEEEE", "metric") == (780, 240)
+    image = chart.rgba_image()
+    assert image.size == (780, 240)
+    assert image.getpixel((0, 0)) == (255, 0, 0, 255)
+
+    chart.render(data, "Test City", "#0000FF", "#000000", "#EEEEEE", "metric")
+    assert image.getpixel((0, 0)) == (0, 0, 255, 255)
+
 # --- Tests for geolocation.py ---
 
-@patch('geolocation.requests.get')
+@pytest.fixture(autouse=True)
+def isolated_geo_cache(tmp_path, monkeypatch):
+    """Gives every test its own on-disk geolocation cache and exercises the Nominatim fallback by default."""
+    disk_cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    monkeypatch.setattr(geolocation, "_disk_cache", disk_cache)
+    monkeypatch.setattr(geolocation, "nearest_city", lambda lat, lon: None)
+    monkeypatch.setenv("GEOPY_USER_AGENT_EMAIL", "test@example.com")
+    yield disk_cache
+    disk_cache.close()
+
+@patch('geolocation.http_client.get')
 def test_get_user_city_success(mock_get):
     """Tests successful retrieval of a user's city from IP and geolocation APIs."""
     mock_ip_response = MagicMock()
@@ -124,7 +196,7 @@ def test_get_user_city_success(mock_get):
     assert city == "London"
     assert mock_get.call_count == 2
 
-@patch('geolocation.requests.get', side_effect=Exception("Network Error"))
+@patch('geolocation.http_client.get', side_effect=Exception("Network Error"))
 @patch('geolocation.logger')
 def test_get_user_city_failure(mock_logger, mock_get):
     """Tests that None is returned and an error is logged on failure."""
@@ -132,3 +204,58 @@ def test_get_user_city_failure(mock_logger, mock_get):
     
     assert city is None
     mock_logger.error.assert_called_once()
+
+def _geo_responses(loc="51.50,-0.12", city="London"):
+    ip_response = MagicMock()
+    ip_response.json.return_value = {"loc": loc}
+    geo_response = MagicMock()
+    geo_response.json.return_value = {"address": {"city": city}}
+    return ip_response, geo_response
+
+@patch('geolocation.http_client.get')
+def test_get_user_city_uses_recent_result(mock_get):
+    """Tests that a recently resolved city is returned without any requests."""
+    mock_get.side_effect = _geo_responses()
+    assert geolocation.get_user_city() == "London"
+
+    assert geolocation.get_user_city() == "London"
+    assert mock_get.call_count == 2
+
+@patch('geolocation.http_client.get')
+def test_get_user_city_reuses_city_for_known_coordinates(mock_get, monkeypatch):
+    """Tests that only the IP lookup is repeated once the recent result expires."""
+    ip_response, geo_response = _geo_responses()
+    mock_get.side_effect = [ip_response, geo_response, ip_response]
+    monkeypatch.setattr(geolocation, "LOCATION_TTL", -1)
+
+    assert geolocation.get_user_city() == "London"
+    assert geolocation.get_user_city() == "London"
+    assert mock_get.call_count == 3
+
+@patch('geolocation.http_client.get')
+def test_get_user_city_does_not_cache_failures(mock_get):
+    """Tests that an unresolved city is not cached."""
+    ip_response, geo_response = _geo_responses()
+    geo_response.json.return_value = {"address": {}}
+    mock_get.side_effect = [ip_response, geo_response, *_geo_responses()]
+
+    assert geolocation.get_user_city() is None
+    assert geolocation.get_user_city() == "London"
+
+@patch('geolocation.http_client.get')
+def test_get_user_city_resolves_offline(mock_get, monkeypatch):
+    """Tests that coordinates near a bundled city are resolved without asking Nominatim."""
+    monkeypatch.setattr(geolocation, "nearest_city", cities.nearest_city)
+    mock_get.side_effect = _geo_responses(loc="48.86,2.35")[:1]
+
+    assert geolocation.get_user_city() == "Paris"
+    assert mock_get.call_count == 1
+
+@patch('geolocation.http_client.get')
+def test_get_user_city_without_online_fallback(mock_get, monkeypatch):
+    """Tests that Nominatim is not contacted when the fallback is disabled."""
+    monkeypatch.setattr(geolocation, "NOMINATIM_FALLBACK", False)
+    mock_get.side_effect = _geo_responses()[:1]
+
+    assert geolocation.get_user_city() is None
+    assert mock_get.call_count == 1
@@ -1,4 +1,7 @@
 import pytest
+import datetime
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
 # Add project root to the Python path
@@ -8,13 +11,35 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Import the module to be tested
 import weather_api
+import timing
+from datetime import timedelta
+from disk_cache import DiskCache
+from models import CurrentWeather, ForecastSeries
 
 # --- Test Fixtures ---
 
+class FrozenDatetime(datetime.datetime):
+    """A datetime whose `now` is 2025-07-01 12:00 UTC, the day the recorded forecasts start."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 7, 1, 12, tzinfo=tz)
+
+@pytest.fixture(autouse=True)
+def empty_cache(tmp_path, monkeypatch):
+    """Ensures cached responses never leak between tests or onto disk."""
+    disk_cache = DiskCache(str(tmp_path / "weather_cache.db"))
+    monkeypatch.setattr(weather_api, "_disk_cache", disk_cache)
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+    weather_api.clear_cache()
+    yield disk_cache
+    weather_api.clear_cache()
+    disk_cache.close()
+
 @pytest.fixture
 def mock_requests_get():
-    """Fixture to patch 'requests.get' and provide a mock response object."""
-    with patch('weather_api.requests.get') as mock_get:
+    """Fixture to patch 'http_client.get' and provide a mock response object."""
+    with patch('weather_api.http_client.get') as mock_get:
         mock_response = MagicMock()
         mock_get.return_value = mock_response
         yield mock_response
@@ -55,7 +80,7 @@ def test_get_weather_by_city_not_found(mock_requests_get):
     assert "error" in result
     assert result["error"] == "Location not found."
 
-@patch('weather_api.requests.get', side_effect=Exception("Network Error"))
+@patch('weather_api.http_client.get', side_effect=Exception("Network Error"))
 def test_get_weather_by_city_request_fails(mock_get):
     """
     Tests handling of a network failure during the API request.
@@ -75,17 +100,20 @@ def test_get_forecast_by_city_success(mock_requests_get):
     mock_requests_get.json.return_value = {
         "cod": "200", "city": {"timezone": 0},
         "list": [
-            {"dt_txt": "2025-07-01 12:00:00", "main": {"temp": 20}, "weather": [{"description": "clear", "icon": "01d"}]},
-            {"dt_txt": "2025-07-01 15:00:00", "main": {"temp": 22}, "weather": [{"description": "clear", "icon": "01d"}]}
+            {"dt": 1751371200, "dt_txt": "2025-07-01 12:00:00", "main": {"temp": 20}, "weather": [{"description": "clear", "icon": "01d"}]},
+            {"dt": 1751382000, "dt_txt": "2025-07-01 15:00:00", "main": {"temp": 22}, "weather": [{"description": "clear", "icon": "01d"}]}
         ]
     }
     
-    result = weather_api.get_forecast_by_city("London", "metric")
+    # Pin "now" so 2025-07-01 is today rather than a past day that gets dropped.
+    with patch("datetime.datetime", FrozenDatetime):
+        result = weather_api.get_forecast_by_city("London", "metric")
     
     assert isinstance(result, list)
-    assert len(result) > 0
+    assert len(result) == 1
     assert result[0]["date"] == "2025-07-01"
     assert result[0]["temperature"] == 20
+    assert (result[0]["min_temp"], result[0]["max_temp"]) == (20, 22)
 
 # --- Tests for get_detailed_forecast_by_city ---
 
@@ -97,17 +125,17 @@ def test_get_detailed_forecast_by_city_success(mock_requests_get):
     mock_requests_get.json.return_value = {
         "cod": "200",
         "list": [
-            {"dt_txt": "2025-07-01 12:00:00", "main": {"temp": 20}, "weather": [{"description": "clear", "icon": "01d"}]},
-            {"dt_txt": "2025-07-01 15:00:00", "main": {"temp": 22}, "weather": [{"description": "clear", "icon": "01d"}]}
+            {"dt": 1751371200, "dt_txt": "2025-07-01 12:00:00", "main": {"temp": 20}, "weather": [{"description": "clear", "icon": "01d"}]},
+            {"dt": 1751382000, "dt_txt": "2025-07-01 15:00:00", "main": {"temp": 22}, "weather": [{"description": "clear", "icon": "01d"}]}
         ]
     }
     
     result = weather_api.get_detailed_forecast_by_city("London", "metric")
     
-    assert isinstance(result, list)
+    assert isinstance(result, ForecastSeries)
     assert len(result) == 2
-    assert result[1]["datetime"] == "2025-07-01 15:00:00"
-    assert result[1]["temperature"] == 22
+    assert result.times[1] == 1751382000
+    assert result.temps[1] == 22
 
 # --- Tests for extract_daily_min_max ---
 
@@ -116,10 +144,10 @@ def test_extract_daily_min_max():
     Tests the logic of the helper function that extracts min/max temperatures.
     """
     forecast_list = [
-        {"dt_txt": "2025-07-01 12:00:00", "main": {"temp": 15}},
-        {"dt_txt": "2025-07-01 18:00:00", "main": {"temp": 20}},
-        {"dt_txt": "2025-07-02 12:00:00", "main": {"temp": 18}},
-        {"dt_txt": "2025-07-02 18:00:00", "main": {"temp": 25}}
+        {"dt": 1751371200, "dt_txt": "2025-07-01 12:00:00", "main": {"temp": 15}},
+        {"dt": 1751392800, "dt_txt": "2025-07-01 18:00:00", "main": {"temp": 20}},
+        {"dt": 1751457600, "dt_txt": "2025-07-02 12:00:00", "main": {"temp": 18}},
+        {"dt": 1751479200, "dt_txt": "2025-07-02 18:00:00", "main": {"temp": 25}}
     ]
     
     result = weather_api.extract_daily_min_max(forecast_list)
@@ -128,3 +156,452 @@ def test_extract_daily_min_max():
     assert result["2025-07-01"]["max"] == 20
     assert result["2025-07-02"]["min"] == 18
     assert result["2025-07-02"]["max"] == 25
+
+def test_parse_daily_forecast_groups_by_local_day():
+    """
+    Tests that days, midday picks and min/max follow the location's time zone, not UTC.
+    """
+    start = 32487804000  # 2999-07-01 06:00 UTC
+    entries = [
+        {"dt": start + i * 10800, "main": {"temp": float(i)}, "weather": [{"description": f"entry {i}", "icon": "01d"}]}
+        for i in range(16)
+    ]
+    # UTC+10: the first entry is 16:00 local, so the 06:00-UTC-based days shift.
+    daily = weather_api.parse_daily_forecast({"city": {"timezone": 36000}, "list": entries})
+
+    assert [day.date for day in daily] == ["2999-07-01", "2999-07-02", "2999-07-03"]
+    assert (daily[0].temperature, daily[0].min_temp, daily[0].max_temp) == (0.0, 0.0, 2.0)
+    assert (daily[0].condition, daily[0].icon) == ("entry 0", "01d")
+    # 2999-07-02 local noon is 02:00 UTC, entry 7.
+    assert daily[1].condition == "entry 7"
+    assert (daily[1].min_temp, daily[1].max_temp) == (3.0, 10.0)
+
+def test_parse_daily_forecast_handles_long_hourly_series():
+    """
+    Tests that a 16-day hourly series is summarised into one entry per day.
+    """
+    start = 32487782400  # 2999-07-01 00:00 UTC
+    entries = [
+        {"dt": start + i * 3600, "main": {"temp": i % 24}, "weather": [{"description": "clear", "icon": "01d"}]}
+        for i in range(16 * 24)
+    ]
+    daily = weather_api.parse_daily_forecast({"city": {"timezone": 0}, "list": entries})
+
+    assert len(daily) == 16
+    assert all(day.temperature == 12 and day.min_temp == 0 and day.max_temp == 23 for day in daily)
+
+def test_parse_daily_forecast_empty_list():
+    """
+    Tests that an empty forecast yields no days.
+    """
+    assert weather_api.parse_daily_forecast({"list": []}) == []
+
+# --- Tests for get_forecast_bundle ---
+
+def test_get_forecast_bundle_makes_single_request():
+    """
+    Tests that the daily summaries and chart points come from one /forecast request.
+    """
+    with patch('weather_api.http_client.get') as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "cod": "200", "city": {"timezone": 0},
+            "list": [
+                {"dt": 32487814800, "dt_txt": "2999-07-01 09:00:00", "main": {"temp": 18}, "weather": [{"description": "clear", "icon": "01d"}]},
+                {"dt": 32487825600, "dt_txt": "2999-07-01 12:00:00", "main": {"temp": 21}, "weather": [{"description": "clear", "icon": "01d"}]}
+            ]
+        }
+
+        result = weather_api.get_forecast_bundle("London", "metric")
+
+    mock_get.assert_called_once()
+    assert len(result) == 2
+    daily = result.daily()
+    assert daily[0].temperature == 21
+    assert daily[0].min_temp == 18
+    assert daily[0].max_temp == 21
+
+def test_get_forecast_bundle_api_error(mock_requests_get):
+    """
+    Tests that an API error is surfaced as a single error dict.
+    """
+    mock_requests_get.status_code = 404
+    mock_requests_get.json.return_value = {"cod": "404", "message": "city not found"}
+
+    result = weather_api.get_forecast_bundle("InvalidCity", "metric")
+
+    assert result == {"error": "city not found"}
+
+# --- Tests for the response cache ---
+
+def test_get_weather_by_city_served_from_cache(mock_requests_get):
+    """
+    Tests that a repeat lookup for the same city hits the cache instead of the network.
+    """
+    mock_requests_get.json.return_value = {
+        "cod": 200, "name": "London", "dt": 1672531200,
+        "main": {"temp": 15.55, "humidity": 80},
+        "wind": {"speed": 5.12},
+        "weather": [{"description": "broken clouds", "icon": "04d"}]
+    }
+
+    with patch('weather_api.http_client.get', return_value=mock_requests_get) as mock_get:
+        first = weather_api.get_weather_by_city("London", "metric")
+        second = weather_api.get_weather_by_city("  london ", "metric")
+
+    assert mock_get.call_count == 1
+    assert first == second
+    assert weather_api.cache_stats()["hits"] == 1
+
+def test_get_weather_by_city_errors_not_cached(mock_requests_get):
+    """
+    Tests that failed lookups are retried rather than cached.
+    """
+    mock_requests_get.json.return_value = {"cod": "404", "message": "city not found"}
+
+    with patch('weather_api.http_client.get', return_value=mock_requests_get) as mock_get:
+        weather_api.get_weather_by_city("InvalidCity", "metric")
+        weather_api.get_weather_by_city("InvalidCity", "metric")
+
+    assert mock_get.call_count == 2
+
+# --- Tests for the persistent cache ---
+
+def test_get_weather_by_city_survives_restart(mock_requests_get):
+    """
+    Tests that a fresh result persisted to disk is reused once memory is cleared.
+    """
+    mock_requests_get.json.return_value = {
+        "cod": 200, "name": "London", "dt": 1672531200,
+        "main": {"temp": 15.55, "humidity": 80},
+        "wind": {"speed": 5.12},
+        "weather": [{"description": "broken clouds", "icon": "04d"}]
+    }
+
+    with patch('weather_api.http_client.get', return_value=mock_requests_get) as mock_get:
+        first = weather_api.get_weather_by_city("London", "metric")
+        weather_api.clear_cache()
+        second = weather_api.get_weather_by_city("London", "metric")
+
+    assert mock_get.call_count == 1
+    assert first == second
+
+def test_disk_entry_is_promoted_for_its_remaining_ttl(empty_cache, mock_requests_get):
+    """
+    Tests that weather read back from disk expires from memory when it would have on disk.
+    """
+    mock_requests_get.json.return_value = {
+        "cod": 200, "name": "London", "dt": 1672531200,
+        "main": {"temp": 15.55, "humidity": 80},
+        "wind": {"speed": 5.12},
+        "weather": [{"description": "broken clouds", "icon": "04d"}]
+    }
+
+    with patch("disk_cache.time.time", return_value=1000):
+        weather_api.get_weather_by_city("London", "metric")
+    weather_api.clear_cache()
+
+    # Read back from disk 9 of its 10 minutes in, so only 1 minute is left.
+    with patch("disk_cache.time.time", return_value=1540), patch("cache.time.monotonic", return_value=0):
+        weather_api.get_weather_by_city("London", "metric")
+    with patch("cache.time.monotonic", return_value=59):
+        assert weather_api._cache.get(("weather", "london")) is not None
+    with patch("cache.time.monotonic", return_value=61):
+        assert weather_api._cache.get(("weather", "london")) is None
+
+def test_get_last_known_returns_stale_data(empty_cache):
+    """
+    Tests that the last searched city is returned regardless of its age.
+    """
+    empty_cache.set("meta|last_city", "London")
+    empty_cache.set("weather|london", CurrentWeather("London", 15, "Clouds", 80, 5, "04d", 1672531200).to_dict())
+    empty_cache.set("forecast|london", ForecastSeries([], [], [], []).to_dict())
+
+    with patch("disk_cache.time.time", return_value=10 ** 12):
+        result = weather_api.get_last_known()
+
+    assert result["city"] == "London"
+    assert result["weather"]["temperature"] == 15
+    assert result["forecast"] == ForecastSeries([], [], [], [])
+
+def test_get_last_known_ignores_entries_in_the_old_format(empty_cache):
+    """
+    Tests that weather cached before records were slotted is a miss, not a half-empty record.
+    """
+    empty_cache.set("meta|last_city", "London")
+    empty_cache.set("weather|london", {
+        "city": "London", "temperature": 15.6, "condition": "broken clouds", "humidity": 80,
+        "wind_speed": 5.1, "icon": "04d", "day": "Sunday", "date": "2023-01-01", "time": "12:00 AM"
+    })
+
+    assert weather_api.get_last_known() is None
+    assert weather_api._get_cached(("weather", "london")) is None
+
+def test_get_last_known_without_history():
+    """
+    Tests that nothing is returned before any search has been cached.
+    """
+    assert weather_api.get_last_known() is None
+
+def test_get_weather_by_city_unit_change_uses_cache(mock_requests_get):
+    """
+    Tests that data is fetched in canonical units and converted locally for other units.
+    """
+    mock_requests_get.json.return_value = {
+        "cod": 200, "name": "London", "dt": 1672531200,
+        "main": {"temp": 20, "humidity": 80},
+        "wind": {"speed": 10},
+        "weather": [{"description": "broken clouds", "icon": "04d"}]
+    }
+
+    with patch('weather_api.http_client.get', return_value=mock_requests_get) as mock_get:
+        metric = weather_api.get_weather_by_city("London", "metric")
+        imperial = weather_api.get_weather_by_city("London", "imperial")
+
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["units"] == "metric"
+    assert metric["temperature"] == 20
+    assert imperial["temperature"] == 68
+    assert imperial["wind_speed"] == 22.4
+
+# --- Tests for get_weather_and_forecast ---
+
+def test_get_weather_and_forecast_requests_run_concurrently():
+    """
+    Tests that both requests are in flight at the same time rather than back to back.
+    """
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_get(url, params=None):
+        barrier.wait()
+        response = MagicMock(status_code=200)
+        if url.endswith("/weather"):
+            response.json.return_value = {
+                "cod": 200, "name": "London", "dt": 1672531200,
+                "main": {"temp": 15, "humidity": 80}, "wind": {"speed": 5},
+                "weather": [{"description": "clear sky", "icon": "01d"}]
+            }
+        else:
+            response.json.return_value = {"cod": "200", "city": {"timezone": 0}, "list": []}
+        return response
+
+    with patch('weather_api.http_client.get', side_effect=fake_get):
+        result, forecast_bundle = weather_api.get_weather_and_forecast("London")
+
+    assert result["city"] == "London"
+    assert forecast_bundle == ForecastSeries([], [], [], [])
+
+def test_get_weather_and_forecast_partial_failure():
+    """
+    Tests that a forecast failure does not hide successfully fetched current weather.
+    """
+    with patch('weather_api.get_weather_by_city', return_value={"city": "London"}), \
+         patch('weather_api.get_forecast_bundle', side_effect=RuntimeError("boom")):
+        result, forecast_bundle = weather_api.get_weather_and_forecast("London")
+
+    assert result == {"city": "London"}
+    assert forecast_bundle == {"error": "boom"}
+
+# --- Tests for request coalescing ---
+
+def test_identical_concurrent_requests_are_coalesced():
+    """
+    Tests that two simultaneous lookups for the same city share one network call.
+    """
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow_get(url, params=None):
+        entered.set()
+        release.wait(timeout=5)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "cod": 200, "name": "London", "dt": 1672531200,
+            "main": {"temp": 15, "humidity": 80}, "wind": {"speed": 5},
+            "weather": [{"description": "clear sky", "icon": "01d"}]
+        }
+        return response
+
+    results = []
+    with patch('weather_api.http_client.get', side_effect=slow_get) as mock_get, \
+         patch('weather_api._get_cached', return_value=None):
+        first = threading.Thread(target=lambda: results.append(weather_api.get_weather_by_city("London")))
+        second = threading.Thread(target=lambda: results.append(weather_api.get_weather_by_city("london")))
+        first.start()
+        assert entered.wait(timeout=5)
+        second.start()
+        time.sleep(0.1)
+        release.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+    assert mock_get.call_count == 1
+    assert len(results) == 2
+    assert results[0] == results[1]
+    assert weather_api._in_flight == {}
+
+# --- Tests for lazy configuration ---
+
+def test_missing_api_key_fails_the_request_not_the_import(monkeypatch):
+    """
+    Tests that a missing API key is reported when a request is made rather than at import.
+    """
+    monkeypatch.setattr(weather_api, "get_env", lambda name, default=None: None)
+
+    with patch('weather_api.http_client.get') as mock_get, \
+         patch('weather_api.logger') as mock_logger:
+        result = weather_api.get_weather_by_city("London")
+
+    assert result == {"error": "Request failed."}
+    mock_get.assert_not_called()
+    mock_logger.error.assert_any_call("OPENWEATHER_API_KEY is not set in your .env file")
+
+# --- Tests for batched favourites refresh ---
+
+def _weather_payload(city, city_id):
+    return {
+        "cod": 200, "id": city_id, "name": city, "dt": 1672531200,
+        "main": {"temp": 10.0, "humidity": 70},
+        "wind": {"speed": 3.0},
+        "weather": [{"description": "clear sky", "icon": "01d"}]
+    }
+
+def test_get_weather_by_city_records_city_id(mock_requests_get):
+    """
+    Tests that the city ID from a /weather response is remembered for batch requests.
+    """
+    mock_requests_get.json.return_value = _weather_payload("London", 2643743)
+    weather_api.get_weather_by_city(" london ")
+    assert weather_api.get_city_id("London") == 2643743
+    assert weather_api.get_city_id("Paris") is None
+
+def test_get_weather_for_cities_batches_known_ids(empty_cache):
+    """
+    Tests that cities with known IDs are fetched 20 per /group request and cached.
+    """
+    cities = [f"City {i}" for i in range(25)]
+    for i, city in enumerate(cities):
+        empty_cache.set(f"city_id|{weather_api.normalize_city(city)}", 1000 + i)
+
+    def fake_get(url, params=None):
+        assert url.endswith("/group")
+        ids = [int(city_id) for city_id in params["id"].split(",")]
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"cnt": len(ids), "list": [_weather_payload(f"City {i - 1000}", i) for i in ids]}
+        return response
+
+    with patch("weather_api.http_client.get", side_effect=fake_get) as mock_get:
+        results = weather_api.get_weather_for_cities(cities)
+        assert mock_get.call_count == 2
+        assert sorted(len(call.kwargs["params"]["id"].split(",")) for call in mock_get.call_args_list) == [5, 20]
+        assert results["City 7"]["city"] == "City 7"
+
+        # Every city is now cached, so searching any of them makes no request.
+        assert weather_api.get_weather_by_city("City 24", "imperial")["temperature"] == 50.0
+        assert mock_get.call_count == 2
+
+def test_get_weather_for_cities_falls_back_without_id(mock_requests_get):
+    """
+    Tests that a city with no known ID is fetched individually and its ID recorded.
+    """
+    mock_requests_get.json.return_value = _weather_payload("Oslo", 3143244)
+    results = weather_api.get_weather_for_cities(["Oslo"])
+    assert results["Oslo"]["city"] == "Oslo"
+    assert weather_api.get_city_id("Oslo") == 3143244
+
+def test_get_weather_for_cities_group_failure_not_cached(empty_cache, mock_requests_get):
+    """
+    Tests that a failed /group request yields errors and caches nothing.
+    """
+    empty_cache.set("city_id|oslo", 3143244)
+    mock_requests_get.status_code = 401
+    mock_requests_get.json.return_value = {"cod": 401, "message": "Invalid API key"}
+
+    results = weather_api.get_weather_for_cities(["Oslo"])
+    assert results == {"Oslo": {"error": "Request failed."}}
+    assert weather_api.cache_stats()["size"] == 0
+
+# --- Tests for coordinate searches ---
+
+def test_get_weather_by_coordinates(mock_requests_get):
+    """
+    Tests that a (lat, lon) location is queried by coordinates and cached separately from names.
+    """
+    mock_requests_get.json.return_value = _weather_payload("London", 2643743)
+    result = weather_api.get_weather_by_city((51.5085, -0.1257))
+
+    params = weather_api.http_client.get.call_args.kwargs["params"]
+    assert params["lat"] == "51.5085" and params["lon"] == "-0.1257"
+    assert "q" not in params
+    assert result["city"] == "London"
+    assert weather_api.cache_key("weather", (51.5085, -0.1257)) != weather_api.cache_key("weather", "London")
+
+    weather_api.get_weather_by_city((51.5085, -0.1257))
+    assert weather_api.http_client.get.call_count == 1
+
+def test_get_last_known_after_coordinate_search(mock_requests_get):
+    """
+    Tests that the last-known weather survives a search made by coordinates.
+    """
+    mock_requests_get.json.return_value = _weather_payload("London", 2643743)
+    weather_api.get_weather_by_city((51.5085, -0.1257))
+
+    last_known = weather_api.get_last_known()
+    assert last_known["city"] == "London"
+    assert last_known["weather"]["city"] == "London"
+
+# --- Tests for the cached record format ---
+
+def test_forecast_is_cached_on_disk_as_columns(empty_cache, mock_requests_get):
+    """
+    Tests that a forecast is stored column by column and rebuilt after a restart.
+    """
+    mock_requests_get.status_code = 200
+    mock_requests_get.json.return_value = {
+        "cod": "200", "city": {"timezone": 3600},
+        "list": [
+            {"dt": 32487814800 + i * 10800, "main": {"temp": 10 + i}, "weather": [{"description": "clear", "icon": "01d"}]}
+            for i in range(8)
+        ]
+    }
+    series = weather_api.get_forecast_bundle("Oslo")
+
+    stored = empty_cache.get("forecast|oslo")[0]
+    assert stored["times"][:2] == [32487814800, 32487825600]
+    assert stored["kinds"] == [["clear", "01d"]]
+    assert stored["codes"] == [0] * 8
+
+    weather_api.clear_cache()
+    assert weather_api.get_forecast_bundle("Oslo") == series
+    assert mock_requests_get.json.call_count == 1
+
+def test_old_cache_entries_are_treated_as_misses(empty_cache, mock_requests_get):
+    """
+    Tests that a forecast cached in the previous dict format is fetched again.
+    """
+    empty_cache.set("forecast|oslo", {"daily": [], "points": []})
+    mock_requests_get.status_code = 200
+    mock_requests_get.json.return_value = {"cod": "200", "city": {"timezone": 0}, "list": []}
+
+    assert weather_api.get_forecast_bundle("Oslo") == ForecastSeries([], [], [], [])
+    mock_requests_get.json.assert_called_once()
+
+# --- Tests for timing instrumentation ---
+
+def test_forecast_fetch_records_timing_spans(empty_cache, mock_requests_get, monkeypatch):
+    """
+    Tests that each stage of a fetch is timed when timing is enabled.
+    """
+    monkeypatch.setattr(timing, "ENABLED", True)
+    monkeypatch.setattr(timing, "STATS_FLUSH_SECONDS", float("inf"))
+    timing.reset()
+    mock_requests_get.status_code = 200
+    mock_requests_get.elapsed = timedelta(milliseconds=120)
+    mock_requests_get.json.return_value = {"cod": "200", "city": {"timezone": 0}, "list": []}
+
+    weather_api.get_forecast_bundle("Oslo")
+
+    stats = timing.stats()
+    timing.reset()
+    assert set(stats) == {"api.forecast.request", "api.forecast.headers", "api.forecast.decode", "api.forecast.parse"}
+    assert stats["api.forecast.headers"]["last_ms"] == 120.0
@@ -0,0 +1,153 @@
+"""
+Lightweight timing spans for the stages of a search.
+
+Enable with WEATHERVIEW_TIMING=1. Each finished span is logged at DEBUG
+level and added to a rolling window per stage; p50/p95 summaries are written
+to logs/timing_stats.json at most every STATS_FLUSH_SECONDS, on a background
+worker, and when the app closes.
+
+When disabled, `span` returns one shared no-op context manager, so a timed
+block costs a function call and an attribute check.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from background import submit
+from logger import logger
+
+ENABLED = os.getenv("WEATHERVIEW_TIMING", "0") == "1"
+STATS_FILE = os.path.join("logs", "timing_stats.json")
+# Percentiles are computed over this many of the most recent samples per stage.
+WINDOW_SIZE = 200
+STATS_FLUSH_SECONDS = 10
+
+_NULL_SPAN = nullcontext()
+_samples = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+def span(name):
+    """
+    Times a block of code as one stage.
+
+    Usage:
+        with timing.span("render.chart"):
+            ...
+
+    Args:
+        name (str): The stage name, e.g. "api.forecast.request".
+
+    Returns:
+        A context manager; a shared no-op one when timing is disabled.
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+def start():
+    """
+    Returns a start time for a stage that does not fit in one block, e.g. one spanning threads.
+
+    Returns:
+        float | None: Pass it to `finish`; None when timing is disabled.
+    """
+    return time.perf_counter() if ENABLED else None
+
+def finish(name, started):
+    """Records the stage `name` begun by `start`. Does nothing if timing was disabled then."""
+    if started is not None:
+        record(name, (time.perf_counter() - started) * 1000)
+
+def record(name, duration_ms):
+    """
+    Adds one sample to a stage's rolling window. Safe to call from any thread.
+
+    Args:
+        name (str): The stage name.
+        duration_ms (float): How long the stage took, in milliseconds.
+    """
+    global _last_flush
+    logger.debug("timing %s: %.2f ms", name, duration_ms)
+    now = time.monotonic()
+    with _lock:
+        window = _samples.get(name)
+        if window is None:
+            window = _samples[name] = deque(maxlen=WINDOW_SIZE)
+        window.append(duration_ms)
+        due = now - _last_flush >= STATS_FLUSH_SECONDS
+        if due:
+            _last_flush = now
+    if due:
+        # Spans close on the Tk thread too, which must not wait on file I/O.
+        submit(write_stats)
+
+def _percentile(ordered, fraction):
+    # Nearest-rank percentile of an already sorted list.
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+def stats():
+    """
+    Summarises the recent samples of every stage.
+
+    Returns:
+        dict: Maps each stage name to {"count", "p50_ms", "p95_ms", "last_ms"}.
+    """
+    with _lock:
+        windows = {name: list(window) for name, window in _samples.items()}
+
+    summary = {}
+    for name, samples in sorted(windows.items()):
+        ordered = sorted(samples)
+        summary[name] = {
+            "count": len(samples),
+            "p50_ms": round(_percentile(ordered, 0.50), 3),
+            "p95_ms": round(_percentile(ordered, 0.95), 3),
+            "last_ms": round(samples[-1], 3)
+        }
+    return summary
+
+def write_stats(path=STATS_FILE):
+    """
+    Atomically rewrites the stats file with the current summaries.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    summary = stats()
+    if not summary:
+        return False
+
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        logger.error("Could not write timing stats: %s - %s", type(e).__name__, e)
+        return False
+
+def reset():
+    """Discards every recorded sample."""
+    with _lock:
+        _samples.clear()
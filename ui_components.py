@@ -1,40 +1,139 @@
 import tkinter as tk
 from tkinter import ttk
-import os
-import sys
 from datetime import datetime
-from PIL import Image, ImageTk
 from logger import logger
-from weather_api import get_weather_by_city, get_forecast_by_city, get_detailed_forecast_by_city
+from config import get_env
+from weather_api import get_weather_and_forecast
+from units import convert_weather, convert_forecast_bundle, temperature_symbol, speed_symbol
 from themes import set_dynamic_background
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from graph_forecast import create_forecast_figure
 from utils import update_fav_button
+from icons import load_weather_icon, MAIN_ICON_SIZE, CARD_ICON_SIZE
+from background import run_in_background
+from prefetch import mark_used
+from favourites import load_favourites
+from cities import get_name_index, suggest_cities
+from models import day_to_date
+import timing
+
+# matplotlib (via graph_forecast and the TkAgg backend) is only imported when the
+# first chart is drawn, so the window can appear before it has loaded.
+
+# The 5-day forecast can span six calendar days depending on the time of the search.
+FORECAST_CARD_COUNT = 6
+
+# "canvas" draws the chart with FigureCanvasTkAgg on the Tk thread. "thread" rasterizes
+# it with a headless Agg canvas on a worker, leaving the Tk thread to swap an image;
+# useful on low-power machines where chart drawing dominates a search.
+# Set with WEATHERVIEW_CHART_RENDER in the environment or .env; this is the default.
+CHART_RENDER_MODE = "canvas"
+
+# Suggestions start after this many characters; single letters match too many cities to be useful.
+MIN_PREFIX_LENGTH = 2
+# Keys that move around the entry or act on it rather than change its text.
+NAVIGATION_KEYS = {"Return", "KP_Enter", "Escape", "Up", "Down", "Left", "Right", "Tab", "Home", "End"}
 
 def handle_search(ui, unit_var):
     """
     Main function to fetch and display weather data for a given city.
 
     This function orchestrates the entire data retrieval and UI update process.
-    It fetches current weather, 5-day forecast, and detailed forecast data,
-    then updates all relevant UI components, including labels, icons, and graphs.
+    It fetches current weather and a single forecast bundle (daily summaries
+    plus 3-hourly chart points) on a background thread, then passes them to
+    `render_weather` on the Tk thread to update all relevant UI components,
+    including labels, icons, and graphs. The mainloop never waits on the network.
 
     Args:
         ui (dict): A dictionary of UI widget references.
         unit_var (tk.StringVar): The Tkinter variable holding the unit system ('metric' or 'imperial').
     """
     city = ui["search_entry"].get()
-    unit = unit_var.get()
+    location = city
+    suggestion = ui.get("selected_suggestion")
+    if suggestion and suggestion["label"] == city and suggestion["coordinates"]:
+        # A picked suggestion is searched by coordinates, which is unambiguous.
+        location = tuple(suggestion["coordinates"])
+        city = suggestion["city"]
+    hide_suggestions(ui)
+
     ui["status_label"].config(text="Loading...", foreground="black")
-    ui["status_label"].update_idletasks()
     ui["search_button"].config(state="disabled")
-    logger.info(f"Searching for location: {city}")
+    logger.info("Searching for location: %s", city)
+    started = timing.start()
+
+    # Each search gets a generation id; results from superseded searches are dropped
+    # so a slow earlier request can never overwrite a newer one.
+    generation = ui.get("search_generation", 0) + 1
+    ui["search_generation"] = generation
+
+    previous = ui.get("search_future")
+    if previous is not None:
+        previous.cancel()
+
+    def on_fetched(data):
+        if ui["search_generation"] != generation:
+            logger.info("Discarding stale results for %s", city)
+            return
+        ui["search_future"] = None
+        timing.finish("search.fetch", started)
+        render_weather(ui, unit_var, city, *data)
+        timing.finish("search.total", started)
+
+    def on_failed(error):
+        # Shown like any other failed request, which also re-enables the search button.
+        on_fetched(({"error": "Request failed."}, None))
+
+    ui["search_future"] = run_in_background(ui["root"], fetch_weather, on_fetched, location, on_error=on_failed)
+
+
+def fetch_weather(city):
+    """
+    Fetches everything a search needs. Runs on a worker thread, so it must not touch widgets.
+
+    Current weather and the forecast are requested concurrently; the forecast
+    is discarded if the location itself could not be found. Found cities are
+    recorded as recently used, which orders the favourites prefetch.
+
+    Args:
+        city (str | tuple): The city name, or (lat, lon) for a picked suggestion.
+
+    Returns:
+        tuple: (current weather, forecast bundle or None).
+    """
+    result, forecast_bundle = get_weather_and_forecast(city)
+    if "error" in result:
+        forecast_bundle = None
+    else:
+        mark_used(city if isinstance(city, str) else result["city"])
+    return result, forecast_bundle
+
+
+def render_weather(ui, unit_var, city, result, forecast_bundle):
+    """
+    Updates every weather widget from already-fetched data.
+
+    Kept separate from `handle_search` so cached data can be painted without
+    touching the network, e.g. the last-known weather shown at startup or a
+    unit toggle. Data arrives in canonical units and is converted here.
 
+    Args:
+        ui (dict): A dictionary of UI widget references.
+        unit_var (tk.StringVar): The Tkinter variable holding the unit system.
+        city (str): The city that was searched for.
+        result (CurrentWeather | dict): Current weather from `get_weather_by_city`.
+        forecast_bundle (ForecastSeries | dict | None): The result of `get_forecast_bundle`,
+                                                        or None if it was not fetched.
+    """
+    render_started = timing.start()
+    ui["last_search"] = (city, result, forecast_bundle)
+    unit = unit_var.get()
+    result = convert_weather(result, unit)
+    forecast_bundle = convert_forecast_bundle(forecast_bundle, unit)
+    unit_symbol = temperature_symbol(unit)
     error_type = None
+    bg = border = light = None
 
     #---Current Weather---
     try:
-        result = get_weather_by_city(city, unit)
         if "error" in result:
             if "Location" in result["error"]:
                 ui["city_label"].config(text="City: Not found", foreground="red")
@@ -49,18 +148,19 @@ def handle_search(ui, unit_var):
             ui["icon_label"].config(image="")
             icon_code = "error"
         else:
-            unit_symbol = "°C" if unit == "metric" else "°F"
             ui["city_label"].config(text=f"{result['city']}", foreground="black")
             ui["temp_label"].config(text=f"Temperature: {result['temperature']}{unit_symbol}")
             ui["condition_label"].config(text=f"Condition: {result['condition']}")
             ui["humidity_label"].config(text=f"Humidity: {result['humidity']}%")
-            ui["wind_label"].config(text=f"Wind Speed: {result['wind_speed']} m/s")
-            ui["time_label"].config(text=f"{result['day']} {result['date']} {result['time']}")
-            bg, border, light = set_dynamic_background(ui["root"], result["condition"])
+            ui["wind_label"].config(text=f"Wind Speed: {result['wind_speed']} {speed_symbol(unit)}")
+            ui["time_label"].config(text=format_observation_time(result.timestamp))
+            with timing.span("render.background"):
+                bg, border, light = set_dynamic_background(ui["root"], result["condition"])
 
-            icon_code = result.get("icon")
+            icon_code = result["icon"]
         if icon_code:
-            photo = load_weather_icon(icon_code, size=(150, 150))
+            with timing.span("render.icon"):
+                photo = load_weather_icon(icon_code, size=MAIN_ICON_SIZE)
             if photo:
                 ui["icon_label"].config(image=photo)
                 ui["icon_label"].image = photo
@@ -73,82 +173,38 @@ def handle_search(ui, unit_var):
 
      #---Forecast---
     try:
-        container = ui["forecast_cards_container"]
-        for widget in container.winfo_children():
-                widget.destroy()
-
-        if "error" not in result:
-            forecast = get_forecast_by_city(city, unit)
-        
-            if isinstance(forecast, dict) and "error" in forecast:
+        daily = []
+        if "error" not in result and forecast_bundle is not None:
+            if "error" in forecast_bundle:
                 error_type = "Could not get Forecast"
             else:
-                forecast_icons = []
-                for i, day in enumerate(forecast):
-                    card = tk.Frame(
-                        container,
-                        relief="flat",
-                        highlightbackground=border,
-                        highlightthickness=1,
-                        bg=bg,
-                        width=150,
-                        height=155
-                    )
-                    card.pack_propagate(False)
-                    card.grid(row=0, column=i, padx=5, pady=5)
-
-                    try:
-                        date_obj = datetime.strptime(day["date"], "%Y-%m-%d") 
-                        day_name = date_obj.strftime("%A")
-                        ttk.Label(card, text=day_name, font=("Segoe UI", 13, "bold")).pack(anchor="w", padx=5)
-                        ttk.Label(card, text=day["date"], font=("Segoe UI", 10)).pack(anchor="w", padx=5)
-                    except Exception as e:
-                        ttk.Label(card, text=day["date"], font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=5)
-                        logger.debug(f"Could not set day for forecast card: {type(e).__name__} - {e}")
-
-                    try:
-                        icon_code = day['icon']
-                        icon_path = resource_path(os.path.join("weather_icons", f"{icon_code}.png"))
-                        img = Image.open(icon_path).resize((60, 60), Image.LANCZOS)
-                        icon_img = ImageTk.PhotoImage(img)
-                        forecast_icons.append(icon_img)
-                        icon_label = ttk.Label(card, image=icon_img)
-                        icon_label.image = icon_img
-                        icon_label.pack(pady=5)
-                    except Exception as e:
-                        ttk.Label(card, text="(icon)").pack(pady=5)
-                        icon_img = ImageTk.PhotoImage(img)
-                        forecast_icons.append(icon_img)
-                        icon_label = ttk.Label(card, image=icon_img)
-                        icon_label.image = icon_img
-                        icon_label.pack(pady=5)
-                        logger.debug(f"Could not set icon for forecast card: {type(e).__name__} - {e}")
-
-                    try:
-                        temp_text = f"{day["min_temp"]}/{day["max_temp"]}{unit_symbol}"
-                        ttk.Label(card, text=temp_text, font=("Segoe UI", 10, "bold")).pack(anchor="center", pady=(5, 0))
-                    except Exception as e:
-                        ttk.Label(card, text=day["temperature"], font=("Segoe UI", 10, "bold")).pack(anchor="w")
-                        logger.debug(f"Could not set temperature for forecast card: {type(e).__name__} - {e}")
+                daily = forecast_bundle.daily()
+        with timing.span("render.cards"):
+            update_forecast_cards(ui.get("forecast_cards", []), daily, bg, border, unit_symbol)
     except Exception as e:
         logger.error("Failed to retrieve Forecast from API")  
     
     #---Detailed Forecast---
-    if "error" not in result and "error" not in forecast:
+    if "error" not in result and forecast_bundle is not None and "error" not in forecast_bundle:
         try:
-            detailed_forecast = get_detailed_forecast_by_city(city, unit,)
-    
-            if isinstance(detailed_forecast, list) and detailed_forecast:
-                fig = create_forecast_figure(detailed_forecast, city, bg, border, light, unit)
-                embed_chart(ui, fig)
+            detailed_forecast = forecast_bundle
+
+            if detailed_forecast and get_env("WEATHERVIEW_CHART_RENDER", CHART_RENDER_MODE) == "thread":
+                render_chart_in_background(ui, detailed_forecast, city, bg, border, light, unit)
+            elif detailed_forecast:
+                chart = ui.get("forecast_chart")
+                if chart is None:
+                    from graph_forecast import ForecastChart
+                    chart = ui["forecast_chart"] = ForecastChart()
+                with timing.span("render.chart"):
+                    chart.update(detailed_forecast, city, bg, border, light, unit)
+                    embed_chart(ui, chart.figure)
         except Exception as e:
             error_type = "Could not graph Forecast"
-            logger.error(f"Could not graph Forecast: {type(e).__name__} - {e}")
-            for widget in ui["chart_frame"].winfo_children():
-                widget.destroy()
+            logger.error("Could not graph Forecast: %s - %s", type(e).__name__, e)
+            hide_chart(ui)
     else:
-        for widget in ui["chart_frame"].winfo_children():
-            widget.destroy()
+        hide_chart(ui)
     
     #---Update UI---
     try:
@@ -157,7 +213,7 @@ def handle_search(ui, unit_var):
         ui["unit_toggle_button"].config(state="enabled")
         ui["status_label"].config(text="")
     except Exception as e:
-        logger.error(f"Could not update UI: {type(e).__name__} - {e}")
+        logger.error("Could not update UI: %s - %s", type(e).__name__, e)
         ui["status_label"].config(text=error_type, foreground="red")
         ui["save_button"].config(state="disabled")
         ui["unit_toggle_button"].config(state="disabled")
@@ -167,6 +223,104 @@ def handle_search(ui, unit_var):
 
     update_fav_button(ui)
     ui["search_entry_highlighted"] = False
+    timing.finish("render.total", render_started)
+
+
+def format_observation_time(timestamp):
+    """Formats an observation's Unix time as e.g. "Tuesday 2025-07-01 12:00 PM"."""
+    if not timestamp:
+        return "N/A N/A N/A"
+    return datetime.fromtimestamp(timestamp).strftime("%A %Y-%m-%d %I:%M %p")
+
+def build_forecast_cards(container, count=FORECAST_CARD_COUNT):
+    """
+    Creates a fixed pool of forecast card widgets once, hidden until data arrives.
+
+    Searches then only reconfigure these widgets instead of destroying and
+    rebuilding every frame and label.
+
+    Args:
+        container (ttk.Frame): The frame the cards are laid out in.
+        count (int): The number of cards to create.
+
+    Returns:
+        list: One dict of widget references per card.
+    """
+    cards = []
+    for i in range(count):
+        frame = tk.Frame(
+            container,
+            relief="flat",
+            highlightthickness=1,
+            width=150,
+            height=155
+        )
+        frame.pack_propagate(False)
+        frame.grid(row=0, column=i, padx=5, pady=5)
+        frame.grid_remove()
+
+        day_label = ttk.Label(frame, font=("Segoe UI", 13, "bold"))
+        day_label.pack(anchor="w", padx=5)
+        date_label = ttk.Label(frame, font=("Segoe UI", 10))
+        date_label.pack(anchor="w", padx=5)
+        icon_label = ttk.Label(frame)
+        icon_label.pack(pady=5)
+        temp_label = ttk.Label(frame, font=("Segoe UI", 10, "bold"))
+        temp_label.pack(anchor="center", pady=(5, 0))
+
+        cards.append({
+            "frame": frame,
+            "day_label": day_label,
+            "date_label": date_label,
+            "icon_label": icon_label,
+            "temp_label": temp_label
+        })
+    return cards
+
+def update_forecast_cards(cards, daily, bg, border, unit_symbol):
+    """
+    Fills the pooled forecast cards in place and hides any that are not needed.
+
+    Args:
+        cards (list): Card widget references from `build_forecast_cards`.
+        daily (list): `DailyForecast` records, already in display units.
+        bg (str): The card background colour.
+        border (str): The card border colour.
+        unit_symbol (str): The temperature unit symbol, e.g. "°C".
+    """
+    for i, card in enumerate(cards):
+        if i >= len(daily):
+            card["frame"].grid_remove()
+            continue
+
+        day = daily[i]
+        card["frame"].configure(bg=bg, highlightbackground=border)
+
+        try:
+            date_obj = day_to_date(day.day)
+            card["day_label"].configure(text=date_obj.strftime("%A"))
+            card["date_label"].configure(text=date_obj.isoformat())
+        except Exception as e:
+            card["day_label"].configure(text=str(day.day))
+            card["date_label"].configure(text="")
+            logger.debug("Could not set day for forecast card: %s - %s", type(e).__name__, e)
+
+        icon_img = load_weather_icon(day.icon, size=CARD_ICON_SIZE)
+        if icon_img:
+            card["icon_label"].configure(image=icon_img, text="")
+            card["icon_label"].image = icon_img
+        else:
+            card["icon_label"].configure(image="", text="(icon)")
+            card["icon_label"].image = None
+            logger.debug("Could not set icon for forecast card: %s", day.icon)
+
+        try:
+            card["temp_label"].configure(text=f"{day.min_temp}/{day.max_temp}{unit_symbol}")
+        except Exception as e:
+            card["temp_label"].configure(text=day.temperature)
+            logger.debug("Could not set temperature for forecast card: %s - %s", type(e).__name__, e)
+
+        card["frame"].grid()
 
 
 def build_ui(parent, unit_var):
@@ -174,7 +328,10 @@ def build_ui(parent, unit_var):
         current = unit_var.get()
         new_unit = "imperial" if current == "metric" else "metric"
         unit_var.set(new_unit)
-        handle_search(ui_refs, unit_var)
+        if "last_search" in ui_refs:
+            render_weather(ui_refs, unit_var, *ui_refs["last_search"])
+        else:
+            handle_search(ui_refs, unit_var)
 
     #---MAIN WINDOW---
     parent.title("Weather View")
@@ -261,6 +418,7 @@ def build_ui(parent, unit_var):
 
     forecast_cards_container = ttk.Frame(forecast_frame)
     forecast_cards_container.pack(fill="x")
+    forecast_cards = build_forecast_cards(forecast_cards_container)
 
     #---FRAME: Forecast Chart---
     chart_frame = tk.Frame(parent, height=255, width=780)
@@ -283,12 +441,84 @@ def build_ui(parent, unit_var):
         "time_label": time_label,
         "icon_label": icon_label,
         "forecast_cards_container": forecast_cards_container,
+        "forecast_cards": forecast_cards,
         "unit_toggle_button": unit_toggle_button,
         "chart_frame": chart_frame
     }
+    build_suggestion_list(ui_refs, unit_var)
 
     return ui_refs
 
+def build_suggestion_list(ui, unit_var):
+    """
+    Adds the autocomplete list that drops down under the search entry as the user types.
+
+    Suggestions come from the favourites and the bundled city index. Down moves
+    into the list, and Return or a click searches for the highlighted city.
+    """
+    entry = ui["search_entry"]
+    listbox = tk.Listbox(ui["root"], exportselection=False, font=("Segoe UI", 10))
+    ui["suggestion_list"] = listbox
+    ui["suggestions"] = []
+
+    entry.bind("<KeyRelease>", lambda event: on_search_typed(ui, event))
+    entry.bind("<Down>", lambda event: focus_suggestions(ui))
+    entry.bind("<Escape>", lambda event: hide_suggestions(ui))
+    listbox.bind("<Return>", lambda event: choose_suggestion(ui, unit_var))
+    listbox.bind("<ButtonRelease-1>", lambda event: choose_suggestion(ui, unit_var))
+    listbox.bind("<Escape>", lambda event: (hide_suggestions(ui), entry.focus_set()))
+
+def on_search_typed(ui, event):
+    if event.keysym in NAVIGATION_KEYS:
+        return
+    text = ui["search_entry"].get()
+    if len(text.strip()) < MIN_PREFIX_LENGTH:
+        hide_suggestions(ui)
+        return
+    # The index is built off the Tk thread at startup; until then only favourites are offered.
+    show_suggestions(ui, suggest_cities(text, load_favourites(), get_name_index(build=False)))
+
+def show_suggestions(ui, suggestions):
+    ui["suggestions"] = suggestions
+    if not suggestions:
+        hide_suggestions(ui)
+        return
+
+    listbox = ui["suggestion_list"]
+    listbox.delete(0, tk.END)
+    for suggestion in suggestions:
+        listbox.insert(tk.END, suggestion["label"])
+    listbox.configure(height=len(suggestions))
+    listbox.place(in_=ui["search_entry"], x=0, rely=1.0, relwidth=1.0)
+    listbox.lift()
+
+def hide_suggestions(ui):
+    listbox = ui.get("suggestion_list")
+    if listbox is not None:
+        listbox.place_forget()
+
+def focus_suggestions(ui):
+    if not ui["suggestions"]:
+        return None
+    listbox = ui["suggestion_list"]
+    listbox.focus_set()
+    listbox.selection_clear(0, tk.END)
+    listbox.selection_set(0)
+    listbox.activate(0)
+    return "break"
+
+def choose_suggestion(ui, unit_var):
+    selection = ui["suggestion_list"].curselection()
+    if not selection:
+        return
+    suggestion = ui["suggestions"][selection[0]]
+    ui["selected_suggestion"] = suggestion
+    ui["search_entry"].delete(0, tk.END)
+    ui["search_entry"].insert(0, suggestion["label"])
+    ui["search_entry"].focus_set()
+    handle_search(ui, unit_var)
+    update_fav_button(ui)
+
 def start_auto_refresh(ui, unit_var, interval_ms=900000):
     def refresh():
         handle_search(ui, unit_var)
@@ -300,21 +530,14 @@ def reset_auto_refresh(ui, unit_var, interval_ms=900000):
         ui["root"].after_cancel(ui["auto_refresh_id"])
     start_auto_refresh(ui, unit_var, interval_ms)
 
-def load_weather_icon(icon_code, size=(150, 150)):
-    try:
-        icon_path = resource_path(os.path.join("weather_icons", f"{icon_code}.png"))
-        if not os.path.exists(icon_path):
-            icon_path = os.path.join("weather_icons", "default.png")
-        image = Image.open(icon_path).resize(size, Image.LANCZOS)
-        return ImageTk.PhotoImage(image)
-    except Exception as e:
-        logger.error(f"Could load Icon: {e}")
-        return None
-
 def embed_chart(ui, fig, retry_delay=50, max_attempts=20, attempt=0):
     """
     Embeds a Matplotlib figure into the Tkinter chart frame.
 
+    The Tk canvas is created the first time only. Later calls with the same
+    long-lived figure just re-show the existing widget and schedule a redraw
+    with `draw_idle`.
+
     This function includes a retry mechanism using `frame.after()` because
     the frame's dimensions may not be immediately available when the UI is
     first drawn, which can cause rendering issues.
@@ -327,35 +550,81 @@ def embed_chart(ui, fig, retry_delay=50, max_attempts=20, attempt=0):
         attempt (int): The current attempt number.
     """
     frame = ui["chart_frame"]
+    canvas = ui.get("chart_canvas")
 
-    if frame.winfo_ismapped() and frame.winfo_width() > 1:
+    if canvas is not None and canvas.figure is fig:
+        widget = canvas.get_tk_widget()
+        if not widget.winfo_manager():
+            widget.pack(expand=False, pady=(5, 10))
+        canvas.draw_idle()
+
+    elif frame.winfo_ismapped() and frame.winfo_width() > 1:
         for widget in frame.winfo_children():
             widget.destroy()
 
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         canvas = FigureCanvasTkAgg(fig, master=frame)
         canvas.draw()
         canvas.get_tk_widget().pack(expand=False, pady=(5, 10))
+        ui["chart_canvas"] = canvas
 
     elif attempt < max_attempts:
         frame.after(retry_delay, lambda: embed_chart(ui, fig, retry_delay, max_attempts, attempt + 1))
 
+def render_chart_in_background(ui, forecast_data, city, bg, border, light, unit):
+    """
+    Rasterizes the forecast chart on a worker thread and shows it as an image.
+
+    The chart used here has its own headless Agg canvas and is never attached
+    to Tk, so drawing it off the Tk thread is safe. Renders superseded by a
+    newer one before they finish are not shown, and a failed render hides the chart.
+    """
+    chart = ui.get("offscreen_chart")
+    if chart is None:
+        from graph_forecast import ForecastChart
+        chart = ui["offscreen_chart"] = ForecastChart()
+
+    generation = ui.get("chart_generation", 0) + 1
+    ui["chart_generation"] = generation
+
+    def on_rendered(size):
+        if ui["chart_generation"] == generation:
+            show_chart_image(ui, chart)
+
+    def on_failed(error):
+        # Better no chart than the previous city's one.
+        if ui["chart_generation"] == generation:
+            hide_chart(ui)
+
+    run_in_background(
+        ui["root"], chart.render, on_rendered, forecast_data, city, bg, border, light, unit, on_error=on_failed
+    )
+
+def show_chart_image(ui, chart):
+    """Blits a chart rendered off-thread into the chart frame's image label."""
+    label = ui.get("chart_image_label")
+    if label is None:
+        label = ui["chart_image_label"] = tk.Label(ui["chart_frame"], borderwidth=0)
+
+    with timing.span("render.chart_blit"):
+        photo = chart.blit_to_photo(ui.get("chart_photo"))
+    ui["chart_photo"] = photo
+    label.configure(image=photo)
+    if not label.winfo_manager():
+        label.pack(expand=False, pady=(5, 10))
+
+def hide_chart(ui):
+    """Hides the forecast chart without destroying the reusable canvas."""
+    canvas = ui.get("chart_canvas")
+    if canvas is not None:
+        canvas.get_tk_widget().pack_forget()
+    label = ui.get("chart_image_label")
+    if label is not None:
+        label.pack_forget()
+
 def focus_search_entry(ui_refs):
     ui_refs["root"].focus_force()
     ui_refs["search_entry"].focus()
     ui_refs["search_entry"].selection_range(0, tk.END)
     ui_refs["search_entry_highlighted"] = False
-
-def resource_path(relative_path):
-    """
-    Get the absolute path to a resource, works for dev and for PyInstaller.
-
-    Args:
-        relative_path (str): The path to the resource relative to the project root.
-
-    Returns:
-        str: The absolute path to the resource.
-    """
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
-
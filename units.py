@@ -0,0 +1,60 @@
+CANONICAL_UNITS = "metric"
+
+MPS_TO_MPH = 2.2369362920544
+
+def convert_temperature(celsius, unit):
+    if unit == "imperial":
+        return round(celsius * 9 / 5 + 32, 1)
+    return celsius
+
+def convert_speed(metres_per_second, unit):
+    if unit == "imperial":
+        return round(metres_per_second * MPS_TO_MPH, 1)
+    return metres_per_second
+
+def temperature_symbol(unit):
+    return "°F" if unit == "imperial" else "°C"
+
+def speed_symbol(unit):
+    return "mph" if unit == "imperial" else "m/s"
+
+def convert_weather(result, unit):
+    """
+    Converts current weather fetched in canonical (metric) units for display.
+
+    Args:
+        result (CurrentWeather | dict): Current weather as returned by `get_weather_by_city`.
+        unit (str): The display unit system ('metric' or 'imperial').
+
+    Returns:
+        CurrentWeather | dict: A copy of `result` in the requested units. Error
+                               results are returned unchanged.
+    """
+    if unit == CANONICAL_UNITS or "error" in result:
+        return result
+
+    return result.replace(
+        temperature=convert_temperature(result.temperature, unit),
+        wind_speed=convert_speed(result.wind_speed, unit)
+    )
+
+def convert_forecast_bundle(bundle, unit):
+    """
+    Converts a forecast series fetched in canonical (metric) units for display.
+
+    Only the temperature column is rebuilt; times and conditions are shared
+    with the original. Daily summaries derived from the result are therefore
+    in the requested units too.
+
+    Args:
+        bundle (ForecastSeries | dict | None): The result of `get_forecast_bundle`.
+        unit (str): The display unit system ('metric' or 'imperial').
+
+    Returns:
+        ForecastSeries | dict | None: A copy of `bundle` in the requested units.
+                                      Missing or error bundles are returned unchanged.
+    """
+    if unit == CANONICAL_UNITS or bundle is None or "error" in bundle:
+        return bundle
+
+    return bundle.with_temps(convert_temperature(temp, unit) for temp in bundle.temps)
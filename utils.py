@@ -1,18 +1,56 @@
-from favourites import save_favourite, load_favourites
+import os
+import sys
+from favourites import save_favourite, load_favourites, is_favourite
+
+def split_country(query):
+    """
+    Splits a "City,CC" search into the city and its two-letter country code.
+
+    Args:
+        query (str): The search text, e.g. "London,CA" or "London".
+
+    Returns:
+        tuple: (city, country); country is upper-cased, or None if the query names none.
+    """
+    city, separator, country = query.rpartition(",")
+    country = country.strip()
+    if separator and len(country) == 2 and country.isalpha():
+        return city.strip(), country.upper()
+    return query.strip(), None
+
+def favourite_city(ui):
+    """
+    Returns the name to save or look up as a favourite for the search entry.
+
+    A picked suggestion fills the entry with its label ("London, CA"); while
+    the entry still shows that label, the favourite is the country-qualified
+    "London,CA", so selecting it later searches for the same place.
+
+    Args:
+        ui (dict): A dictionary of UI widget references.
+
+    Returns:
+        str: The city, title-cased, with an upper-case ",CC" country code if one is known.
+    """
+    text = ui["search_entry"].get().strip()
+    suggestion = ui.get("selected_suggestion")
+    if suggestion and suggestion["label"] == text:
+        city, country = suggestion["city"], suggestion["country"]
+    else:
+        city, country = split_country(text)
+        city = city.title()
+    return f"{city},{country}" if country else city
 
 def on_save_favourite(ui):
-    city = ui["search_entry"].get().strip().title()
-    favourites = load_favourites()
-    if city and city not in favourites:
-        favourites.append(city)
+    city = favourite_city(ui)
+    if city and not is_favourite(city):
         save_favourite(city)
-        ui["favourites_dropdown"]["values"] = favourites
+        ui["favourites_dropdown"]["values"] = load_favourites()
     update_fav_button(ui)
 
 def update_fav_button(ui):
-    city = ui["search_entry"].get().strip().title()
-    favourites = load_favourites()
-    if city in favourites:
+    city = favourite_city(ui)
+    if is_favourite(city):
         ui["save_button"].config(
             text="Remove from Favourites",
             command=lambda: on_remove_favourite(ui)
@@ -24,14 +62,25 @@ def update_fav_button(ui):
             command=lambda: on_save_favourite(ui)
         )
         ui["favourites_dropdown"].set("")
-    favourites = load_favourites()
 
 def on_remove_favourite(ui):
-    city = ui["search_entry"].get().strip().title()
-    favourites = load_favourites()
-    if city in favourites:
-        favourites.remove(city)
+    city = favourite_city(ui)
+    if is_favourite(city):
         save_favourite(city)
-        ui["favourites_dropdown"]["values"] = favourites
+        ui["favourites_dropdown"]["values"] = load_favourites()
         update_fav_button(ui)
 
+def resource_path(relative_path):
+    """
+    Get the absolute path to a resource, works for dev and for PyInstaller.
+
+    Args:
+        relative_path (str): The path to the resource relative to the project root.
+
+    Returns:
+        str: The absolute path to the resource.
+    """
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
@@ -1,155 +1,490 @@
-﻿import requests
-import os
-import sys
+﻿import threading
+import time
+import http_client
+import timing
+from cache import TTLCache
+from disk_cache import default_cache
+from units import CANONICAL_UNITS, convert_weather, convert_forecast_bundle
+from models import CurrentWeather, ForecastSeries, summarise_days, day_to_date
 from logger import logger
-from dotenv import load_dotenv
-import datetime
+from config import get_env
 from collections import defaultdict
+from datetime import timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def get_api_key():
+    """
+    Returns the OpenWeatherMap API key, reading the `.env` file on first use.
+
+    Raises:
+        ValueError: If OPENWEATHER_API_KEY is not set.
+    """
+    api_key = get_env("OPENWEATHER_API_KEY")
+    if not api_key:
+        logger.error("OPENWEATHER_API_KEY is not set in your .env file")
+        raise ValueError("OPENWEATHER_API_KEY is not set in your .env file")
+    return api_key
+
+BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+def get_base_url():
+    """
+    Returns the API root requests are sent to.
+
+    Set OPENWEATHER_BASE_URL (e.g. in `.env`) to point the app at another
+    server, such as the local stand-in in `fake_openweather.py`.
+    """
+    return get_env("OPENWEATHER_BASE_URL", BASE_URL).rstrip("/")
+
+# OpenWeatherMap refreshes current conditions roughly every 10 minutes and
+# forecasts less often, so repeat lookups inside these windows are served locally.
+CACHE_TTLS = {"weather": 600, "forecast": 1800}
+CACHE_MAXSIZE = 128
+# The most city IDs OpenWeatherMap accepts in one `/group` request.
+GROUP_MAX_IDS = 20
+# The record type each endpoint's results are stored as.
+RECORD_TYPES = {"weather": CurrentWeather, "forecast": ForecastSeries}
+
+_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttls=CACHE_TTLS)
+_disk_cache = default_cache
+_request_executor = ThreadPoolExecutor(max_workers=http_client.POOL_MAXSIZE, thread_name_prefix="weather-request")
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def normalize_city(city):
+    return " ".join(city.split()).lower()
+
+def cache_key(endpoint, location):
+    # Responses are always fetched in canonical units, so the unit is not part of the key.
+    if isinstance(location, tuple):
+        lat, lon = location
+        return (endpoint, f"{lat:.4f},{lon:.4f}")
+    return (endpoint, normalize_city(location))
+
+def location_params(location):
+    """
+    Builds the query parameters that identify a location.
+
+    Args:
+        location (str | tuple): A city name, or a (lat, lon) pair picked from
+                                an autocomplete suggestion.
+
+    Returns:
+        dict: {"q": ...} or {"lat": ..., "lon": ...}.
+    """
+    if isinstance(location, tuple):
+        lat, lon = location
+        return {"lat": f"{lat:.4f}", "lon": f"{lon:.4f}"}
+    return {"q": location}
+
+def _disk_key(key):
+    return "|".join(key)
+
+def cache_stats():
+    """Returns the hit/miss counters and size of the response cache."""
+    return _cache.stats()
+
+def clear_cache():
+    """Drops every cached response held in memory."""
+    _cache.clear()
+
+def _get_cached(key):
+    """
+    Looks a parsed response up in memory first, then in the persistent cache.
+
+    Fresh entries found on disk are promoted into the in-memory cache for the
+    rest of their time-to-live, so they never outlive it there.
+    """
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    entry = _disk_cache.get(_disk_key(key))
+    if entry is None:
+        return None
+    data, stored_at = entry
+    remaining = _cache.ttl_for(key) - (time.time() - stored_at)
+    if remaining <= 0:
+        return None
+
+    cached = _load_record(key[0], data)
+    if cached is not None:
+        _cache.set(key, cached, ttl=remaining)
+    return cached
+
+def _load_record(endpoint, data):
+    """Rebuilds a record from its disk cache form; entries in an older format count as misses."""
+    if data is None:
+        return None
+    try:
+        return RECORD_TYPES[endpoint].from_dict(data)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _store(key, value):
+    _cache.set(key, value)
+    _disk_cache.set(_disk_key(key), value.to_dict())
+
+def _single_flight(key, fetch):
+    """
+    Runs `fetch()` for `key` unless an identical request is already in flight.
+
+    Concurrent callers asking for the same key (e.g. a favourite picked while
+    an auto-refresh for that city is running) share the first caller's result
+    instead of issuing duplicate network calls.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _in_flight[key] = future
+
+    if not is_leader:
+        return future.result()
 
-
-if getattr(sys, 'frozen', False):
-    env_path = os.path.join(os.path.dirname(sys.executable), ".env")
-else:
-    env_path = ".env"
-
-load_dotenv()
-API_KEY = API_KEY = os.getenv("OPENWEATHER_API_KEY")
-if not API_KEY:
-    logger.error("OPENWEATHER_API_KEY is not set in your .env file")
-    raise ValueError("OPENWEATHER_API_KEY is not set in your .env file")
-
-def get_weather_by_city(city, unit_var):
+    try:
+        value = fetch()
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+
+def get_last_known():
+    """
+    Returns the most recently searched city's data from the persistent cache, however old.
+
+    This lets the app paint the last-known weather immediately at startup while
+    fresh data is fetched.
+
+    Returns:
+        dict | None: {"city", "weather", "forecast", "stored_at"} in canonical
+                     units, where "weather" is a `CurrentWeather` and "forecast"
+                     a `ForecastSeries` or None, or None if
+                     nothing usable has been cached yet.
+    """
+    last_city = _disk_cache.get("meta|last_city")
+    if last_city is None:
+        return None
+
+    # Coordinates come back from JSON as a list.
+    location = tuple(last_city[0]) if isinstance(last_city[0], list) else last_city[0]
+    weather_entry = _disk_cache.get(_disk_key(cache_key("weather", location)))
+    weather = _load_record("weather", weather_entry[0] if weather_entry else None)
+    if weather is None:
+        return None
+
+    forecast_entry = _disk_cache.get(_disk_key(cache_key("forecast", location)))
+    return {
+        "city": location if isinstance(location, str) else weather.city,
+        "weather": weather,
+        "forecast": _load_record("forecast", forecast_entry[0] if forecast_entry else None),
+        "stored_at": weather_entry[1]
+    }
+
+def get_weather_by_city(city, unit_var=CANONICAL_UNITS):
     unit = unit_var
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units={unit}"
+    key = cache_key("weather", city)
+    result = _get_cached(key)
+    if result is None:
+        result = _single_flight(key, lambda: _fetch_current_weather(city, key))
+    return convert_weather(result, unit)
+
+def _fetch_current_weather(city, key):
     try:
-        response = requests.get(url)
-        data = response.json()
+        params = {**location_params(city), "appid": get_api_key(), "units": CANONICAL_UNITS}
+        with timing.span("api.weather.request"):
+            response = http_client.get(f"{get_base_url()}/weather", params=params)
+        record_response_timing("weather", response)
+        with timing.span("api.weather.decode"):
+            data = response.json()
         
         if data.get("cod") != 200:
             logger.error("Could not find location in get_weather_by_city")
             return {"error": "Location not found."}
 
-        timestamp = data.get("dt")
-        if timestamp:
-            dt_obj = datetime.datetime.fromtimestamp(timestamp)
-            day = dt_obj.strftime("%A")
-            date = dt_obj.strftime("%Y-%m-%d")
-            time = dt_obj.strftime("%I:%M %p")
-        else:
-            day = date = time = "N/A"
-
-        return {
-            "city": data["name"],
-            "temperature": round(data["main"]["temp"], 1),
-            "condition": data["weather"][0]["description"],
-            "humidity": data["main"]["humidity"],
-            "wind_speed": round(data["wind"]["speed"], 1),
-            "icon": data["weather"][0]["icon"],
-            "day": day,
-            "date": date,
-            "time": time
-        }
+        with timing.span("api.weather.parse"):
+            result = parse_current_weather(data)
+        _store(key, result)
+        _disk_cache.set("meta|last_city", city)
+        if "id" in data:
+            _disk_cache.set(_city_id_key(city), data["id"])
+        return result
     except Exception as e:
         logger.error("API request failed in get_weather_by_city")
         return {"error": "Request failed."}
 
-
-def get_forecast_by_city(city, unit_var):
-    unit = unit_var
-    url = f"https://api.openweathermap.org/data/2.5/forecast?q={city}&appid={API_KEY}&units={unit}"
-
+def record_response_timing(endpoint, response):
+    """
+    Records how long a response took to start arriving, as the stage "api.<endpoint>.headers".
+
+    `response.elapsed` runs from sending the request until its headers were
+    parsed, so it covers connection setup (DNS, TCP, TLS) and server time but
+    not the body download; "api.<endpoint>.request" minus this is the download.
+    """
+    elapsed = getattr(response, "elapsed", None)
+    if timing.ENABLED and isinstance(elapsed, timedelta):
+        timing.record(f"api.{endpoint}.headers", elapsed.total_seconds() * 1000)
+
+def _city_id_key(city):
+    return f"city_id|{cache_key('weather', city)[1]}"
+
+def get_city_id(city):
+    """
+    Returns the OpenWeatherMap city ID seen in an earlier `/weather` response for `city`.
+
+    Returns:
+        int | None: The ID, or None if the city has not been looked up yet.
+    """
+    entry = _disk_cache.get(_city_id_key(city))
+    return entry[0] if entry else None
+
+def get_weather_for_cities(cities, unit_var=CANONICAL_UNITS, executor=None):
+    """
+    Fetches current weather for many cities using as few requests as possible.
+
+    Cities already in the cache are served from it. The rest are resolved to
+    their OpenWeatherMap city IDs and fetched `GROUP_MAX_IDS` at a time with the
+    `/group` endpoint, one request per chunk, issued concurrently. Cities with
+    no known ID yet fall back to a regular `/weather` request, which records
+    their ID for next time. Every result is stored in the weather cache, so a
+    later search for any of the cities is answered without a request.
+
+    Args:
+        cities (list): The city names, e.g. the favourites list.
+        unit_var (str): The unit system ('metric' or 'imperial').
+        executor (concurrent.futures.Executor | None): Runs the requests; defaults to the
+            pool shared with searches. Background callers pass their own, smaller one.
+
+    Returns:
+        dict: Maps each city to its current weather or an {"error": message} dict.
+    """
+    results = {}
+    cities_by_id = defaultdict(list)
+    unresolved = []
+    for city in cities:
+        cached = _get_cached(cache_key("weather", city))
+        if cached is not None:
+            results[city] = cached
+            continue
+
+        city_id = get_city_id(city)
+        if city_id is None:
+            unresolved.append(city)
+        else:
+            cities_by_id[city_id].append(city)
+
+    ids = list(cities_by_id)
+    chunks = [ids[i:i + GROUP_MAX_IDS] for i in range(0, len(ids), GROUP_MAX_IDS)]
+    executor = executor or _request_executor
+    group_futures = [executor.submit(_fetch_group, chunk) for chunk in chunks]
+    single_futures = {
+        city: executor.submit(get_weather_by_city, city)
+        for city in unresolved
+    }
+
+    for chunk, future in zip(chunks, group_futures):
+        weather_by_id = future.result()
+        for city_id in chunk:
+            for city in cities_by_id[city_id]:
+                result = weather_by_id.get(city_id)
+                if result is None:
+                    results[city] = {"error": "Request failed."}
+                    continue
+                _store(cache_key("weather", city), result)
+                results[city] = result
+
+    for city, future in single_futures.items():
+        results[city] = future.result()
+
+    return {city: convert_weather(results[city], unit_var) for city in cities}
+
+def _fetch_group(city_ids):
+    """
+    Fetches current weather for up to `GROUP_MAX_IDS` cities in one request.
+
+    Returns:
+        dict: Maps each city ID found in the response to its parsed current weather.
+    """
     try:
-        response = requests.get(url)
-        data = response.json()
+        params = {
+            "id": ",".join(str(city_id) for city_id in city_ids),
+            "appid": get_api_key(),
+            "units": CANONICAL_UNITS
+        }
+        with timing.span("api.group.request"):
+            response = http_client.get(f"{get_base_url()}/group", params=params)
+        record_response_timing("group", response)
+        with timing.span("api.group.decode"):
+            data = response.json()
 
         if response.status_code != 200 or "list" not in data:
-            logger.error(data.get("message", "Unknown error."))
-            return {"error": data.get("message", "Unknown error.")}
-
-        forecast_list = data["list"]
-        min_max_by_date = extract_daily_min_max(forecast_list)
-
-        daily_entries = {}
-        for entry in forecast_list:
-            dt_utc = datetime.datetime.strptime(entry["dt_txt"], "%Y-%m-%d %H:%M:%S")
-            local_dt = dt_utc + datetime.timedelta(seconds=data["city"]["timezone"])
-            date_str = local_dt.strftime("%Y-%m-%d")
-            time_diff = abs((local_dt - local_dt.replace(hour=12, minute=0, second=0)).total_seconds())
-
-            if date_str not in daily_entries or time_diff < daily_entries[date_str][0]:
-                daily_entries[date_str] = (time_diff, entry)
-
-        today_utc = datetime.datetime.now(datetime.timezone.utc).date()
-
-        daily_forecasts = []
-        for date, (_, entry) in daily_entries.items():
-            forecast_date = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-            if forecast_date < today_utc:
-                continue
-
-            if date not in min_max_by_date:
-                continue
-
-            daily_forecasts.append({
-                "date": date,
-                "temperature": round(entry["main"]["temp"], 1),
-                "min_temp": min_max_by_date[date]["min"],
-                "max_temp": min_max_by_date[date]["max"],
-                "condition": entry["weather"][0]["description"],
-                "icon": entry["weather"][0]["icon"]
-            })
-
-        return daily_forecasts
+            logger.error("Group weather request failed: %s", data.get("message", "Unknown error."))
+            return {}
 
+        return {entry["id"]: parse_current_weather(entry) for entry in data["list"]}
     except Exception as e:
-        logger.error(f"Exception in get_forecast_by_city: {e}")
-        return {"error": str(e)}
-
-def get_detailed_forecast_by_city(city, unit_var):
+        logger.error("Exception in _fetch_group: %s", e)
+        return {}
+
+def parse_current_weather(data):
+    """
+    Converts a decoded `/weather` response into the record displayed by the UI.
+
+    Args:
+        data (dict): A decoded `/weather` response.
+
+    Returns:
+        CurrentWeather: The current conditions.
+    """
+    return CurrentWeather(
+        city=data["name"],
+        temperature=round(data["main"]["temp"], 1),
+        condition=data["weather"][0]["description"],
+        humidity=data["main"]["humidity"],
+        wind_speed=round(data["wind"]["speed"], 1),
+        icon=data["weather"][0]["icon"],
+        timestamp=data.get("dt")
+    )
+
+
+def get_weather_and_forecast(city, unit_var=CANONICAL_UNITS):
+    """
+    Fetches current weather and the forecast bundle concurrently.
+
+    The two requests are independent, so the forecast is issued on a worker
+    thread while current weather is fetched on the calling thread. Search
+    latency is then the slower of the two round-trips rather than their sum.
+
+    Args:
+        city (str | tuple): The city to fetch weather for, or its (lat, lon).
+        unit_var (str): The unit system ('metric' or 'imperial').
+
+    Returns:
+        tuple: (current weather, forecast bundle). Each may independently be an
+               {"error": message} dict.
+    """
+    forecast_future = _request_executor.submit(get_forecast_bundle, city, unit_var)
+    result = get_weather_by_city(city, unit_var)
+    try:
+        forecast_bundle = forecast_future.result()
+    except Exception as e:
+        logger.error("Exception in get_weather_and_forecast: %s", e)
+        forecast_bundle = {"error": str(e)}
+    return result, forecast_bundle
+
+def get_forecast_bundle(city, unit_var=CANONICAL_UNITS):
+    """
+    Fetches the 5-day / 3-hour forecast once as a columnar series.
+
+    The forecast cards (`ForecastSeries.daily`) and the temperature chart both
+    read the same series, so the `/forecast` payload is downloaded and parsed a
+    single time per search. Data is always fetched and cached in canonical
+    units and converted locally on the way out.
+
+    Args:
+        city (str | tuple): The city to fetch the forecast for, or its (lat, lon).
+        unit_var (str): The unit system ('metric' or 'imperial').
+
+    Returns:
+        ForecastSeries | dict: The forecast on success, or {"error": message}.
+    """
     unit = unit_var
-    url = f"https://api.openweathermap.org/data/2.5/forecast?q={city}&appid={API_KEY}&units={unit}"
+    key = cache_key("forecast", city)
+    bundle = _get_cached(key)
+    if bundle is None:
+        bundle = _single_flight(key, lambda: _fetch_forecast_bundle(city, key))
+    return convert_forecast_bundle(bundle, unit)
 
+def _fetch_forecast_bundle(city, key):
     try:
-        response = requests.get(url)
-        data = response.json()
+        params = {**location_params(city), "appid": get_api_key(), "units": CANONICAL_UNITS}
+        with timing.span("api.forecast.request"):
+            response = http_client.get(f"{get_base_url()}/forecast", params=params)
+        record_response_timing("forecast", response)
+        with timing.span("api.forecast.decode"):
+            data = response.json()
 
         if response.status_code != 200 or "list" not in data:
             logger.error(data.get("message", "Unknown error."))
-            return {"error": data.get("message", "Unknown error.")} 
-
-        forecast_points = []
-
-        for entry in data["list"]:
-            forecast_points.append({
-                "datetime": entry["dt_txt"],
-                "temperature": entry["main"]["temp"],
-                "condition": entry["weather"][0]["description"],
-                "icon": entry["weather"][0]["icon"]
-            })
+            return {"error": data.get("message", "Unknown error.")}
 
-        return forecast_points
+        with timing.span("api.forecast.parse"):
+            bundle = ForecastSeries.from_response(data)
+        _store(key, bundle)
+        return bundle
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("Exception in get_forecast_bundle: %s", e)
         return {"error": str(e)}
 
-
-def extract_daily_min_max(forecast_list):
-
-    daily_temps = defaultdict(list)
-
-    for entry in forecast_list:
-        date = entry["dt_txt"].split(" ")[0]
-        temp = entry["main"]["temp"]
-        daily_temps[date].append(temp)
-
-    daily_min_max = {}
-    for date, temps in daily_temps.items():
-        daily_min_max[date] = {
-            "min": round(min(temps), 1),
-            "max": round(max(temps), 1)
-        }
-
-    return daily_min_max
-
-
+def get_forecast_by_city(city, unit_var=CANONICAL_UNITS):
+    bundle = get_forecast_bundle(city, unit_var)
+    if "error" in bundle:
+        return bundle
+    return bundle.daily()
+
+def get_detailed_forecast_by_city(city, unit_var=CANONICAL_UNITS):
+    return get_forecast_bundle(city, unit_var)
+
+def forecast_arrays(forecast_list):
+    """
+    Reads the timestamps and temperatures of `/forecast` entries into NumPy arrays in one pass.
+
+    The integer `dt` field is used rather than the `dt_txt` string, so no
+    per-entry datetime parsing is needed however long the series is.
+
+    Args:
+        forecast_list (list): The "list" of a decoded `/forecast` response.
+
+    Returns:
+        tuple: (times, temps) - UTC epoch seconds (int64) and temperatures (float64).
+    """
+    import numpy as np
+
+    count = len(forecast_list)
+    times = np.fromiter((entry["dt"] for entry in forecast_list), dtype=np.int64, count=count)
+    temps = np.fromiter((entry["main"]["temp"] for entry in forecast_list), dtype=np.float64, count=count)
+    return times, temps
+
+def day_strings(days):
+    """Formats days since the epoch as "YYYY-MM-DD" strings."""
+    return [day_to_date(day).isoformat() for day in days.tolist()]
+
+def parse_daily_forecast(data):
+    """
+    Picks one entry per local day (the one closest to midday) and attaches that day's min/max.
+
+    Args:
+        data (dict): A decoded `/forecast` response.
+
+    Returns:
+        list: `DailyForecast` records from today (in the location's time zone) onwards.
+    """
+    return ForecastSeries.from_response(data).daily()
+
+def extract_daily_min_max(forecast_list, timezone_offset=0):
+    """
+    Returns each local day's minimum and maximum temperature.
+
+    Args:
+        forecast_list (list): The "list" of a decoded `/forecast` response.
+        timezone_offset (int): The location's offset from UTC in seconds.
+
+    Returns:
+        dict: Maps "YYYY-MM-DD" to {"min": ..., "max": ...}.
+    """
+    if not forecast_list:
+        return {}
+
+    times, temps = forecast_arrays(forecast_list)
+    days, _, mins, maxs = summarise_days(times, temps, timezone_offset)
+    return {
+        date: {"min": round(min_temp, 1), "max": round(max_temp, 1)}
+        for date, min_temp, max_temp in zip(day_strings(days), mins.tolist(), maxs.tolist())
+    }